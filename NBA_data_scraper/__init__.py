@@ -1,4 +1,25 @@
 """module init file
+
+NBA_scraper is imported on first use, so importing the package (i.e. for the parsers or the team
+mappings) doesn't load pandas, requests or selenium.
 """
 from NBA_data_scraper._version import __version__
-from NBA_data_scraper.data_scraper import NBA_scraper
\ No newline at end of file
+
+#Public names and the modules they are imported from on first access
+_LAZY_IMPORTS = {'NBA_scraper': 'NBA_data_scraper.data_scraper'}
+
+__all__ = ['__version__'] + list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        #Cached in the package so the next access doesn't go through __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -0,0 +1,153 @@
+"""Module containing the advanced metrics derived from the scraped box scores
+
+Every metric is computed with vectorized column operations over the whole df, opponent stats are
+joined by Game-ID. Formulas follow the Basketball Reference glossary.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .schema import apply_schema
+from .teams import game_keys
+
+#Team stats the metrics are computed from
+TEAM_STATS = ['MP', 'FG', 'FGA', '3P', 'FTA', 'ORB', 'DRB', 'TOV', 'PTS']
+
+
+def _values(df, col):
+    #Column as a float array, missing stats become NaN
+    return pd.to_numeric(df[col], errors = 'coerce').to_numpy(dtype = 'float64', na_value = np.nan)
+
+
+def _typed(df):
+    #The scraper returns strings, apply_schema leaves data that is already typed (i.e. read from Parquet) as is
+    return apply_schema(df)
+
+
+def _divide(numerator, denominator):
+    #No attempts (i.e. a player who played seconds without shooting) gives NaN instead of inf
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        result = numerator / denominator
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def _minutes(df):
+    #MP is converted to seconds by apply_schema
+    return _values(df, 'MP') / 60
+
+
+def opponent_stats(team_df):
+
+    """Function used to line up every team row with the stats of its opponent in the same game
+
+    Parameters
+    ----------
+        team_df: pandas.DataFrame
+            team data as returned by the scraper, two rows per Game-ID
+
+    Returns
+    -------
+        pandas.DataFrame
+            stats of the opponent, with the index of team_df and columns prefixed by Opp
+    """
+    team_df = _typed(team_df)
+    stats = [col for col in TEAM_STATS if col in team_df.columns]
+
+    #Each game has a home (H) and an away (R) row, the opponent is the row of the same game with the other venue
+    opponents = team_df[['Game-ID', 'Venue(R/H)'] + stats].copy()
+    opponents['Venue(R/H)'] = opponents['Venue(R/H)'].astype(str).map({'H': 'R', 'R': 'H'})
+    keys = team_df[['Game-ID', 'Venue(R/H)']].astype({'Venue(R/H)': str})
+    joined = keys.merge(opponents, on = ['Game-ID', 'Venue(R/H)'], how = 'left', validate = 'one_to_one')
+
+    joined = joined[stats].rename(columns = {col: 'Opp ' + col for col in stats})
+    joined.index = team_df.index
+
+    return joined
+
+
+def add_team_advanced_stats(team_df):
+
+    """Function used to add possessions, ratings, shooting efficiency and pace to team data
+
+    Added columns: Poss (possessions, averaged with the opponent's estimate), ORtg and DRtg (points
+    scored and allowed per 100 possessions), NetRtg, eFG% (effective field goal %), TS% (true shooting %)
+    and Pace (possessions per 48 minutes).
+
+    Parameters
+    ----------
+        team_df: pandas.DataFrame
+            team data as returned by the scraper or read back from a dataset
+
+    Returns
+    -------
+        pandas.DataFrame
+            typed copy of the data with the metrics added
+    """
+    team_df = _typed(team_df).copy()
+    opp = opponent_stats(team_df)
+
+    fg, fga, tp, fta = (_values(team_df, col) for col in ['FG', 'FGA', '3P', 'FTA'])
+    orb, drb, tov, pts = (_values(team_df, col) for col in ['ORB', 'DRB', 'TOV', 'PTS'])
+    opp_fg, opp_fga, opp_fta = (_values(opp, col) for col in ['Opp FG', 'Opp FGA', 'Opp FTA'])
+    opp_orb, opp_drb, opp_tov, opp_pts = (_values(opp, col) for col in ['Opp ORB', 'Opp DRB', 'Opp TOV', 'Opp PTS'])
+
+    team_poss = fga + 0.4 * fta - 1.07 * _divide(orb, orb + opp_drb) * (fga - fg) + tov
+    opp_poss = opp_fga + 0.4 * opp_fta - 1.07 * _divide(opp_orb, opp_orb + drb) * (opp_fga - opp_fg) + opp_tov
+    poss = 0.5 * (team_poss + opp_poss)
+
+    team_df['Poss'] = poss
+    team_df['ORtg'] = 100 * _divide(pts, poss)
+    team_df['DRtg'] = 100 * _divide(opp_pts, poss)
+    team_df['NetRtg'] = team_df['ORtg'] - team_df['DRtg']
+    team_df['eFG%'] = _divide(fg + 0.5 * tp, fga)
+    team_df['TS%'] = _divide(pts, 2 * (fga + 0.44 * fta))
+    #Team minutes are the sum of the minutes of its five players on the floor
+    team_df['Pace'] = 48 * _divide(poss, _minutes(team_df) / 5)
+
+    return team_df
+
+
+def add_player_advanced_stats(player_df, team_df):
+
+    """Function used to add shooting efficiency, usage and the team's pace to player data
+
+    Added columns: eFG%, TS%, USG% (share of the team's possessions used while on the floor) and the
+    Poss and Pace of the player's team in the game.
+
+    Parameters
+    ----------
+        player_df: pandas.DataFrame
+            player data as returned by the scraper or read back from a dataset
+
+        team_df: pandas.DataFrame
+            team data of the same games
+
+    Returns
+    -------
+        pandas.DataFrame
+            typed copy of the player data with the metrics added
+    """
+    player_df = _typed(player_df).copy()
+    team_df = add_team_advanced_stats(team_df)
+
+    #Team totals of every player row, joined on the integer key of the game and the team categorical
+    team_cols = ['MP', 'FGA', 'FTA', 'TOV', 'Poss', 'Pace']
+    totals = team_df[['Team'] + team_cols].rename(columns = {col: 'Tm ' + col for col in team_cols})
+    totals.insert(0, 'Game-Key', game_keys(team_df['Game-ID']))
+    keys = pd.DataFrame({'Game-Key': game_keys(player_df['Game-ID']), 'Team': player_df['Team']})
+    totals = keys.merge(totals, on = ['Game-Key', 'Team'], how = 'left', validate = 'many_to_one')
+    totals.index = player_df.index
+
+    fg, fga, tp, fta = (_values(player_df, col) for col in ['FG', 'FGA', '3P', 'FTA'])
+    tov, pts, minutes = _values(player_df, 'TOV'), _values(player_df, 'PTS'), _minutes(player_df)
+    tm_fga, tm_fta, tm_tov = (_values(totals, col) for col in ['Tm FGA', 'Tm FTA', 'Tm TOV'])
+
+    player_df['eFG%'] = _divide(fg + 0.5 * tp, fga)
+    player_df['TS%'] = _divide(pts, 2 * (fga + 0.44 * fta))
+    player_df['USG%'] = 100 * _divide((fga + 0.44 * fta + tov) * (_values(totals, 'Tm MP') / 60 / 5),
+                                      minutes * (tm_fga + 0.44 * tm_fta + tm_tov))
+    player_df['Poss'] = totals['Tm Poss']
+    player_df['Pace'] = totals['Tm Pace']
+
+    return player_df
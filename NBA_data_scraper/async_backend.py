@@ -0,0 +1,136 @@
+"""Module containing the asyncio backend used by NBA_scraper's async methods
+
+Requires aiohttp (pip install NBA_data_scraper[async]).
+"""
+
+import asyncio
+
+import aiohttp
+
+from .util_helpers import BASE_URL, scoreboard_url, boxscore_url
+from .teams import team_abbreviation
+from .parsers import parse_list_of_hometeams, parse_game_rows
+from .scheduler import RetryableError, parse_retry_after
+from .instrumentation import ScrapeMetrics, timed
+
+
+class AsyncHTTPBackend:
+
+    """Backend downloading pages with aiohttp and parsing the static HTML with lxml
+
+    Same pages and parsers as HTTPBackend, but fetches are coroutines so a single event loop keeps
+    many of them in flight. Parsing runs on the default executor so it doesn't block the event loop.
+    Use as an async context manager, the session is created in the running event loop.
+
+    Parameters
+    ----------
+
+    base_url: str
+        root of the Basketball Reference site, can point to a local server serving saved pages
+
+    config: dict
+        optional, mappings of full team names to abbreviations used instead of the team registry,
+        which tells apart the teams sharing a name (i.e. Charlotte Hornets) by the season of the game
+
+    timeout: float
+        seconds to wait for a response
+
+    scheduler: NBA_data_scraper.scheduler.RequestScheduler
+        optional, scheduler throttling and retrying the downloads
+
+    cache: NBA_data_scraper.page_cache.PageCache
+        optional, cache pages are read from before being downloaded
+
+    limit: int
+        maximum number of open connections
+
+    metrics: NBA_data_scraper.instrumentation.ScrapeMetrics
+        optional, metrics the downloads, cache reads and parsing are timed and counted in
+
+    """
+
+    def __init__(self, base_url = BASE_URL, config = None, timeout = 30,
+                 scheduler = None, cache = None, limit = 16, metrics = None):
+
+        self.base_url = base_url.rstrip('/')
+        self.config = config
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.cache = cache
+        self.limit = limit
+        self.metrics = metrics if metrics is not None else ScrapeMetrics()
+        self.session = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(connector = aiohttp.TCPConnector(limit = self.limit),
+                                             timeout = aiohttp.ClientTimeout(total = self.timeout),
+                                             headers = {'User-Agent': 'NBA_data_scraper'})
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.quit()
+
+    async def _download(self, url):
+        try:
+            with self.metrics.time('download'):
+                async with self.session.get(url) as response:
+                    #Too Many Requests and server errors are retried, other errors are raised
+                    if (response.status == 429) or (response.status >= 500):
+                        raise RetryableError(f'{url} returned {response.status}',
+                                             parse_retry_after(response.headers.get('Retry-After')))
+                    response.raise_for_status()
+                    return await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+            raise RetryableError(f'Could not download {url}: {error}')
+
+    async def fetch_page(self, url):
+        """Returns the raw content of a page as bytes, from the cache or downloaded through the scheduler"""
+        if self.cache is not None:
+            with self.metrics.time('cache_read'):
+                page = self.cache.get(url)
+            if page is not None:
+                self.metrics.incr('cache_hits')
+                return page
+            self.metrics.incr('cache_misses')
+
+        if self.scheduler is None:
+            page = await self._download(url)
+        else:
+            page = await self.scheduler.acall(self._download, url)
+        self.metrics.incr('pages_fetched')
+        self.metrics.incr('bytes_fetched', len(page))
+
+        if self.cache is not None:
+            self.cache.set(url, page)
+
+        return page
+
+    async def get_list_of_hometeams(self, games_date):
+        """Returns the list of home team cities that played on games_date"""
+        page = await self.fetch_page(scoreboard_url(games_date, self.base_url))
+        with self.metrics.time('parse'):
+            home_team_list = parse_list_of_hometeams(page)
+
+        if len(home_team_list) == 0:
+            print(f'On {games_date}, there are no games in the NBA.')
+        else:
+            print(f'On {games_date} there are {len(home_team_list)} games in the NBA.')
+
+        return home_team_list
+
+    async def get_game_rows(self, home_team, date_played, get_player_data_ind = True, get_team_data_ind = True):
+        """Returns the player and team columns and rows of the game hosted by home_team on date_played"""
+        modified_date = date_played.replace('-', '')
+        page = await self.fetch_page(boxscore_url(modified_date, team_abbreviation(home_team, date_played, self.config), self.base_url))
+
+        #Timed on the executor, the wait for a free thread is not parsing
+        game_rows, seconds = await asyncio.get_running_loop().run_in_executor(
+            None, timed, parse_game_rows, page, home_team, date_played, self.config, get_player_data_ind, get_team_data_ind)
+        self.metrics.observe('parse', seconds)
+        return game_rows
+
+    async def quit(self):
+        """Closes the http session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
@@ -0,0 +1,477 @@
+"""Module containing the fetch / parse backends used by NBA_scraper"""
+
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .util_helpers import (BASE_URL, scoreboard_url, boxscore_url, pbp_url,
+                           read_list_of_hometeams, read_game_rows, rows_to_frame)
+from .parsers import (BOX_SCORE_DATASETS, check_datasets, parse_list_of_hometeams, parse_game_datasets,
+                      parse_game_rows, parse_scoreboard)
+from .teams import team_abbreviation
+from .scheduler import RetryableError, parse_retry_after
+from .instrumentation import ScrapeMetrics
+
+
+def init_session(pool_size = 10):
+
+    """Initializes a pooled keep-alive HTTP session
+
+    Parameters
+    ----------
+        pool_size: int
+            number of connections kept alive per host
+
+    Returns
+    -------
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections = pool_size, pool_maxsize = pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': 'NBA_data_scraper'})
+
+    return session
+
+
+def fetch_game_pages(backend, home_team, date_played, datasets, base_url = BASE_URL):
+
+    """Helper function used to fetch the pages the datasets of a game are parsed from, each page once
+
+    Parameters
+    ----------
+        backend: SeleniumBackend or HTTPBackend
+            backend fetching the pages
+
+        home_team: str
+            full name of the home team that played (i.e. Boston Celtics)
+
+        date_played: str
+            date the game is played (i.e. 2019-03-21)
+
+        datasets: iterable[str]
+            datasets to parse from the pages (see NBA_data_scraper.parsers.DATASETS)
+
+        base_url: str
+            root of the Basketball Reference site
+
+    Returns
+    -------
+        bytes, bytes
+            raw HTML of the box score page and of the play-by-play page, None for a page no dataset is read from
+    """
+    check_datasets(datasets)
+    modified_date = date_played.replace('-', '')
+    home_team_abrv = team_abbreviation(home_team, date_played, backend.config)
+
+    page = None
+    pbp_page = None
+    if any(name in BOX_SCORE_DATASETS for name in datasets):
+        page = backend.fetch_page(boxscore_url(modified_date, home_team_abrv, base_url))
+    #Basketball Reference has the play-by-play on a page of its own, it costs one more page per game
+    if 'pbp' in datasets:
+        pbp_page = backend.fetch_page(pbp_url(modified_date, home_team_abrv, base_url))
+
+    return page, pbp_page
+
+
+class SeleniumBackend:
+
+    """Backend loading and reading pages through a Selenium webdriver
+
+    Parameters
+    ----------
+
+    driver: selenium.webdriver.chrome.webdriver.WebDriver
+        Selenium webdriver
+
+    config: dict
+        optional, mappings of full team names to abbreviations used instead of the team registry,
+        which tells apart the teams sharing a name (i.e. Charlotte Hornets) by the season of the game
+
+    scheduler: NBA_data_scraper.scheduler.RequestScheduler
+        optional, scheduler throttling and retrying the page loads
+
+    manager: NBA_data_scraper.drivers.DriverManager
+        optional, manager the driver was acquired from, it replaces the driver once it needs recycling or
+        once it crashed
+
+    parse_html: bool
+        Indicate whether to parse the page source with lxml instead of reading the text of its elements
+        (needed when JavaScript is disabled, the line score is only rendered by it)
+
+    metrics: NBA_data_scraper.instrumentation.ScrapeMetrics
+        optional, metrics the page loads and reads are timed and counted in
+
+    """
+
+    def __init__(self, driver, config = None, scheduler = None, manager = None, parse_html = False,
+                 metrics = None):
+
+        self.driver = driver
+        self.config = config
+        self.scheduler = scheduler
+        self.manager = manager
+        self.parse_html = parse_html
+        self.metrics = metrics if metrics is not None else ScrapeMetrics()
+
+    def _navigate(self, url):
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            with self.metrics.time('navigate'):
+                self.driver.get(url)
+        except WebDriverException as error:
+            if self.manager is None:
+                raise
+            #A crashed driver (i.e. Chrome killed for memory) fails every later page load, it is replaced
+            #and the page load is tried again by the scheduler
+            with self.metrics.time('driver_recycle'):
+                self.driver = self.manager.recycle(self.driver)
+            self.metrics.incr('drivers_replaced')
+            raise RetryableError(f'The driver failed loading {url}: {error}')
+        #Selenium does not expose status codes, rate limited pages are recognized by their title
+        title = self.driver.title
+        if ('429' in title) or ('Too Many Requests' in title):
+            raise RetryableError(f'{url} was rate limited')
+
+    def load_page(self, url):
+        """Navigates the driver to url, through the scheduler if there is one"""
+        #Drivers are recycled before a page load, so the page last loaded can still be read
+        if (self.manager is not None) and self.manager.needs_recycling(self.driver):
+            with self.metrics.time('driver_recycle'):
+                self.driver = self.manager.recycle(self.driver)
+            self.metrics.incr('drivers_recycled')
+
+        if self.scheduler is None:
+            self._navigate(url)
+        else:
+            self.scheduler.call(self._navigate, url)
+
+        self.driver.pages_loaded = getattr(self.driver, 'pages_loaded', 0) + 1
+        self.metrics.incr('pages_fetched')
+
+    def fetch_page(self, url):
+        """Loads a page in the driver and returns its rendered HTML as bytes"""
+        self.load_page(url)
+        with self.metrics.time('page_source'):
+            page = self.driver.page_source.encode('utf-8')
+        self.metrics.incr('bytes_fetched', len(page))
+        return page
+
+    def get_list_of_hometeams(self, games_date):
+        """Returns the list of home team cities that played on games_date"""
+        if not self.parse_html:
+            self.load_page(scoreboard_url(games_date))
+            with self.metrics.time('read_elements'):
+                return read_list_of_hometeams(self.driver, games_date)
+
+        page = self.fetch_page(scoreboard_url(games_date))
+        with self.metrics.time('parse'):
+            home_team_list = parse_list_of_hometeams(page)
+        if len(home_team_list) == 0:
+            print(f'On {games_date}, there are no games in the NBA.')
+        else:
+            print(f'On {games_date} there are {len(home_team_list)} games in the NBA.')
+
+        return home_team_list
+
+    def get_scoreboard(self, games_date, etag = None, last_modified = None):
+        """Returns the home team cities of games_date and whether their games are final, as (games, None, None)
+
+        The driver can't send conditional requests, the scoreboard is loaded on every call.
+        """
+        page = self.fetch_page(scoreboard_url(games_date))
+        with self.metrics.time('parse'):
+            return parse_scoreboard(page), None, None
+
+    def get_game_rows(self, home_team, date_played, get_player_data_ind = True, get_team_data_ind = True):
+        """Returns the player and team columns and rows of the game hosted by home_team on date_played"""
+        url = boxscore_url(date_played.replace('-', ''), team_abbreviation(home_team, date_played, self.config))
+        if self.parse_html:
+            page = self.fetch_page(url)
+            with self.metrics.time('parse'):
+                return parse_game_rows(page, home_team, date_played, self.config,
+                                       get_player_data_ind, get_team_data_ind)
+
+        self.load_page(url)
+        #find_element and .text are each a round trip to the driver
+        with self.metrics.time('read_elements'):
+            return read_game_rows(home_team, date_played, self.driver, self.config,
+                                  get_player_data_ind, get_team_data_ind)
+
+    def get_game_datasets(self, home_team, date_played, datasets = ('player', 'team')):
+        """Returns the columns and rows of each of datasets of the game hosted by home_team on date_played, by name
+
+        Every dataset of the box score page is parsed from the source of the page loaded once (see
+        NBA_data_scraper.parsers.parse_game_datasets), so the page is parsed with lxml even without parse_html.
+        """
+        page, pbp_page = fetch_game_pages(self, home_team, date_played, datasets)
+        with self.metrics.time('parse'):
+            return parse_game_datasets(page, home_team, date_played, self.config, datasets, pbp_page)
+
+    def get_game_data(self, home_team, date_played, get_player_data_ind = True, get_team_data_ind = True):
+        """Returns the player and team df of the game hosted by home_team on date_played"""
+        player_data, team_data = self.get_game_rows(home_team, date_played, get_player_data_ind, get_team_data_ind)
+        return rows_to_frame(player_data), rows_to_frame(team_data)
+
+    def quit(self):
+        """Quits the webdriver, or gives it back to the manager it was acquired from"""
+        if self.manager is not None:
+            self.manager.release(self.driver)
+        else:
+            self.driver.quit()
+
+
+class HTTPBackend:
+
+    """Backend downloading pages over HTTP and parsing the static HTML with lxml
+
+    The box score and line score tables are part of the static markup, so no browser or JavaScript
+    rendering is needed.
+
+    Parameters
+    ----------
+
+    session: requests.Session
+        optional, HTTP session to reuse, a pooled keep-alive session is created if not given
+
+    base_url: str
+        root of the Basketball Reference site, can point to a local server serving saved pages
+
+    config: dict
+        optional, mappings of full team names to abbreviations used instead of the team registry,
+        which tells apart the teams sharing a name (i.e. Charlotte Hornets) by the season of the game
+
+    timeout: float
+        seconds to wait for a response
+
+    scheduler: NBA_data_scraper.scheduler.RequestScheduler
+        optional, scheduler throttling and retrying the downloads
+
+    cache: NBA_data_scraper.page_cache.PageCache
+        optional, cache pages are read from before being downloaded
+
+    metrics: NBA_data_scraper.instrumentation.ScrapeMetrics
+        optional, metrics the downloads, cache reads and parsing are timed and counted in
+
+    """
+
+    def __init__(self, session = None, base_url = BASE_URL, config = None, timeout = 30,
+                 scheduler = None, cache = None, metrics = None):
+
+        self.session = session if session is not None else init_session()
+        self.base_url = base_url.rstrip('/')
+        self.config = config
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else ScrapeMetrics()
+
+    def _get(self, url, headers = None):
+        try:
+            with self.metrics.time('download'):
+                response = self.session.get(url, timeout = self.timeout, headers = headers)
+        except (requests.ConnectionError, requests.Timeout) as error:
+            raise RetryableError(f'Could not download {url}: {error}')
+
+        #Too Many Requests and server errors are retried, other errors are raised
+        if (response.status_code == 429) or (response.status_code >= 500):
+            raise RetryableError(f'{url} returned {response.status_code}',
+                                 parse_retry_after(response.headers.get('Retry-After')))
+        response.raise_for_status()
+
+        return response
+
+    def _download(self, url):
+        return self._get(url).content
+
+    def fetch_page(self, url):
+        """Returns the raw content of a page as bytes, from the cache or downloaded through the scheduler"""
+        if self.cache is not None:
+            with self.metrics.time('cache_read'):
+                page = self.cache.get(url)
+            if page is not None:
+                self.metrics.incr('cache_hits')
+                return page
+            self.metrics.incr('cache_misses')
+
+        if self.scheduler is None:
+            page = self._download(url)
+        else:
+            page = self.scheduler.call(self._download, url)
+        self.metrics.incr('pages_fetched')
+        self.metrics.incr('bytes_fetched', len(page))
+
+        if self.cache is not None:
+            self.cache.set(url, page)
+
+        return page
+
+    def fetch_if_modified(self, url, etag = None, last_modified = None):
+        """Returns the raw content of a page that changes (i.e. today's scoreboard) with a conditional request
+
+        The validators of the last response are sent as If-None-Match and If-Modified-Since, a page that
+        did not change since is answered with 304 Not Modified and None is returned for it. The page cache
+        is not used.
+
+        Returns
+        -------
+            bytes, str, str
+                the page (None if not modified) and its ETag and Last-Modified validators
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        if self.scheduler is None:
+            response = self._get(url, headers)
+        else:
+            response = self.scheduler.call(self._get, url, headers)
+
+        if response.status_code == 304:
+            self.metrics.incr('not_modified')
+            return None, etag, last_modified
+
+        self.metrics.incr('pages_fetched')
+        self.metrics.incr('bytes_fetched', len(response.content))
+        return response.content, response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+    def get_scoreboard(self, games_date, etag = None, last_modified = None):
+        """Returns the home team cities of games_date and whether their games are final, with a conditional request
+
+        Returns
+        -------
+            list[(str, bool)], str, str
+                the games (None if the scoreboard did not change) and the validators of the scoreboard
+        """
+        page, etag, last_modified = self.fetch_if_modified(scoreboard_url(games_date, self.base_url), etag, last_modified)
+        if page is None:
+            return None, etag, last_modified
+
+        with self.metrics.time('parse'):
+            return parse_scoreboard(page), etag, last_modified
+
+    def get_list_of_hometeams(self, games_date):
+        """Returns the list of home team cities that played on games_date"""
+        page = self.fetch_page(scoreboard_url(games_date, self.base_url))
+        with self.metrics.time('parse'):
+            home_team_list = parse_list_of_hometeams(page)
+
+        if len(home_team_list) == 0:
+            print(f'On {games_date}, there are no games in the NBA.')
+        else:
+            print(f'On {games_date} there are {len(home_team_list)} games in the NBA.')
+
+        return home_team_list
+
+    def get_game_rows(self, home_team, date_played, get_player_data_ind = True, get_team_data_ind = True):
+        """Returns the player and team columns and rows of the game hosted by home_team on date_played"""
+        modified_date = date_played.replace('-', '')
+        page = self.fetch_page(boxscore_url(modified_date, team_abbreviation(home_team, date_played, self.config), self.base_url))
+
+        with self.metrics.time('parse'):
+            return parse_game_rows(page, home_team, date_played, self.config,
+                                   get_player_data_ind, get_team_data_ind)
+
+    def get_game_datasets(self, home_team, date_played, datasets = ('player', 'team')):
+        """Returns the columns and rows of each of datasets of the game hosted by home_team on date_played, by name
+
+        Every dataset of the box score page is parsed from a single download of it (see
+        NBA_data_scraper.parsers.parse_game_datasets).
+        """
+        page, pbp_page = fetch_game_pages(self, home_team, date_played, datasets, self.base_url)
+        with self.metrics.time('parse'):
+            return parse_game_datasets(page, home_team, date_played, self.config, datasets, pbp_page)
+
+    def get_game_data(self, home_team, date_played, get_player_data_ind = True, get_team_data_ind = True):
+        """Returns the player and team df of the game hosted by home_team on date_played"""
+        player_data, team_data = self.get_game_rows(home_team, date_played, get_player_data_ind, get_team_data_ind)
+        return rows_to_frame(player_data), rows_to_frame(team_data)
+
+    def quit(self):
+        """Closes the HTTP session"""
+        self.session.close()
+
+
+class BackendPool:
+
+    """Pool of backends shared by worker threads
+
+    Each backend (a webdriver or an HTTP session) is only used by one worker at a time. Work handed
+    to the pool is returned in the order it was given, and an error raised for one item is returned
+    for that item instead of stopping the other workers.
+
+    Parameters
+    ----------
+
+    backends: list
+        backends of the pool, one worker thread is run per backend
+
+    """
+
+    def __init__(self, backends):
+
+        self.backends = list(backends)
+        self._idle = queue.Queue()
+        for backend in self.backends:
+            self._idle.put(backend)
+
+    def __len__(self):
+        return len(self.backends)
+
+    @contextmanager
+    def borrow(self):
+        """Context manager lending an idle backend to the caller"""
+        backend = self._idle.get()
+        try:
+            yield backend
+        finally:
+            self._idle.put(backend)
+
+    def _run(self, func, item):
+        with self.borrow() as backend:
+            try:
+                return func(backend, item), None
+            except Exception as error:
+                return None, error
+
+    def imap(self, func, items):
+        """Calls func(backend, item) for every item on the worker threads
+
+        Only a few items per worker are in flight at a time, so results are not piled up in memory
+        when the caller consumes them slower than they are scraped.
+
+        Yields
+        ------
+            item, result, error
+                results are yielded in the order of items, error is None if the call succeeded
+        """
+        items = iter(items)
+        window = 2 * len(self.backends)
+        with ThreadPoolExecutor(max_workers = len(self.backends)) as executor:
+            pending = deque((item, executor.submit(self._run, func, item)) for item in islice(items, window))
+            try:
+                while pending:
+                    item, future = pending.popleft()
+                    result, error = future.result()
+                    for next_item in islice(items, 1):
+                        pending.append((next_item, executor.submit(self._run, func, next_item)))
+                    yield item, result, error
+            finally:
+                #The caller stopped early, work that has not started is dropped
+                for item, future in pending:
+                    future.cancel()
+
+    def quit(self):
+        """Quits every backend of the pool"""
+        for backend in self.backends:
+            backend.quit()
@@ -0,0 +1,623 @@
+"""Module containing the command line backfill of many seasons, sharded into one job per month
+
+Usage:
+    nba-backfill --seasons 2000-2019 --output backfill/ [--jobs 4] [--workers 2]
+    nba-backfill --start-date 2019-03-01 --end-date 2019-04-10 --output backfill/
+
+Every month is a job scraped by its own NBA_scraper in a process of its own and written to its own
+shards, the shards are merged into a player and a team dataset at the end. Running the same command
+again resumes an interrupted backfill: finished months are skipped and unfinished ones skip the games
+already in their shards.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+DATASETS = ('player', 'team')
+
+
+def season_dates(season):
+
+    """Helper function used to get the dates of a season, named after the year it ends in
+
+    Parameters
+    ----------
+        season: int
+            season (i.e. 2019 for 2018-19)
+
+    Returns
+    -------
+        (str, str)
+            first and last date of the season, from August 1st to July 31st unless the season ran later (see teams.season_bounds)
+    """
+    from .teams import season_bounds
+
+    first_day, last_day = season_bounds(season)
+    return str(first_day), str(last_day)
+
+
+def season_ranges(seasons, schedule = None):
+
+    """Helper function used to get the dates to scrape of every season
+
+    Parameters
+    ----------
+        seasons: list[int]
+            seasons (i.e. [2005, 2019])
+
+        schedule: NBA_data_scraper.schedule.ScheduleIndex
+            optional, schedule the first and last game of each season are read from, every date of a season
+            (see season_dates) is scraped without it or if its schedule can't be read
+
+    Returns
+    -------
+        list[(str, str)]
+            first and last date of each season
+    """
+    ranges = []
+    for season in seasons:
+        first_day, last_day = season_dates(season)
+        if schedule is not None:
+            try:
+                span = schedule.span(season)
+            except Exception as error:
+                print(f'Could not read the schedule of {season}, every date of the season will be scraped: {error}')
+                span = None
+            if span is not None:
+                first_day, last_day = span
+        ranges.append((first_day, last_day))
+    return ranges
+
+
+def parse_seasons(values):
+
+    """Helper function used to read the seasons given on the command line
+
+    Parameters
+    ----------
+        values: list[str]
+            seasons (i.e. 2019) and ranges of seasons (i.e. 2000-2019)
+
+    Returns
+    -------
+        list[int]
+            every season, sorted
+    """
+    seasons = set()
+    for value in values:
+        first, _, last = value.partition('-')
+        seasons.update(range(int(first), int(last or first) + 1))
+    return sorted(seasons)
+
+
+def month_jobs(start_date, end_date):
+
+    """Helper function used to split a date range into one job per calendar month
+
+    Parameters
+    ----------
+        start_date: str
+            first date of the range (i.e. 2018-10-16)
+
+        end_date: str
+            last date of the range (i.e. 2019-04-10)
+
+    Returns
+    -------
+        list[(str, str, str)]
+            month (i.e. 2019-03) and first and last date of each job
+    """
+    start = datetime.strptime(start_date, '%Y-%m-%d').date()
+    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    jobs = []
+    while start <= end:
+        next_month = (start.replace(day = 1) + timedelta(days = 32)).replace(day = 1)
+        last = min(end, next_month - timedelta(days = 1))
+        jobs.append((start.strftime('%Y-%m'), str(start), str(last)))
+        start = next_month
+    return jobs
+
+
+def range_jobs(date_ranges):
+
+    """Helper function used to split several date ranges into one job per calendar month of each range
+
+    Parameters
+    ----------
+        date_ranges: list[(str, str)]
+            first and last date of each range, in date order
+
+    Returns
+    -------
+        list[(str, str, str)]
+            name and first and last date of each job, named after its month (i.e. 2019-03) or after its
+            first date when another range already has a job that month (i.e. 2020-10-12)
+    """
+    jobs = []
+    names = set()
+    for start_date, end_date in date_ranges:
+        for month, first_day, last_day in month_jobs(start_date, end_date):
+            name = month if month not in names else first_day
+            names.add(name)
+            jobs.append((name, first_day, last_day))
+    return jobs
+
+
+def format_duration(seconds):
+    """Returns seconds as i.e. 1h02m or 3m05s"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f'{seconds // 3600}h{seconds % 3600 // 60:02d}m'
+    return f'{seconds // 60}m{seconds % 60:02d}s'
+
+
+class BackfillProgress:
+
+    """Games scraped by the running jobs, with the throughput of the run and the time left
+
+    Parameters
+    ----------
+
+    planned: dict
+        games planned in every month to scrape, None for a month whose games the schedule does not tell
+
+    """
+
+    def __init__(self, planned):
+
+        self.planned = dict(planned)
+        self.scraped = {}
+        self.finished = set()
+        self.start = time.perf_counter()
+
+    def update(self, month, games):
+        """Records the games scraped so far by the job of month"""
+        self.scraped[month] = games
+
+    def finish(self, month, games):
+        """Records a finished job and its games"""
+        self.scraped[month] = games
+        self.finished.add(month)
+
+    @property
+    def games(self):
+        return sum(self.scraped.values())
+
+    @property
+    def games_per_min(self):
+        return self.games / max(time.perf_counter() - self.start, 1e-9) * 60
+
+    def remaining_games(self):
+        """Games left to scrape, months without a schedule count as the average planned month"""
+        known = [games for games in self.planned.values() if games]
+        average = sum(known) / len(known) if known else 0
+        remaining = 0
+        for month, games in self.planned.items():
+            if month in self.finished:
+                continue
+            remaining += max(0, (average if games is None else games) - self.scraped.get(month, 0))
+        return remaining
+
+    def eta(self):
+        """Returns the seconds left at the current throughput, None before the first game"""
+        if self.games == 0:
+            return None
+        return self.remaining_games() / self.games_per_min * 60
+
+    def line(self):
+        eta = self.eta()
+        return (f'{len(self.finished)}/{len(self.planned)} months  {self.games} games  '
+                f'{self.games_per_min:.1f} games/min  elapsed {format_duration(time.perf_counter() - self.start)}  '
+                f'ETA {format_duration(eta) if eta is not None else "-"}')
+
+
+def plan_games(jobs, scraper):
+
+    """Function used to count the games of every month from the season schedules
+
+    The schedules are saved to the schedule cache of the scraper, so the jobs don't load them again.
+
+    Parameters
+    ----------
+        jobs: list[(str, str, str)]
+            month and first and last date of each job
+
+        scraper: NBA_data_scraper.NBA_scraper
+            scraper with a season schedule
+
+    Returns
+    -------
+        dict
+            games of each month, None if its schedule could not be read
+    """
+    planned = {}
+    for month, start_date, end_date in jobs:
+        try:
+            games = 0
+            day = datetime.strptime(start_date, '%Y-%m-%d').date()
+            while str(day) <= end_date:
+                home_teams = scraper.schedule.games_on(str(day))
+                #Dates outside of the schedule are read from their scoreboard, their games are not known yet
+                if not home_teams and not scraper.schedule.covers(str(day)):
+                    games = None
+                    break
+                games += len(home_teams)
+                day += timedelta(days = 1)
+            planned[month] = games
+        except Exception as error:
+            print(f'Could not read the schedule of {month}, its games will be counted once scraped: {error}')
+            planned[month] = None
+    return planned
+
+
+def _report_progress(scraper, month, progress_queue, stop, every):
+    #Sends the games scraped by the job to the main process until stop is set
+    while not stop.wait(every):
+        progress_queue.put((month, scraper.metrics.counters.get('games_scraped', 0)))
+
+
+def _shard_dir(output_dir, name, month):
+    return Path(output_dir) / 'shards' / name / month
+
+
+def run_job(job, output_dir, scraper_options, progress_queue = None, report_every = 1.0):
+
+    """Function used to scrape the games of a month into its shards, in a process of its own
+
+    The rows are appended to the shards of the month (shards/player/<month>/ and shards/team/<month>/)
+    every few games, a job that is interrupted or has games that could not be scraped skips the games
+    already in its shards the next time it runs. Its done marker is only written once every game of the
+    month is scraped. The output of the scraper goes to logs/<month>.log.
+
+    Parameters
+    ----------
+        job: (str, str, str)
+            month and first and last date of the job
+
+        output_dir: str
+            directory of the backfill
+
+        scraper_options: dict
+            keyword arguments of the NBA_scraper of the job
+
+        progress_queue: queue
+            optional, queue the games scraped so far are sent to as (month, games)
+
+        report_every: float
+            seconds between two progress reports
+
+    Returns
+    -------
+        (str, int, int)
+            month, games scraped by this run and games that could not be scraped
+    """
+    from .data_scraper import NBA_scraper
+    from .storage import GameIndex
+
+    month, start_date, end_date = job
+    (Path(output_dir) / 'logs').mkdir(parents = True, exist_ok = True)
+    shard_dirs = {name: _shard_dir(output_dir, name, month) for name in DATASETS}
+    for shard_dir in shard_dirs.values():
+        shard_dir.mkdir(parents = True, exist_ok = True)
+
+    with open(Path(output_dir) / 'logs' / f'{month}.log', 'a') as log_file, redirect_stdout(log_file), redirect_stderr(log_file):
+        start = time.perf_counter()
+        with NBA_scraper(**scraper_options) as scraper:
+            stop = threading.Event()
+            if progress_queue is not None:
+                threading.Thread(target = _report_progress, args = (scraper, month, progress_queue, stop, report_every),
+                                 daemon = True).start()
+            try:
+                scraper.get_player_team_data(start_date, end_date, 
+                                             pre_player_data_dir = str(shard_dirs['player']), 
+                                             pre_team_data_dir = str(shard_dirs['team']), 
+                                             append_only = True)
+            finally:
+                stop.set()
+            failed = len(scraper.failed_games)
+            scraped = scraper.metrics.counters.get('games_scraped', 0)
+
+        if failed:
+            print(f'{failed} games of {month} could not be scraped')
+            return month, scraped, failed
+
+        _write_done(output_dir, month, {'games': len(GameIndex(shard_dirs['team'])), 
+                                        'seconds': time.perf_counter() - start})
+
+    return month, scraped, 0
+
+
+def _done_path(output_dir, month):
+    return Path(output_dir) / 'jobs' / f'{month}.json'
+
+
+def _write_done(output_dir, month, summary):
+    #The done marker is written last, a month without one is scraped again
+    from .storage import _commit, _temp_path
+
+    path = _done_path(output_dir, month)
+    path.parent.mkdir(parents = True, exist_ok = True)
+    temp_path = _temp_path(path)
+    with open(temp_path, 'w') as temp_file:
+        json.dump(summary, temp_file)
+    _commit(temp_path, path)
+
+
+def _read_done(output_dir, month):
+    path = _done_path(output_dir, month)
+    if not path.exists():
+        return None
+    with open(path) as done_file:
+        return json.load(done_file)
+
+
+def merge_shards(shard_paths, path):
+
+    """Function used to merge csv shards into a single dataset, without holding the shards in memory
+
+    Shards with the columns of the merged dataset are copied byte for byte, the others (i.e. older
+    seasons without +/-) are lined up with its columns. The dataset is written to a temp file renamed
+    over path, so merging again after adding shards never leaves a half written dataset.
+
+    Parameters
+    ----------
+        shard_paths: list[str]
+            csv shards, in the order their rows are written
+
+        path: str
+            path of the merged csv dataset
+    """
+    import csv
+
+    import pandas as pd
+
+    from .storage import _commit, _temp_path, read_csv_header
+
+    headers = [read_csv_header(shard_path) for shard_path in shard_paths]
+    columns = list(max(headers, key = len, default = []))
+    for header in headers:
+        columns += [col for col in header if col not in columns]
+
+    temp_path = _temp_path(path)
+    try:
+        with open(temp_path, 'w', newline = '') as merged_file:
+            csv.writer(merged_file).writerow(columns)
+            for shard_path, header in zip(shard_paths, headers):
+                if header == columns:
+                    with open(shard_path, newline = '') as shard_file:
+                        shard_file.readline()
+                        shutil.copyfileobj(shard_file, merged_file)
+                else:
+                    shard = pd.read_csv(shard_path, dtype = str, keep_default_na = False)
+                    shard.reindex(columns = columns, fill_value = '').to_csv(merged_file, header = False, index = False)
+        _commit(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def merge_parquet(shard_paths, path):
+
+    """Function used to write csv shards as a typed Parquet dataset partitioned by season
+
+    The dataset is written next to path and swapped in once complete, an existing dataset at path is replaced.
+
+    Parameters
+    ----------
+        shard_paths: list[str]
+            csv shards
+
+        path: str
+            directory of the Parquet dataset
+    """
+    import pandas as pd
+
+    from .storage import write_parquet
+
+    temp_dir = Path(str(path) + '.tmp')
+    shutil.rmtree(temp_dir, ignore_errors = True)
+    temp_dir.mkdir(parents = True)
+    for shard_path in shard_paths:
+        write_parquet(pd.read_csv(shard_path, dtype = str, keep_default_na = False), temp_dir)
+    shutil.rmtree(path, ignore_errors = True)
+    os.replace(temp_dir, path)
+
+
+def backfill(start_date, end_date, output_dir, jobs = None, scraper_options = None,
+             output_format = 'csv', merge = True, progress_every = 10.0, seasons = None):
+
+    """Function used to scrape every game between two dates, or of some seasons, into sharded datasets merged at the end
+
+    The dates are split into one job per month, jobs run in parallel processes each with its own
+    NBA_scraper, the requests per minute of scraper_options being split between them. The games of every
+    month are counted from the season schedules first to report the throughput and the time left.
+
+    Parameters
+    ----------
+        start_date: str
+            first date to scrape (i.e. 1999-08-01), None with seasons
+
+        end_date: str
+            last date to scrape, None with seasons, dates after yesterday are not scraped
+
+        output_dir: str
+            directory of the shards, logs and merged datasets
+
+        jobs: int
+            number of months scraped in parallel, defaults to the number of cpus
+
+        scraper_options: dict
+            optional, keyword arguments of the NBA_scraper of every job (i.e. backend, n_workers, requests_per_minute)
+
+        output_format: str
+            format of the merged datasets, either 'csv' (player_data.csv) or 'parquet' (player_data/)
+
+        merge: bool
+            Indicate whether to merge the shards once every month is scraped
+
+        progress_every: float
+            seconds between two progress lines
+
+        seasons: list[int]
+            optional, seasons to scrape instead of the dates (i.e. [2005, 2019]), each from its first to its
+            last game according to its schedule
+
+    Returns
+    -------
+        dict
+            months scraped and months that are not finished, with their games
+    """
+    from .data_scraper import NBA_scraper
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents = True, exist_ok = True)
+    jobs = jobs or os.cpu_count() or 1
+    scraper_options = dict(scraper_options or {})
+    scraper_options.setdefault('backend', 'http')
+    scraper_options.setdefault('schedule_cache', str(output_dir / 'schedule.json'))
+    requests_per_minute = scraper_options.pop('requests_per_minute', 20)
+    job_options = dict(scraper_options, requests_per_minute = requests_per_minute / jobs if requests_per_minute else None)
+
+    #Schedule pages are loaded by a single scraper, the jobs read them from the schedule cache
+    planner_options = dict(scraper_options, backend = 'http', n_workers = 1, requests_per_minute = requests_per_minute)
+    planner_options.pop('driverpath', None)
+    with NBA_scraper(**planner_options) as planner:
+        #Each season is scraped on its own, the months between two seasons are not
+        date_ranges = season_ranges(seasons, planner.schedule) if seasons else [(str(start_date), str(end_date))]
+        yesterday = str(date.today() - timedelta(days = 1))
+        date_ranges = [(first_day, min(last_day, yesterday)) for first_day, last_day in date_ranges if first_day <= yesterday]
+        month_list = range_jobs(date_ranges)
+        done = {month: _read_done(output_dir, month) for month, _, _ in month_list}
+        todo = [job for job in month_list if done[job[0]] is None]
+        print(f'{len(month_list)} months in {len(date_ranges)} date ranges, {len(month_list) - len(todo)} already scraped')
+
+        planned = plan_games(todo, planner)
+
+    progress = BackfillProgress(planned)
+    failed = {}
+    for month, games in planned.items():
+        if games == 0:
+            #Nothing to scrape according to the schedule, no done marker so the month is planned again next time
+            progress.finish(month, 0)
+    todo = [job for job in todo if planned[job[0]] != 0]
+    print(f'{len(todo)} months to scrape ({sum(games or 0 for games in planned.values())} games planned) with {jobs} jobs')
+
+    if todo:
+        context = multiprocessing.get_context('spawn')
+        with context.Manager() as manager, ProcessPoolExecutor(max_workers = min(jobs, len(todo)), mp_context = context) as executor:
+            progress_queue = manager.Queue()
+            futures = {executor.submit(run_job, job, str(output_dir), job_options, progress_queue): job[0] for job in todo}
+            last_line = time.perf_counter()
+            while futures:
+                finished, _ = wait(futures, timeout = 1.0, return_when = FIRST_COMPLETED)
+                while True:
+                    try:
+                        progress.update(*progress_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for future in finished:
+                    month = futures.pop(future)
+                    try:
+                        month, games, failed_games = future.result()
+                    except Exception as error:
+                        print(f'{month} failed: {error!r}, see {output_dir / "logs" / (month + ".log")}')
+                        failed[month] = None
+                        progress.finish(month, progress.scraped.get(month, 0))
+                        continue
+                    progress.finish(month, games)
+                    if failed_games:
+                        failed[month] = failed_games
+                        print(f'{month}: {failed_games} games could not be scraped')
+                    print(f'{month} done  ' + progress.line())
+                    last_line = time.perf_counter()
+                if time.perf_counter() - last_line >= progress_every:
+                    print(progress.line())
+                    last_line = time.perf_counter()
+
+    print(f'Scraped {progress.games} games in {format_duration(time.perf_counter() - progress.start)} '
+          f'({progress.games_per_min:.1f} games/min)')
+
+    if failed:
+        print(f'{len(failed)} months are not finished ({", ".join(sorted(failed))}), run the same command again to resume them')
+    elif merge:
+        for name in DATASETS:
+            #Partitions of every month, in the order they were written
+            shard_paths = [str(shard_path) for month, _, _ in month_list
+                           for shard_path in sorted(_shard_dir(output_dir, name, month).glob('part-*.csv'))]
+            if not shard_paths:
+                continue
+            if output_format == 'parquet':
+                merge_parquet(shard_paths, output_dir / f'{name}_data')
+            else:
+                merge_shards(shard_paths, output_dir / f'{name}_data.csv')
+            print(f'Merged {len(shard_paths)} {name} shards')
+
+    return {'months': len(month_list), 'games': progress.games, 'failed': failed}
+
+
+def main(argv = None):
+
+    """Entry point of the nba-backfill console script, returns the exit code"""
+    parser = argparse.ArgumentParser(prog = 'nba-backfill', description = __doc__.splitlines()[0],
+                                     formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+    dates = parser.add_mutually_exclusive_group(required = True)
+    dates.add_argument('--seasons', nargs = '+', help = 'seasons named after the year they end in, i.e. 2019 or 2000-2019')
+    dates.add_argument('--start-date', help = 'first date to scrape, i.e. 2019-03-01')
+    parser.add_argument('--end-date', help = 'last date to scrape with --start-date, defaults to the start date')
+    parser.add_argument('--output', required = True, help = 'directory of the shards, logs and merged datasets')
+    parser.add_argument('--jobs', type = int, default = os.cpu_count(), help = 'months scraped in parallel processes')
+    parser.add_argument('--workers', type = int, default = 1, help = 'workers of the scraper of each job')
+    parser.add_argument('--parse-workers', type = int, default = 0, help = 'parse processes of the scraper of each job')
+    parser.add_argument('--backend', choices = ['http', 'selenium'], default = 'http')
+    parser.add_argument('--driverpath', default = None, help = 'chromedriver of the selenium backend')
+    parser.add_argument('--base-url', default = None, help = 'root of the Basketball Reference site')
+    parser.add_argument('--requests-per-minute', type = float, default = 20, help = 'budget shared by every job, 0 to not throttle')
+    parser.add_argument('--cache-dir', default = None, help = 'on-disk page cache of the http backend')
+    parser.add_argument('--format', choices = ['csv', 'parquet'], default = 'csv', help = 'format of the merged datasets')
+    parser.add_argument('--no-merge', action = 'store_true', help = 'keep the monthly shards without merging them')
+    parser.add_argument('--progress-every', type = float, default = 10.0, help = 'seconds between two progress lines')
+    args = parser.parse_args(argv)
+
+    seasons = None
+    start_date, end_date = None, None
+    if args.seasons:
+        seasons = parse_seasons(args.seasons)
+    else:
+        start_date, end_date = args.start_date, args.end_date or args.start_date
+
+    scraper_options = {'backend': args.backend,
+                       'n_workers': args.workers,
+                       'max_workers': args.workers,
+                       'parse_workers': args.parse_workers,
+                       'requests_per_minute': args.requests_per_minute or None,
+                       'cache_dir': args.cache_dir}
+    if args.base_url:
+        scraper_options['base_url'] = args.base_url
+    if args.driverpath:
+        scraper_options['driverpath'] = args.driverpath
+
+    try:
+        result = backfill(start_date, end_date, args.output, jobs = args.jobs, scraper_options = scraper_options,
+                          output_format = args.format, merge = not args.no_merge, progress_every = args.progress_every,
+                          seasons = seasons)
+    except KeyboardInterrupt:
+        print('Interrupted, run the same command again to resume the backfill')
+        return 130
+
+    return 1 if result['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,79 +1,28 @@
 """ Core module for NBA Data Scraper """
 
-import selenium 
 import pandas as pd
-import numpy as np
-import yaml
+import asyncio
+import multiprocessing
 import os
-import sys
-from pathlib import Path
-from selenium import webdriver 
-from datetime import date, timedelta, datetime
-from .util_helpers import get_list_of_hometeams, get_player_data, get_team_data
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from datetime import timedelta, datetime
+from itertools import islice
+from .util_helpers import BASE_URL, GameRecord, RowBuffer, boxscore_url
+from .backends import SeleniumBackend, HTTPBackend, BackendPool, init_session, fetch_game_pages
+from .parsers import check_datasets, parse_game_datasets, parse_game_rows
+from .scheduler import RequestScheduler
+from .page_cache import PageCache
+from .instrumentation import ScrapeMetrics, timed
+from .storage import FlushedGameIds, GameIndex, append_csv, open_checkpoint, read_dataset
+from .schedule import ScheduleIndex
+from .schema import season_of
+from .teams import current_teams, team_abbreviation, team_by_city
 
-#Dictionary used to map NBA cities to full team names and abbreviations 
-team_full_abrv_config = { 
-  'Atlanta': {'Full Name': 'Atlanta Hawks', 
-              'Abbreviation': 'ATL'},
-  'Boston': {'Full Name': 'Boston Celtics', 
-             'Abbreviation': 'BOS'},   
-  'Brooklyn': {'Full Name': 'Brooklyn Nets',
-               'Abbreviation': 'BRK'},
-  'Chicago': {'Full Name': 'Chicago Bulls',
-              'Abbreviation': 'CHI'},
-  'Charlotte': {'Full Name': 'Charlotte Hornets',
-                'Abbreviation': 'CHO'},
-  'Cleveland': {'Full Name': 'Cleveland Cavaliers',
-                'Abbreviation': 'CLE'},  
-  'Dallas': {'Full Name': 'Dallas Mavericks',
-             'Abbreviation': 'DAL'},  
-  'Denver': {'Full Name': 'Denver Nuggets',
-             'Abbreviation': 'DEN'},  
-  'Detroit': {'Full Name': 'Detroit Pistons',
-              'Abbreviation': 'DET'},  
-  'Golden State':  {'Full Name': 'Golden State Warriors',
-                    'Abbreviation': 'GSW'},  
-  'Houston': {'Full Name': 'Houston Rockets',
-              'Abbreviation': 'HOU'},
-  'Indiana': {'Full Name': 'Indiana Pacers',
-              'Abbreviation': 'IND'},
-  'LA Clippers': {'Full Name': 'Los Angeles Clippers',
-                  'Abbreviation': 'LAC'},
-  'LA Lakers': {'Full Name': 'Los Angeles Lakers',
-                'Abbreviation': 'LAL'},
-  'Miami': {'Full Name': 'Miami Heat',
-            'Abbreviation': 'MIA'},
-  'Milwaukee': {'Full Name': 'Milwaukee Bucks',
-                'Abbreviation': 'MIL'},
-  'Minnesota': {'Full Name': 'Minnesota Timberwolves',
-                'Abbreviation': 'MIN'},
-  'Memphis': {'Full Name': 'Memphis Grizzlies',
-              'Abbreviation': 'MEM'},
-  'New Orleans': {'Full Name': 'New Orleans Pelicans',
-                  'Abbreviation': 'NOP'},
-  'New York': {'Full Name': 'New York Knicks',
-               'Abbreviation': 'NYK'},
-  'Oklahoma City': {'Full Name': 'Oklahoma City Thunder',
-                    'Abbreviation': 'OKC'},
-  'Orlando': {'Full Name': 'Orlando Magic',
-              'Abbreviation': 'ORL'},
-  'Philadelphia': {'Full Name': 'Philadelphia 76ers',
-                   'Abbreviation': 'PHI'},
-  'Phoenix': {'Full Name': 'Phoenix Suns',
-              'Abbreviation': 'PHO'},
-  'Portland': {'Full Name': 'Portland Trail Blazers',
-               'Abbreviation': 'POR'},
-  'Sacramento': {'Full Name': 'Sacramento Kings',
-                 'Abbreviation': 'SAC'},
-  'San Antonio': {'Full Name': 'San Antonio Spurs', 
-                  'Abbreviation': 'SAS'},
-  'Toronto': {'Full Name': 'Toronto Raptors',
-              'Abbreviation': 'TOR'},
-  'Utah': {'Full Name': 'Utah Jazz',
-           'Abbreviation': 'UTA'},
-  'Washington': {'Full Name': 'Washington Wizards',
-                 'Abbreviation': 'WAS'}
- }
+#Dictionary used to map the cities of the current NBA teams to full team names and abbreviations 
+team_full_abrv_config = {team.city: {'Full Name': team.full_name, 'Abbreviation': team.abbreviation} for team in current_teams()}
 
 class NBA_scraper:
     
@@ -81,33 +30,149 @@ class NBA_scraper:
     
     This class holds methods of initializing chromedriver, checking how many games there are in a 
     particular date and extracting player / team data to new or existing datasets. In order to use this 
-    class, chromedriver will need to downloaded. 
+    class with the default selenium backend, chromedriver will need to downloaded. 
     
     Please download the appropriate chromedriver here:
     https://sites.google.com/a/chromium.org/chromedriver/downloads 
     
+    The http backend downloads the pages with a pooled keep-alive session and parses the static HTML
+    with lxml instead, which does not require chromedriver or a browser.
+    
     Parameters
     ----------
     
     driverpath: str, 
-        Directory to the Chromedriver
+        Directory to the Chromedriver, only needed for the selenium backend
+        
+    driver_manager: NBA_data_scraper.drivers.DriverManager,
+        optional, manager the drivers are acquired from, shared by several scrapers to reuse warm drivers
+        
+    headless: bool,
+        Indicate whether to run Chrome without a window, images, stylesheets and JavaScript are always disabled
+        
+    max_pages_per_driver: int,
+        page loads after which a driver is replaced by a fresh one
+        
+    max_driver_rss: int,
+        resident memory in bytes of a driver's Chrome processes after which it is replaced by a fresh one
     
     team_full_abrv_config: dict,
-        yaml file containing mappings of both Full Names and Abbreviations for NBA cities (i.e. Boston, full name is Boston Celtics and abbreviated is BOS)
+        optional, mappings of both Full Names and Abbreviations for NBA cities (i.e. Boston, full name is Boston Celtics and abbreviated is BOS), 
+        the team registry is used without it, which also knows the past teams of a city (i.e. Seattle or the Charlotte Bobcats)
+        
+    backend: str,
+        backend used to fetch and parse pages, either 'selenium' or 'http'
+        
+    base_url: str,
+        root of the Basketball Reference site used by the http backend (i.e. a local server serving saved pages)
+        
+    n_workers: int,
+        number of drivers or http sessions scraping games in parallel
+        
+    max_workers: int,
+        politeness cap on the number of workers, n_workers above it are reduced to it
+        
+    parse_workers: int,
+        number of processes parsing the game pages, 0 to parse them on the workers fetching them
+        
+    requests_per_minute: float,
+        budget of page loads per minute shared by every worker, None to not throttle
+        
+    max_retries: int,
+        number of times a page load is retried on 429 / 5xx responses with exponential backoff
+        
+    cache_dir: str,
+        optional, directory of the on-disk page cache used by the http backend
         
+    cache_max_bytes: int,
+        budget of the page cache on disk, least recently used pages are evicted past it
+        
+    scoreboard_ttl: float,
+        seconds a cached scoreboard or box score of a date that is not over is kept (finished games are kept forever)
+        
+    use_schedule: bool,
+        Indicate whether to list the games of each date from the season schedule instead of its scoreboard
+        
+    schedule_cache: str,
+        optional, json file the season schedules are saved to and reused from across runs
+        
+    metrics_path: str,
+        optional, file the metrics of every run are written to, in the Prometheus text format if it ends with .prom and as json otherwise
     
     """
     
     def __init__(self, 
-                 driverpath, 
-                 team_full_abrv_config = team_full_abrv_config):
+                 driverpath = None, 
+                 driver_manager = None, 
+                 headless = True, 
+                 max_pages_per_driver = 500, 
+                 max_driver_rss = 2**30, 
+                 team_full_abrv_config = None, 
+                 backend = 'selenium', 
+                 base_url = BASE_URL, 
+                 n_workers = 1, 
+                 max_workers = 8, 
+                 parse_workers = 0, 
+                 requests_per_minute = 20, 
+                 max_retries = 5, 
+                 cache_dir = None, 
+                 cache_max_bytes = 2 * 2**30, 
+                 scoreboard_ttl = 15 * 60, 
+                 use_schedule = True, 
+                 schedule_cache = None, 
+                 metrics_path = None):
     
         self.driverpath = driverpath
+        self.driver_manager = driver_manager
+        self._owns_driver_manager = False
+        self.headless = headless
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_driver_rss = max_driver_rss
         self.team_full_abrv_config = team_full_abrv_config
-        self.init_driverpath()
+        self.backend_name = backend
+        self.base_url = base_url
+        self.n_workers = max(1, min(n_workers, max_workers))
+        self.parse_workers = parse_workers
+        #Timers and counters of the last run, shared by every worker
+        self.metrics = ScrapeMetrics()
+        self.metrics_path = metrics_path
+        #Every page load of every worker goes through the same scheduler
+        self.scheduler = RequestScheduler(requests_per_minute, max_retries = max_retries, metrics = self.metrics)
+        self.cache = None
+        
+        if cache_dir:
+            #The selenium backend reads the rendered page from the driver, only raw pages can be cached
+            if backend != 'http':
+                raise ValueError('The page cache is only supported by the http backend')
+            self.cache = PageCache(cache_dir, max_bytes = cache_max_bytes, scoreboard_ttl = scoreboard_ttl)
+        #Games that could not be scraped during the last run, as (date, home team, error)
+        self.failed_games = []
+        
+        if backend == 'selenium':
+            self.init_driverpath()
+        elif backend == 'http':
+            self.backend_pool = BackendPool([HTTPBackend(init_session(), base_url = base_url, 
+                                                         scheduler = self.scheduler, cache = self.cache, 
+                                                         metrics = self.metrics) 
+                                             for i in range(self.n_workers)])
+            self.backend = self.backend_pool.backends[0]
+        else:
+            raise ValueError(f"Unknown backend {backend}, please use either 'selenium' or 'http'")
+        
+        #Season schedules list the games of every date without loading one scoreboard per date
+        self.schedule = None
+        if use_schedule:
+            self.schedule = ScheduleIndex(self.fetch_page, base_url = base_url, cache_path = schedule_cache)
+    
+    def fetch_page(self, url):
+        """Returns the raw content of a page fetched by an idle worker"""
+        with self.backend_pool.borrow() as backend:
+            return backend.fetch_page(url)
         
     def init_driverpath(self):
-        """Initializes the Selenium Webdriver
+        """Initializes the Selenium Webdriver, one per worker
+        
+        Drivers are acquired from driver_manager, a manager of headless drivers is started if none was given
         
         Parameters
         ----------
@@ -119,14 +184,451 @@ class NBA_scraper:
         selenium.webdriver.chrome.webdriver.WebDriver
         
         """
+        #selenium is only imported by the selenium backend
         try:
-            self.driver = webdriver.Chrome(str(self.driverpath))
+            from .drivers import DriverManager
+        except ImportError as error:
+            raise ImportError('The selenium backend requires selenium, please install it with '
+                              'pip install NBA_data_scraper[selenium] or use the http backend') from error
+        
+        drivers = []
+        try:
+            if self.driver_manager is None:
+                self.driver_manager = DriverManager(self.driverpath, 
+                                                    max_pages = self.max_pages_per_driver, 
+                                                    max_rss = self.max_driver_rss, 
+                                                    headless = self.headless)
+                self._owns_driver_manager = True
+            for i in range(self.n_workers):
+                drivers.append(self.driver_manager.acquire())
         except:
+            for driver in drivers:
+                self.driver_manager.release(driver)
+            if self._owns_driver_manager:
+                self.driver_manager.quit()
             raise Exception('The chromedriver path is not valid, please ensure you have the correct path')
+        
+        self.backend_pool = BackendPool([SeleniumBackend(driver, scheduler = self.scheduler, 
+                                                         manager = self.driver_manager, 
+                                                         parse_html = self.driver_manager.parse_html, 
+                                                         metrics = self.metrics) 
+                                         for driver in drivers])
+        self.backend = self.backend_pool.backends[0]
+    
+    @property
+    def driver(self):
+        """Webdriver of the first worker, None with the http backend"""
+        return getattr(self.backend, 'driver', None)
+    
+    def _date_list(self, start_date, end_date = None):
+        #Converts start and end date from string to datetime
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        
+        if end_date:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        else: 
+            end_date = start_date
+        
+        delta = end_date - start_date  
+        #Appends list of date between start and end date to strings
+        date_list = []
+        for i in range(delta.days + 1):
+            day = start_date + timedelta(days=i)
+            date_list.append(str(day))
+        
+        return date_list
+    
+    def _schedule_games(self, date_list):
+        #Home teams of every date are read from the season schedule, returns them with the dates it can't be read for
+        home_teams_by_date = {}
+        scoreboard_dates = []
+        uncovered_dates = []
+        for date in date_list:
+            if self.schedule is None:
+                scoreboard_dates.append(date)
+                continue
+            try:
+                home_team_list = self.schedule.games_on(date)
+                #A date without games outside the span of the schedule may be missing from it, not an off-day
+                if not home_team_list and not self.schedule.covers(date):
+                    uncovered_dates.append(date)
+                    scoreboard_dates.append(date)
+                    continue
+            except Exception as error:
+                print(f'Could not read the schedule of {date}, its scoreboard will be loaded instead: {error}')
+                scoreboard_dates.append(date)
+                continue
+            home_teams_by_date[date] = home_team_list
+            if home_team_list:
+                print(f'Now scraping data from NBA games on {date}')
+        
+        if uncovered_dates:
+            print(f'{len(uncovered_dates)} of the dates ({uncovered_dates[0]} to {uncovered_dates[-1]}) are outside of '
+                  'the season schedule, their scoreboards will be loaded instead')
+        
+        if self.schedule is not None:
+            off_days = sum(1 for home_team_list in home_teams_by_date.values() if not home_team_list)
+            if off_days:
+                print(f'There are no games in the NBA on {off_days} of the dates according to the schedule')
+        
+        return home_teams_by_date, scoreboard_dates
+    
+    def _full_name(self, city, date):
+        #Full name of the team a scoreboard lists by its city, the team of the city at the time of the game
+        if self.team_full_abrv_config is not None:
+            return self.team_full_abrv_config[city]['Full Name']
+        return team_by_city(city, season_of(date)).full_name
+    
+    def _game_id(self, date, home_team):
+        #Game-ID of the game hosted by home_team, the abbreviation depends on the season (i.e. CHH or CHO)
+        try:
+            return date.replace('-', '') + team_abbreviation(home_team, date)
+        except KeyError:
+            return date.replace('-', '')
+    
+    def _order_games(self, date_list, home_teams_by_date, skip_game_ids = None):
+        #Returns the (date, home team) of every game played on the dates, in date order
+        games = []
+        skipped = 0
+        for date in date_list:
+            for home_team in home_teams_by_date.get(date, []):
+                game_id = self._game_id(date, home_team)
+                if skip_game_ids and game_id in skip_game_ids:
+                    skipped += 1
+                    continue
+                games.append((date, home_team))
+        
+        if skipped:
+            print(f'Skipping {skipped} games already in the existing datasets')
+        
+        return games
+    
+    def _list_games(self, date_list, skip_game_ids = None):
+        #Dates the schedule can't be read for fall back to their scoreboard
+        with self.metrics.time('schedule'):
+            home_teams_by_date, scoreboard_dates = self._schedule_games(date_list)
+        
+        def list_games(backend, date):
+            print(f'Now scraping data from NBA games on {date}')
+            return backend.get_list_of_hometeams(date)
+        
+        #Scoreboards of the remaining dates are loaded by the pool
+        for date, home_team_list, error in self.backend_pool.imap(list_games, scoreboard_dates):
+            if error is not None:
+                print(f'Could not get the games played on {date}: {error}')
+                self.failed_games.append((date, None, error))
+                self.metrics.incr('dates_failed')
+                continue
+            home_teams_by_date[date] = [self._full_name(city, date) for city in home_team_list]
+        
+        return self._order_games(date_list, home_teams_by_date, skip_game_ids)
+    
+    def _game_record(self, date, home_team, player_data, team_data, datasets = None):
+        #Counts the rows of a scraped game before handing it out
+        self.metrics.incr('games_scraped')
+        for name, data in [('player', player_data), ('team', team_data)] + list((datasets or {}).items()):
+            if data is not None:
+                self.metrics.incr(f'{name}_rows', len(data[1]))
+        return GameRecord(game_id = self._game_id(date, home_team), 
+                          date = date, 
+                          home_team = home_team, 
+                          player_data = player_data, 
+                          team_data = team_data, 
+                          datasets = datasets)
+    
+    def _dataset_record(self, date, home_team, game_datasets):
+        #Player and team stats are kept apart from the other datasets of the game
+        game_datasets = dict(game_datasets)
+        player_data = game_datasets.pop('player', None)
+        team_data = game_datasets.pop('team', None)
+        return self._game_record(date, home_team, player_data, team_data, game_datasets)
+    
+    def _game_failed(self, date, home_team, error):
+        print(f'Could not scrape the game of {home_team} on {date}: {error}')
+        self.failed_games.append((date, home_team, error))
+        self.metrics.incr('games_failed')
+    
+    def write_metrics(self):
+        """Writes the metrics of the last run to metrics_path, if it was given"""
+        if self.metrics_path:
+            self.metrics.write(self.metrics_path)
+    
+    def iter_games(self, start_date, end_date = None, 
+                   get_player_data_ind = True, get_team_data_ind = True, 
+                   skip_game_ids = None, datasets = None):
+        """Generator yielding the stats of every game between the start and end date as soon as it is scraped
+        
+        Nothing is kept once a game is yielded, so memory stays flat over any date range. Games that 
+        can't be scraped are printed and collected in failed_games instead of stopping the run.
+        
+        Other datasets (i.e. advanced) are parsed from the same box score page as the player and team 
+        stats, so they don't cost another page load, except for the play-by-play which has a page of its own.
+        
+        start_date: str
+            start date of the scrape (i.e. 2019-03-21)
+        end_date: str
+            optional, end date of the scrape only games of the start_date will be scraped
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        skip_game_ids: set
+            optional, Game-IDs of games not to scrape (i.e. games already in a dataset)
+        datasets: iterable[str]
+            optional, other datasets to scrape (advanced, periods or pbp, see NBA_data_scraper.parsers.DATASETS)
+            
+        Yields
+        ------
+            GameRecord
+            Game-ID, date, home team, player and team stats and other datasets of each game, in date order
+            
+        """
+        if datasets:
+            datasets = [name for name, data_ind in (('player', get_player_data_ind), ('team', get_team_data_ind)) 
+                        if data_ind] + [name for name in datasets if name not in ('player', 'team')]
+            check_datasets(datasets)
+        
+        date_list = self._date_list(start_date, end_date)
+        self.failed_games = []
+        self.metrics.reset()
+        games = self._list_games(date_list, skip_game_ids)
+        
+        if self.parse_workers:
+            yield from self._iter_parsed_games(games, get_player_data_ind, get_team_data_ind, datasets)
+            return
+        
+        if datasets:
+            def scrape_datasets(backend, game):
+                #Loads the game page once and parses every dataset from it
+                date, home_team = game
+                with self.metrics.time('game'):
+                    return backend.get_game_datasets(home_team, date, datasets)
+            
+            for (date, home_team), game_datasets, error in self.backend_pool.imap(scrape_datasets, games):
+                if error is not None:
+                    self._game_failed(date, home_team, error)
+                    continue
+                yield self._dataset_record(date, home_team, game_datasets)
+            return
+        
+        def scrape_game(backend, game):
+            #Loads the game page once and scrapes both player and team data from it
+            date, home_team = game
+            with self.metrics.time('game'):
+                return backend.get_game_rows(home_team = home_team, 
+                                             date_played = date, 
+                                             get_player_data_ind = get_player_data_ind, 
+                                             get_team_data_ind = get_team_data_ind)
+        
+        #Results come back in the order of the games, so the output does not depend on the workers
+        for (date, home_team), game_data, error in self.backend_pool.imap(scrape_game, games):
+            if error is not None:
+                self._game_failed(date, home_team, error)
+                continue
+            player_data, team_data = game_data
+            yield self._game_record(date, home_team, player_data, team_data)
+    
+    def _iter_parsed_games(self, games, get_player_data_ind, get_team_data_ind, datasets = None):
+        #Workers only fetch the raw game pages, a pool of processes parses them so parsing is not bound to one core
+        def fetch_game(backend, game):
+            date, home_team = game
+            if datasets:
+                return timed(fetch_game_pages, backend, home_team, date, datasets, self.base_url)
+            return timed(backend.fetch_page, boxscore_url(date.replace('-', ''), team_abbreviation(home_team, date), self.base_url))
+        
+        #Forking while the worker and spare driver threads run can deadlock the parse processes, they are spawned
+        with ProcessPoolExecutor(max_workers = self.parse_workers, mp_context = multiprocessing.get_context('spawn')) as executor:
+            #Pages are parsed in order, only a few more than parse_workers are waiting for their process
+            pending = deque()
+            
+            def next_record():
+                (date, home_team), fetch_seconds, future = pending.popleft()
+                try:
+                    #Parsing is timed in its process, the metrics can't be shared with it
+                    game_data, parse_seconds = future.result()
+                except Exception as error:
+                    self._game_failed(date, home_team, error)
+                    return None
+                self.metrics.observe('parse', parse_seconds)
+                self.metrics.observe('game', fetch_seconds + parse_seconds)
+                if datasets:
+                    return self._dataset_record(date, home_team, game_data)
+                return self._game_record(date, home_team, *game_data)
+            
+            try:
+                for (date, home_team), fetched, error in self.backend_pool.imap(fetch_game, games):
+                    if error is not None:
+                        self._game_failed(date, home_team, error)
+                        continue
+                    page, fetch_seconds = fetched
+                    if datasets:
+                        page, pbp_page = page
+                        future = executor.submit(timed, parse_game_datasets, page, home_team, date, None, 
+                                                 datasets, pbp_page)
+                    else:
+                        future = executor.submit(timed, parse_game_rows, page, home_team, date, None, 
+                                                 get_player_data_ind, get_team_data_ind)
+                    pending.append(((date, home_team), fetch_seconds, future))
+                    if len(pending) > 2 * self.parse_workers:
+                        record = next_record()
+                        if record is not None:
+                            yield record
+                
+                while pending:
+                    record = next_record()
+                    if record is not None:
+                        yield record
+            finally:
+                for game, fetch_seconds, future in pending:
+                    future.cancel()
+    
+    async def aiter_games(self, start_date, end_date = None, 
+                          get_player_data_ind = True, get_team_data_ind = True, 
+                          skip_game_ids = None, concurrency = 16):
+        """Async generator yielding the stats of every game between the start and end date as soon as it is scraped
+        
+        Pages are downloaded with aiohttp on the running event loop instead of the drivers or sessions of 
+        the workers, at most concurrency at a time. The request budget, retries and page cache are shared 
+        with the blocking methods. Requires aiohttp (pip install NBA_data_scraper[async]).
+        
+        start_date: str
+            start date of the scrape (i.e. 2019-03-21)
+        end_date: str
+            optional, end date of the scrape only games of the start_date will be scraped
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        skip_game_ids: set
+            optional, Game-IDs of games not to scrape (i.e. games already in a dataset)
+        concurrency: int
+            maximum number of pages downloaded at the same time
+            
+        Yields
+        ------
+            GameRecord
+            Game-ID, date, home team, player and team stats of each game, in date order
+            
+        """
+        from .async_backend import AsyncHTTPBackend
+        
+        date_list = self._date_list(start_date, end_date)
+        self.failed_games = []
+        self.metrics.reset()
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async with AsyncHTTPBackend(base_url = self.base_url, scheduler = self.scheduler, 
+                                    cache = self.cache, limit = concurrency, metrics = self.metrics) as backend:
+            
+            async def fetch(url):
+                async with semaphore:
+                    return await backend.fetch_page(url)
+            
+            if self.schedule is not None:
+                #Builds the schedules off the event loop, their pages are still fetched by the async backend
+                fetch_page = lambda url: asyncio.run_coroutine_threadsafe(fetch(url), loop).result()
+                last_dates = {season_of(date): date for date in date_list}
+                for date in last_dates.values():
+                    try:
+                        await loop.run_in_executor(None, self.schedule.games_on, date, fetch_page)
+                    except Exception:
+                        #Reported for each date by _schedule_games
+                        pass
+            
+            with self.metrics.time('schedule'):
+                home_teams_by_date, scoreboard_dates = self._schedule_games(date_list)
+            
+            async def list_games(date):
+                async with semaphore:
+                    print(f'Now scraping data from NBA games on {date}')
+                    return await backend.get_list_of_hometeams(date)
+            
+            results = await asyncio.gather(*(list_games(date) for date in scoreboard_dates), return_exceptions = True)
+            for date, home_team_list in zip(scoreboard_dates, results):
+                if isinstance(home_team_list, Exception):
+                    print(f'Could not get the games played on {date}: {home_team_list}')
+                    self.failed_games.append((date, None, home_team_list))
+                    self.metrics.incr('dates_failed')
+                    continue
+                home_teams_by_date[date] = [self._full_name(city, date) for city in home_team_list]
+            
+            games = iter(self._order_games(date_list, home_teams_by_date, skip_game_ids))
+            
+            async def scrape_game(date, home_team):
+                async with semaphore:
+                    with self.metrics.time('game'):
+                        return await backend.get_game_rows(home_team = home_team, 
+                                                           date_played = date, 
+                                                           get_player_data_ind = get_player_data_ind, 
+                                                           get_team_data_ind = get_team_data_ind)
+            
+            #Games are yielded in order, only a few more than concurrency are scraped ahead of the consumer
+            pending = deque((game, asyncio.ensure_future(scrape_game(*game))) for game in islice(games, 2 * concurrency))
+            try:
+                while pending:
+                    (date, home_team), task = pending.popleft()
+                    for game in islice(games, 1):
+                        pending.append((game, asyncio.ensure_future(scrape_game(*game))))
+                    try:
+                        player_data, team_data = await task
+                    except Exception as error:
+                        self._game_failed(date, home_team, error)
+                        continue
+                    yield self._game_record(date, home_team, player_data, team_data)
+            finally:
+                for game, task in pending:
+                    task.cancel()
+                await asyncio.gather(*(task for game, task in pending), return_exceptions = True)
+    
+    async def aget_player_team_data(self, start_date, end_date = None, 
+                                    get_player_data_ind = True, get_team_data_ind = True, 
+                                    concurrency = 16):
+        """Coroutine version of get_player_team_data scraping the games with aiter_games
+        
+        start_date: str
+            start date of player data scrape
+        end_date: str
+            optional, end date of player data scrape only data for the start_date will be scraped
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        concurrency: int
+            maximum number of pages downloaded at the same time
+            
+        Returns
+        -------
+            pandas.DataFrame, pandas.DataFrame
+            can be up to two datasets (player and team DF)
+            
+        """
+        player_buffer = RowBuffer()
+        team_buffer = RowBuffer()
+        
+        async for game in self.aiter_games(start_date, end_date, 
+                                           get_player_data_ind = get_player_data_ind, 
+                                           get_team_data_ind = get_team_data_ind, 
+                                           concurrency = concurrency):
+            player_buffer.extend(game.player_data)
+            team_buffer.extend(game.team_data)
+        
+        with self.metrics.time('assemble'):
+            player_df, team_df = player_buffer.to_frame(), team_buffer.to_frame()
+        self.write_metrics()
+        
+        if get_player_data_ind and get_team_data_ind:
+            return player_df, team_df
+        elif get_player_data_ind:
+            return player_df
+        elif get_team_data_ind:
+            return team_df
     
     def get_player_team_data(self, start_date, end_date = None, 
                              get_player_data_ind = True, get_team_data_ind = True, 
-                             pre_player_data_dir = None, pre_team_data_dir = None):
+                             pre_player_data_dir = None, pre_team_data_dir = None, 
+                             append_only = False, skip_existing = True, 
+                             checkpoint_dir = None, flush_every = 50):
         """Function used to get player and data for games between the start and end date range 
         
         start_date: str
@@ -138,11 +640,20 @@ class NBA_scraper:
         get_team_data_ind: bool
             Indicate whether to scrape team data
         pre_player_data_dir: str
-            optional, directory of the existing player dataset
+            optional, directory of the existing player dataset (a csv file or a directory of csv partitions)
             newly scraped data will be appended to this if inserted    
         pre_team_data_dir: str
-            optional, directory of the existing team dataset
+            optional, directory of the existing team dataset (a csv file or a directory of csv partitions)
             newly scraped data will be appended to this if inserted 
+        append_only: bool
+            Indicate whether to skip reading the existing datasets, only the newly scraped data is returned
+        skip_existing: bool
+            Indicate whether to skip the games whose Game-ID is already in the existing datasets
+        checkpoint_dir: str
+            optional, directory the data without an existing dataset is written to while scraping, 
+            an interrupted run started again with the same checkpoint_dir and dates resumes from its last batch
+        flush_every: int
+            number of games scraped between two writes to the existing datasets and the checkpoint
             
         Returns
         -------
@@ -159,66 +670,130 @@ class NBA_scraper:
             end_date = start_date
         
         if pre_player_data_dir:
-            try: 
-                #Reads in the existing player dataset to append the scraped data to 
-                exist_player_data = pd.read_csv(pre_player_data_dir)
-            except:
-                raise Exception('Cannot read in existing player dataset please ensure the directory is correct')
+            #Reads in the existing player dataset to return it with the scraped data
+            if append_only:
+                if not os.path.exists(pre_player_data_dir):
+                    raise FileNotFoundError(f'Cannot find the existing player dataset {pre_player_data_dir} please ensure the directory is correct')
+            else:
+                try: 
+                    exist_player_data = read_dataset(pre_player_data_dir)
+                except Exception as error:
+                    raise Exception('Cannot read in existing player dataset please ensure the directory is correct') from error
                 
         if pre_team_data_dir:
-            try: 
-                #Reads in the existing player dataset to append the scraped data to 
-                exist_team_data = pd.read_csv(pre_team_data_dir)
-            except:
-                raise Exception('Cannot read in existing team dataset please ensure the directory is correct')
+            #Reads in the existing team dataset to return it with the scraped data
+            if append_only:
+                if not os.path.exists(pre_team_data_dir):
+                    raise FileNotFoundError(f'Cannot find the existing team dataset {pre_team_data_dir} please ensure the directory is correct')
+            else:
+                try: 
+                    exist_team_data = read_dataset(pre_team_data_dir)
+                except Exception as error:
+                    raise Exception('Cannot read in existing team dataset please ensure the directory is correct') from error
         
-        delta = end_date - start_date  
-        #Appends list of date between start and end date to strings
-        date_list = []
-        for i in range(delta.days + 1):
-            day = start_date + timedelta(days=i)
-            date_list.append(str(day))
+        #Datasets the rows are flushed to while scraping, the checkpoint holds the data that has no existing dataset
+        targets = {}
+        checkpoint_targets = set()
+        for name, data_ind, pre_data_dir in (('player', get_player_data_ind, pre_player_data_dir), 
+                                             ('team', get_team_data_ind, pre_team_data_dir)):
+            if data_ind and pre_data_dir:
+                targets[name] = pre_data_dir
+            elif data_ind and checkpoint_dir:
+                targets[name] = os.path.join(checkpoint_dir, f'{name}_data')
+                checkpoint_targets.add(name)
         
-        for date in date_list:
+        if checkpoint_dir:
+            open_checkpoint(checkpoint_dir, {'start_date': str(start_date), 'end_date': str(end_date), 
+                                             'get_player_data_ind': get_player_data_ind, 
+                                             'get_team_data_ind': get_team_data_ind})
+            for name in checkpoint_targets:
+                os.makedirs(targets[name], exist_ok = True)
+        
+        #Game-IDs already in the datasets, games in every dataset to update are not scraped again
+        #Games in the checkpoint are always skipped, that is how an interrupted run resumes
+        indexes = {name: GameIndex(path) for name, path in targets.items() if skip_existing or name in checkpoint_targets}
+        if checkpoint_dir:
+            #Without skip_existing the games an interrupted run appended to the existing datasets are told apart
+            #by the Game-IDs recorded in the checkpoint
+            for name in targets:
+                if name not in indexes:
+                    indexes[name] = FlushedGameIds(checkpoint_dir, name, targets[name])
+        skip_game_ids = None
+        #A game is only skipped if every requested dataset already has it
+        if indexes and len(indexes) == get_player_data_ind + get_team_data_ind:
+            skip_game_ids = set.intersection(*(index.game_ids for index in indexes.values()))
+        
+        #Rows of every game are collected in plain lists and turned into a df once at the end, 
+        #new rows are also written to the datasets every flush_every games so a crash loses at most a batch
+        buffers = {'player': RowBuffer(), 'team': RowBuffer()}
+        batches = {name: RowBuffer() for name in targets}
+        
+        def flush():
+            for name, batch in batches.items():
+                if len(batch) == 0:
+                    continue
+                with self.metrics.time('write'):
+                    batch_df = batch.to_frame()
+                    #A crash while the rows are written is resolved from the Game-IDs recorded in the checkpoint
+                    if isinstance(indexes.get(name), FlushedGameIds):
+                        indexes[name].begin(batch_df['Game-ID'])
+                    append_csv(batch_df, targets[name])
+                #The Game-IDs are committed after their rows, a crash in between is caught by the GameIndex rebuild
+                #or, for the Game-IDs recorded in the checkpoint, when it is opened again
+                if name in indexes:
+                    indexes[name].add(batch_df['Game-ID'])
+                batches[name] = RowBuffer()
+        
+        num_games = 0
+        for game in self.iter_games(str(start_date), str(end_date), 
+                                    get_player_data_ind = get_player_data_ind, 
+                                    get_team_data_ind = get_team_data_ind, 
+                                    skip_game_ids = skip_game_ids):
+            for name, data in (('player', game.player_data), ('team', game.team_data)):
+                #Drops the games that are already in one of the datasets but had to be scraped for the other
+                if name in indexes and game.game_id in indexes[name]:
+                    continue
+                buffers[name].extend(data)
+                if name in batches:
+                    batches[name].extend(data)
+            num_games += 1
+            if num_games % flush_every == 0:
+                flush()
+        flush()
+        
+        with self.metrics.time('assemble'):
+            if get_player_data_ind:
+                player_df_full = buffers['player'].to_frame()
+            if get_team_data_ind:
+                team_df_full = buffers['team'].to_frame()
             
-            print(f'Now scraping data from NBA games on {date}')
-            home_team_list = get_list_of_hometeams(self.driver, date)
-
-            if len(home_team_list) > 0:
-
-                counter = 1 
-
-                for home_team in home_team_list:
-                    
-                    if counter == 1:       
-                        if get_player_data_ind: 
-                            player_df_full = get_player_data(home_team = team_full_abrv_config[home_team]['Full Name'], 
-                                                             date_played = date, 
-                                                             driver = self.driver)
-                        if get_team_data_ind:
-                            team_df_full = get_team_data(home_team = team_full_abrv_config[home_team]['Full Name'], 
-                                                         date_played = date, 
-                                                         driver = self.driver)
-                    else:
-                        if get_player_data_ind: 
-                            player_df_full = player_df_full.append(get_player_data(home_team = team_full_abrv_config[home_team]['Full Name'], 
-                                                                                   date_played = date, 
-                                                                                   driver = self.driver), ignore_index=True)
-                        if get_team_data_ind:
-                            team_df_full = team_df_full.append(get_team_data(home_team = team_full_abrv_config[home_team]['Full Name'], 
-                                                                             date_played = date, 
-                                                                             driver = self.driver), ignore_index=True)
-                    counter+=1
+        if checkpoint_dir:
+            #Games scraped by the interrupted runs are read back from the checkpoint, with the types of scraped data
+            if get_player_data_ind and not pre_player_data_dir:
+                player_df_full = read_dataset(targets['player'], as_scraped = True)
+            if get_team_data_ind and not pre_team_data_dir:
+                team_df_full = read_dataset(targets['team'], as_scraped = True)
+            if self.failed_games:
+                print(f'{len(self.failed_games)} games could not be scraped, run again with the same checkpoint_dir to retry them')
+            else:
+                shutil.rmtree(checkpoint_dir)
             
-        if pre_player_data_dir:
-            exist_player_data = exist_player_data.append(player_df_full)
-            exist_player_data.to_csv(pre_player_data_dir, index = False)
-            print(f'Updated player dataset will be overwritten in {pre_player_data_dir}')
+        #Only the new rows were written, the existing rows on disk are never rewritten
+        if pre_player_data_dir and get_player_data_ind:
+            print(f'New player data was appended to {pre_player_data_dir}')
+            if append_only:
+                exist_player_data = player_df_full
+            else:
+                exist_player_data = pd.concat([exist_player_data, player_df_full], ignore_index = True, sort = False)
                 
-        if pre_team_data_dir:
-            exist_team_data = exist_team_data.append(team_df_full)
-            exist_team_data.to_csv(pre_team_data_dir, index = False)
-            print(f'Updated team dataset will be overwritten in {pre_team_data_dir}')
+        if pre_team_data_dir and get_team_data_ind:
+            print(f'New team data was appended to {pre_team_data_dir}')
+            if append_only:
+                exist_team_data = team_df_full
+            else:
+                exist_team_data = pd.concat([exist_team_data, team_df_full], ignore_index = True, sort = False)
+        
+        self.write_metrics()
                 
         if pre_player_data_dir and pre_team_data_dir:
             return exist_player_data, exist_team_data
@@ -233,8 +808,218 @@ class NBA_scraper:
         elif get_team_data_ind:
             return team_df_full 
             
+    def get_datasets(self, start_date, end_date = None, datasets = ('player', 'team'), skip_game_ids = None):
+        """Function used to get any of the datasets of the games between the start and end date range 
+        
+        Every dataset of the box score page (player, team, advanced and periods) is parsed from a single 
+        load of the page, asking for more of them only adds parsing time. The play-by-play (pbp) is on a 
+        page of its own and adds one page load per game.
+        
+        start_date: str
+            start date of the scrape (i.e. 2019-03-21)
+        end_date: str
+            optional, end date of the scrape only games of the start_date will be scraped
+        datasets: iterable[str]
+            datasets to scrape: player and team stats, advanced player stats (advanced), player stats by 
+            quarter and half (periods) and play-by-play (pbp)
+        skip_game_ids: set
+            optional, Game-IDs of games not to scrape (i.e. games already in a dataset)
+            
+        Returns
+        -------
+            dict
+            df of each dataset by name
+            
+        """
+        check_datasets(datasets)
+        
+        buffers = {name: RowBuffer() for name in datasets}
+        for game in self.iter_games(start_date, end_date, 
+                                    get_player_data_ind = 'player' in datasets, 
+                                    get_team_data_ind = 'team' in datasets, 
+                                    skip_game_ids = skip_game_ids, 
+                                    datasets = datasets):
+            for name, buffer in buffers.items():
+                if name == 'player':
+                    buffer.extend(game.player_data)
+                elif name == 'team':
+                    buffer.extend(game.team_data)
+                else:
+                    buffer.extend(game.datasets.get(name))
+        
+        with self.metrics.time('assemble'):
+            dfs = {name: buffer.to_frame() for name, buffer in buffers.items()}
+        
+        self.write_metrics()
+        
+        return dfs
+            
+    def iter_finals(self, date = None, poll_every = 120, 
+                    get_player_data_ind = True, get_team_data_ind = True, 
+                    skip_game_ids = None, max_polls = None, max_game_attempts = 3, 
+                    final_timeout = 30 * 60 * 60):
+        """Generator polling the scoreboard of a day and yielding the stats of each game as soon as it is final
+        
+        The scoreboard is polled every poll_every seconds with conditional requests (ETag / Last-Modified), 
+        so polls of an unchanged scoreboard are answered with 304 Not Modified and not parsed. The box score 
+        of a game is fetched once, when the scoreboard first shows it as final; a box score that can't be 
+        scraped is tried again on the next polls, up to max_game_attempts times. A game that is not final 
+        final_timeout seconds after the first poll (i.e. postponed) is dropped. Stops once every game of the 
+        day is yielded, dropped or out of attempts, the games that were not yielded are in failed_games.
+        
+        date: str
+            optional, date of the games (i.e. 2019-03-21), today if not given
+        poll_every: float
+            seconds between two polls of the scoreboard
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        skip_game_ids: set
+            optional, Game-IDs of games not to scrape (i.e. games already in the sink)
+        max_polls: int
+            optional, number of polls after which to stop even if games are not final
+        max_game_attempts: int
+            number of polls on which the box score of a final game is tried before the game is given up
+        final_timeout: float
+            seconds after the first poll after which the games that are not final are dropped, None to wait for them
+            
+        Yields
+        ------
+            GameRecord
+            Game-ID, date, home team, player and team stats of each game, in the order they go final
+            
+        """
+        date = str(date) if date else datetime.now().strftime('%Y-%m-%d')
+        self.failed_games = []
+        self.metrics.reset()
+        done = set(skip_game_ids or ())
+        #Games out of attempts or never final, they are not waited for
+        dropped = set()
+        attempts = {}
+        games = None
+        etag = last_modified = None
+        polls = 0
+        started = time.monotonic()
+        
+        def scrape_game(backend, home_team):
+            with self.metrics.time('game'):
+                return backend.get_game_rows(home_team = home_team, 
+                                             date_played = date, 
+                                             get_player_data_ind = get_player_data_ind, 
+                                             get_team_data_ind = get_team_data_ind)
+        
+        while True:
+            polls += 1
+            self.metrics.incr('scoreboard_polls')
+            try:
+                with self.metrics.time('scoreboard'):
+                    scoreboard, etag, last_modified = self.backend.get_scoreboard(date, etag, last_modified)
+            except Exception as error:
+                print(f'Could not load the scoreboard of {date}, trying again in {poll_every} seconds: {error}')
+                scoreboard = None
+            if scoreboard is not None:
+                games = [(self._full_name(city, date), final) for city, final in scoreboard]
+            
+            if games is not None:
+                #Games that went final since the last poll, the home team identifies a game of the day
+                finals = [home_team for home_team, final in games 
+                          if final and self._game_id(date, home_team) not in done | dropped]
+                for home_team, game_data, error in self.backend_pool.imap(scrape_game, finals):
+                    game_id = self._game_id(date, home_team)
+                    if error is not None:
+                        attempts[game_id] = attempts.get(game_id, 0) + 1
+                        if attempts[game_id] >= max_game_attempts:
+                            #Only the last attempt is counted as a failed game
+                            self._game_failed(date, home_team, error)
+                            dropped.add(game_id)
+                        else:
+                            print(f'Could not scrape the game of {home_team} on {date}, trying again on the next poll: {error}')
+                        continue
+                    record = self._game_record(date, home_team, *game_data)
+                    done.add(record.game_id)
+                    yield record
+                
+                if (final_timeout is not None) and (time.monotonic() - started > final_timeout):
+                    for home_team, final in games:
+                        game_id = self._game_id(date, home_team)
+                        if not final and game_id not in done | dropped:
+                            self._game_failed(date, home_team, f'not final after {final_timeout} seconds (i.e. postponed)')
+                            dropped.add(game_id)
+                
+                remaining = sum(1 for home_team, final in games 
+                                if self._game_id(date, home_team) not in done | dropped)
+                if remaining == 0:
+                    if not games:
+                        print(f'On {date}, there are no games in the NBA.')
+                    elif dropped:
+                        print(f'Every game of {date} is final or dropped, {len(dropped)} games could not be scraped')
+                    else:
+                        print(f'Every game of {date} is final')
+                    return
+            
+            if (max_polls is not None) and (polls >= max_polls):
+                return
+            time.sleep(poll_every)
+    
+    def watch(self, sink, date = None, poll_every = 120, 
+              get_player_data_ind = True, get_team_data_ind = True, max_polls = None, 
+              max_game_attempts = 3, final_timeout = 30 * 60 * 60):
+        """Function used to keep a sink up to date with the games of a day, each game is handed to it as soon as it is final
+        
+        See iter_finals for the polling. The metrics are written to metrics_path after each game, if it was given.
+        
+        sink: callable
+            called with the GameRecord of each final game (i.e. NBA_data_scraper.storage.CSVSink), games in 
+            its game_ids attribute, if it has one, are not scraped again
+        date: str
+            optional, date of the games (i.e. 2019-03-21), today if not given
+        poll_every: float
+            seconds between two polls of the scoreboard
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        max_polls: int
+            optional, number of polls after which to stop even if games are not final
+        max_game_attempts: int
+            number of polls on which the box score of a final game is tried before the game is given up
+        final_timeout: float
+            seconds after the first poll after which the games that are not final are dropped, None to wait for them
+            
+        Returns
+        -------
+            int
+            number of games handed to the sink
+            
+        """
+        num_games = 0
+        for game in self.iter_finals(date, poll_every = poll_every, 
+                                     get_player_data_ind = get_player_data_ind, 
+                                     get_team_data_ind = get_team_data_ind, 
+                                     skip_game_ids = getattr(sink, 'game_ids', None), 
+                                     max_polls = max_polls, 
+                                     max_game_attempts = max_game_attempts, 
+                                     final_timeout = final_timeout):
+            with self.metrics.time('write'):
+                sink(game)
+            num_games += 1
+            self.write_metrics()
+        self.write_metrics()
+        
+        return num_games
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.quit()
+    
     def quit(self):
         """
-        Quit chromedriver, use after scraping needed data (note: you will need to initialize once you quit)
+        Quit chromedriver or close the http session of every worker, use after scraping needed data (note: you will need to initialize once you quit)
+        Drivers acquired from a driver_manager given to the scraper are given back to it instead
         """
-        self.driver.quit()
\ No newline at end of file
+        self.backend_pool.quit()
+        if self._owns_driver_manager:
+            self.driver_manager.quit()
\ No newline at end of file
@@ -0,0 +1,252 @@
+"""Module containing the manager of the Chrome drivers used by the selenium backend"""
+
+import os
+import queue
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+
+def chrome_options(headless = True, disable_images = True, disable_css = True, disable_js = True,
+                        page_load_strategy = 'eager'):
+
+    """Helper function used to build the options of a lightweight Chrome
+
+    Parameters
+    ----------
+        headless: bool
+            Indicate whether to run Chrome without a window
+
+        disable_images: bool
+            Indicate whether to skip loading images
+
+        disable_css: bool
+            Indicate whether to skip loading stylesheets
+
+        disable_js: bool
+            Indicate whether to disable JavaScript, the tables it renders are read from the raw page instead
+
+        page_load_strategy: str
+            'eager' returns as soon as the document is parsed, 'normal' waits for every resource
+
+    Returns
+    -------
+        selenium.webdriver.ChromeOptions
+            options of webdriver.Chrome
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless')
+        options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-dev-shm-usage')
+
+    #2 blocks the content
+    prefs = {}
+    if disable_images:
+        prefs['profile.managed_default_content_settings.images'] = 2
+        options.add_argument('--blink-settings=imagesEnabled=false')
+    if disable_css:
+        prefs['profile.managed_default_content_settings.stylesheets'] = 2
+    if disable_js:
+        prefs['profile.managed_default_content_settings.javascript'] = 2
+    if prefs:
+        options.add_experimental_option('prefs', prefs)
+
+    options.page_load_strategy = page_load_strategy
+
+    return options
+
+
+def process_tree_rss(pid):
+
+    """Helper function used to get the resident memory of a process and all of its children (Linux only)
+
+    Parameters
+    ----------
+        pid: int
+            process id of the root of the tree (i.e. chromedriver, Chrome runs as its children)
+
+    Returns
+    -------
+        int
+            resident memory in bytes, None if it can't be read on this platform
+    """
+    if not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as stat:
+                #The command name can contain spaces, the parent pid is the second field after it
+                ppid = int(stat.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    rss = 0
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/statm') as statm:
+                rss += int(statm.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(children.get(current, []))
+
+    return rss
+
+
+class DriverManager:
+
+    """Pool of warm headless Chrome drivers recycled before they leak too much memory
+
+    Drivers are handed out with acquire and given back with release, so they can be reused by several
+    NBA_scraper instances without paying the cold start of Chrome again. Every driver is replaced after
+    max_pages page loads or once its processes use more than max_rss bytes, and spare drivers are started
+    in the background so a replacement is usually already warm. Use as a context manager to quit every
+    driver on exit.
+
+    Parameters
+    ----------
+
+    driverpath: str
+        directory to the Chromedriver
+
+    spares: int
+        number of warm drivers kept ready besides the drivers in use
+
+    max_pages: int
+        page loads after which a driver is replaced, None to never replace it on page loads
+
+    max_rss: int
+        resident memory in bytes of Chrome and its children after which a driver is replaced, None to
+        never replace it on memory
+
+    rss_check_every: int
+        page loads between two reads of the memory of a driver
+
+    headless, disable_images, disable_css, disable_js, page_load_strategy:
+        options of the drivers, see chrome_options
+
+    """
+
+    def __init__(self, driverpath, spares = 1, max_pages = 500, max_rss = 2**30, rss_check_every = 25,
+                 headless = True, disable_images = True, disable_css = True, disable_js = True,
+                 page_load_strategy = 'eager'):
+
+        self.driverpath = str(driverpath)
+        self.spares = spares
+        self.max_pages = max_pages
+        self.max_rss = max_rss
+        self.rss_check_every = rss_check_every
+        #The tables rendered by JavaScript can only be read from the raw page when it is disabled
+        self.parse_html = disable_js
+        self.options = chrome_options(headless, disable_images, disable_css, disable_js, page_load_strategy)
+        self.recycled = 0
+
+        self._warm = queue.Queue()
+        self._drivers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._starting = 0
+        self._warm_up()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.quit()
+
+    def new_driver(self):
+        """Starts a new driver"""
+        driver = webdriver.Chrome(service = Service(self.driverpath), options = self.options)
+        with self._lock:
+            self._drivers.add(driver)
+        return driver
+
+    def _start_spare(self):
+        try:
+            driver = self.new_driver()
+        except Exception:
+            #acquire starts a driver itself when there is no spare
+            driver = None
+        with self._lock:
+            self._starting -= 1
+        if driver is None:
+            return
+        if self._closed:
+            self._quit_driver(driver)
+        else:
+            self._warm.put(driver)
+
+    def _warm_up(self):
+        #Starts drivers in the background until spares of them are warm or starting
+        with self._lock:
+            missing = self.spares - self._warm.qsize() - self._starting
+            self._starting += max(0, missing)
+        for i in range(missing):
+            threading.Thread(target = self._start_spare, daemon = True).start()
+
+    def _quit_driver(self, driver):
+        with self._lock:
+            self._drivers.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Returns a warm driver, a new one is started if there is no spare left"""
+        try:
+            driver = self._warm.get_nowait()
+        except queue.Empty:
+            driver = self.new_driver()
+        self._warm_up()
+        #Drivers given back keep their count, they are recycled on the same budget
+        if not hasattr(driver, 'pages_loaded'):
+            driver.pages_loaded = 0
+        return driver
+
+    def release(self, driver):
+        """Gives a driver back to the pool of warm drivers"""
+        if self._closed or self.needs_recycling(driver):
+            self._quit_driver(driver)
+        else:
+            self._warm.put(driver)
+
+    def needs_recycling(self, driver):
+        """Returns whether a driver has loaded too many pages or uses too much memory"""
+        pages_loaded = getattr(driver, 'pages_loaded', 0)
+        if (self.max_pages is not None) and (pages_loaded >= self.max_pages):
+            return True
+        #Reading the memory of every Chrome process is too slow to do on every page load
+        if (self.max_rss is not None) and (pages_loaded > 0) and (pages_loaded % self.rss_check_every == 0):
+            try:
+                rss = process_tree_rss(driver.service.process.pid)
+            except AttributeError:
+                rss = None
+            if (rss is not None) and (rss > self.max_rss):
+                return True
+        return False
+
+    def recycle(self, driver):
+        """Quits a driver and returns a warm replacement"""
+        self._quit_driver(driver)
+        with self._lock:
+            self.recycled += 1
+        return self.acquire()
+
+    def quit(self):
+        """Quits every driver started by the manager"""
+        self._closed = True
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._quit_driver(driver)
@@ -0,0 +1,180 @@
+"""Module containing the timers and counters collected while scraping"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+#Upper bounds in seconds of the buckets of the stage histograms, from cached pages to slow page loads
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def timed(func, *args, **kwargs):
+
+    """Helper function used to call func and time it, i.e. in another process that can't share the metrics
+
+    Returns
+    -------
+        result, float
+            the value returned by func and the seconds it took
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class Histogram:
+
+    """Distribution of the durations of a stage, counted in cumulative buckets like Prometheus does
+
+    Parameters
+    ----------
+
+    buckets: tuple[float]
+        upper bounds in seconds of the buckets, in increasing order
+
+    """
+
+    def __init__(self, buckets = BUCKETS):
+
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        """Adds a duration to the histogram"""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Returns the upper bound of the bucket holding the q quantile (i.e. 0.95), at most the max duration"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {'count': self.count,
+                'sum': self.sum,
+                'mean': self.sum / self.count if self.count else None,
+                'max': self.max,
+                'p50': self.quantile(0.5),
+                'p95': self.quantile(0.95),
+                'buckets': {str(bound): count for bound, count in zip(self.buckets + ('+Inf',), self.counts)}}
+
+
+class ScrapeMetrics:
+
+    """Timers and counters of a scrape, shared by the workers of a scraper
+
+    Every stage (i.e. navigate, download, parse, game) has a histogram of its durations and every
+    counter (i.e. pages_fetched, cache_hits, retries, bytes_fetched, rows_parsed) a running total.
+    NBA_scraper resets its metrics at the start of every run, read them after it with to_dict, to_json,
+    to_prometheus, report or write.
+
+    """
+
+    def __init__(self):
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears every timer and counter"""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.started = time.time()
+            self._start = time.perf_counter()
+
+    def incr(self, name, value = 1):
+        """Adds value to the counter name"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage, seconds):
+        """Adds a duration to the histogram of stage"""
+        with self._lock:
+            if stage not in self.stages:
+                self.stages[stage] = Histogram()
+            self.stages[stage].observe(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        """Context manager timing the block it wraps as one duration of stage, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    @property
+    def elapsed(self):
+        """Seconds since the metrics were last reset"""
+        return time.perf_counter() - self._start
+
+    def to_dict(self):
+        """Returns the metrics as plain dicts"""
+        with self._lock:
+            return {'started': self.started,
+                    'elapsed': self.elapsed,
+                    'counters': dict(self.counters),
+                    'stages': {stage: histogram.to_dict() for stage, histogram in self.stages.items()}}
+
+    def to_json(self):
+        """Returns the metrics as json"""
+        return json.dumps(self.to_dict(), indent = 2)
+
+    def to_prometheus(self, prefix = 'nba_scraper'):
+        """Returns the metrics in the Prometheus text exposition format (i.e. for the node_exporter textfile collector)"""
+        metrics = self.to_dict()
+        lines = [f'# TYPE {prefix}_elapsed_seconds gauge', f'{prefix}_elapsed_seconds {metrics["elapsed"]}']
+
+        for name, value in sorted(metrics['counters'].items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+
+        if metrics['stages']:
+            lines.append(f'# TYPE {prefix}_stage_seconds histogram')
+        for stage, histogram in sorted(metrics['stages'].items()):
+            cumulative = 0
+            for bound, count in histogram['buckets'].items():
+                cumulative += count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram["sum"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Writes the metrics to path, in the Prometheus text format if it ends with .prom and as json otherwise"""
+        text = self.to_prometheus() if str(path).endswith('.prom') else self.to_json()
+        #Written to a temp file that is renamed, so a collector never reads half of it
+        temp_path = str(path) + '.tmp'
+        with open(temp_path, 'w') as metrics_file:
+            metrics_file.write(text)
+        os.replace(temp_path, path)
+
+    def report(self):
+        """Returns a table of the stages and counters, slowest stages first"""
+        metrics = self.to_dict()
+        lines = [f'{"stage":<16}{"count":>8}{"total s":>10}{"mean ms":>10}{"p95 ms":>10}{"max ms":>10}']
+        for stage, histogram in sorted(metrics['stages'].items(), key = lambda item: -item[1]['sum']):
+            p95 = histogram['p95']
+            lines.append(f'{stage:<16}{histogram["count"]:>8}{histogram["sum"]:>10.2f}{histogram["mean"] * 1000:>10.1f}'
+                         f'{p95 * 1000:>10.0f}{histogram["max"] * 1000:>10.1f}')
+        for name, value in sorted(metrics['counters'].items()):
+            lines.append(f'{name:<16}{value:>8}')
+        lines.append(f'{"elapsed s":<16}{metrics["elapsed"]:>8.1f}')
+        return '\n'.join(lines)
@@ -0,0 +1,141 @@
+"""Module containing the on-disk cache of downloaded pages"""
+
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+#Scoreboard pages (i.e. boxscores/?month=03&day=21&year=2019) and game pages (i.e. boxscores/201903210BOS.html
+#or the play-by-play boxscores/pbp/201903210BOS.html)
+SCOREBOARD_URL = re.compile(r'/boxscores/\?month=(\d+)&day=(\d+)&year=(\d+)')
+BOXSCORE_URL = re.compile(r'/boxscores/(?:pbp/)?(\d{4})(\d{2})(\d{2})0[A-Z]{3}\.html')
+
+
+class PageCache:
+
+    """On-disk cache of raw pages keyed by url
+
+    Pages are stored gzip compressed under the sha256 of their url. Box scores, play-by-play pages and
+    scoreboards are kept forever once downloaded after the day following their date, when every game of
+    it is final, and expire after scoreboard_ttl before as games can still be added or finished, any other
+    page expires after default_ttl. Once the cache grows past max_bytes the least recently used pages are evicted.
+
+    Parameters
+    ----------
+
+    cache_dir: str
+        directory the pages are stored in
+
+    max_bytes: int
+        budget of the compressed pages on disk
+
+    scoreboard_ttl: float
+        seconds a scoreboard or box score of a date that is not over is kept
+
+    default_ttl: float
+        seconds a page other than a scoreboard or box score is kept
+
+    """
+
+    def __init__(self, cache_dir, max_bytes = 2 * 2**30, scoreboard_ttl = 15 * 60, default_ttl = 24 * 60 * 60):
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents = True, exist_ok = True)
+        self.max_bytes = max_bytes
+        self.scoreboard_ttl = scoreboard_ttl
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.cache_dir.glob('*/*.gz'))
+
+    def _path(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / key[0:2] / (key + '.gz')
+
+    def ttl(self, url, stored_at):
+        """Returns the seconds a page downloaded at stored_at (timestamp) is kept, None to keep it forever"""
+        game_date = None
+        boxscore = BOXSCORE_URL.search(url)
+        if boxscore:
+            year, month, day = map(int, boxscore.groups())
+            game_date = datetime(year, month, day).date()
+        scoreboard = SCOREBOARD_URL.search(url)
+        if scoreboard:
+            month, day, year = map(int, scoreboard.groups())
+            game_date = datetime(year, month, day).date()
+
+        if game_date is not None:
+            #Games finishing late are only final, on their box score and scoreboard, the day after
+            if datetime.fromtimestamp(stored_at).date() > game_date + timedelta(days = 1):
+                return None
+            return self.scoreboard_ttl
+
+        return self.default_ttl
+
+    def get(self, url):
+        """Returns the cached page of url as bytes, None if it is not cached or has expired"""
+        path = self._path(url)
+        try:
+            stat = path.stat()
+            ttl = self.ttl(url, stat.st_mtime)
+            if (ttl is not None) and (time.time() - stat.st_mtime > ttl):
+                self.misses += 1
+                return None
+            with gzip.open(path, 'rb') as cached:
+                page = cached.read()
+            #The access time is used for the LRU eviction, the modification time stays the download time
+            os.utime(path, (time.time(), stat.st_mtime))
+        except (OSError, EOFError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return page
+
+    def set(self, url, page):
+        """Stores the page of url, evicting the least recently used pages if over budget"""
+        path = self._path(url)
+        path.parent.mkdir(exist_ok = True)
+
+        #Writes to a temp file that is renamed, so readers never see a partially written page
+        fd, temp_path = tempfile.mkstemp(dir = path.parent, suffix = '.tmp')
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(gzip.compress(page))
+
+        with self._lock:
+            if path.exists():
+                self._size -= path.stat().st_size
+            os.replace(temp_path, path)
+            self._size += path.stat().st_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        #Removes the least recently used pages until the cache is back under 90% of its budget
+        pages = sorted(self.cache_dir.glob('*/*.gz'), key = lambda path: path.stat().st_atime)
+        for path in pages:
+            if self._size <= 0.9 * self.max_bytes:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                self._size -= size
+            except OSError:
+                pass
+
+    def __len__(self):
+        return sum(1 for _ in self.cache_dir.glob('*/*.gz'))
+
+    def clear(self):
+        """Removes every cached page"""
+        with self._lock:
+            for path in self.cache_dir.glob('*/*.gz'):
+                path.unlink()
+            self._size = 0
@@ -0,0 +1,595 @@
+"""Module containing the parsers used to read Basketball Reference pages from raw HTML"""
+
+import re
+from datetime import datetime
+from typing import List, NamedTuple, Tuple
+
+from lxml import html as lxml_html
+
+from .util_helpers import build_player_rows, build_team_rows, rows_to_frame
+from .teams import team_abbreviation
+
+
+def load_html(page):
+
+    """Helper function used to parse raw page content into an lxml tree
+
+    Basketball Reference ships several tables (i.e. line_score) inside HTML comments that are
+    only rendered by JavaScript, the comment markers are stripped so those tables are parsed as well.
+
+    Parameters
+    ----------
+        page: bytes or str
+            raw HTML of the page
+
+    Returns
+    -------
+        lxml.html.HtmlElement
+            root of the parsed page
+    """
+    if isinstance(page, str):
+        page = page.encode('utf-8')
+
+    page = page.replace(b'<!--', b'').replace(b'-->', b'')
+    return lxml_html.fromstring(page)
+
+
+def _has_class(class_name):
+    #XPath predicate matching an element that has class_name in its class attribute
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def _row_cells(row):
+    #Returns the text of every th/td cell in a table row
+    return [cell.text_content().strip() for cell in row.xpath('./th|./td')]
+
+
+def parse_scoreboard(page):
+
+    """Helper function used to get the home teams of a scoreboard page and whether their games are over
+
+    Parameters
+    ----------
+        page: bytes or str
+            raw HTML of the scoreboard page (i.e. boxscores/?month=03&day=21&year=2019)
+
+    Returns
+    -------
+        list[(str, bool)]
+            home team (as a city, i.e. LA Lakers) of every game on the page and whether the game is final
+    """
+    root = load_html(page)
+
+    games = []
+    for game in root.xpath(f'//div[{_has_class("game_summary")}]'):
+        #The away team is listed first and the home team second in each game summary
+        teams = game.xpath(f'.//table[{_has_class("teams")}]//tr[td]')
+        if len(teams) >= 2:
+            #Finished games link to their box score as Final (i.e. Final/OT), games to come or in progress don't
+            links = game.xpath(f'.//td[{_has_class("gamelink")}]/a')
+            final = any(link.text_content().strip().startswith('Final') for link in links)
+            games.append((teams[1].xpath('./td')[0].text_content().strip(), final))
+
+    return games
+
+
+def parse_list_of_hometeams(page):
+
+    """Helper function used to get list of Home Team names from a scoreboard page
+
+    Parameters
+    ----------
+        page: bytes or str
+            raw HTML of the scoreboard page (i.e. boxscores/?month=03&day=21&year=2019)
+
+    Returns
+    -------
+        list[str]
+            list of home team names (as cities, i.e. LA Lakers) that played on the date of the page
+    """
+    return [home_team for home_team, final in parse_scoreboard(page)]
+
+
+class Table(NamedTuple):
+
+    """Table read from a page by read_table
+
+    The rows of the body are split into sections at the header rows inside it (i.e. Starters and Reserves
+    of a box score, or the quarters of the play-by-play), each section labelled by the first cell of its
+    header row.
+    """
+
+    id: str
+    header: List[str]
+    sections: List[Tuple[str, List[List[str]]]]
+    footer: List[List[str]]
+
+    def rows(self):
+        """Returns the rows of every section of the body"""
+        return [row for label, rows in self.sections for row in rows]
+
+
+def read_table(table):
+
+    """Helper function used to read any table of a page from its header rows
+
+    The header is the last row of the thead, or the first full header row of the body when the table has
+    no thead (i.e. play-by-play). Rows noting why a player has no stats (i.e. Did Not Play) are not kept.
+
+    Parameters
+    ----------
+        table: lxml.html.HtmlElement
+            table element of a parsed page
+
+    Returns
+    -------
+        Table
+            id, header, sections of the body and footer rows of the table
+    """
+    header_rows = table.xpath('./thead/tr')
+    header = _row_cells(header_rows[-1]) if header_rows else []
+
+    sections = []
+    label, rows = (header[0] if header else ''), []
+    for row in table.xpath('./tbody/tr|./tr'):
+        if 'thead' not in row.get('class', '').split():
+            #Data for Players that didn't play or not with team are not stored
+            if not row.xpath('./td[@data-stat="reason"]'):
+                rows.append(_row_cells(row))
+            continue
+        cells = _row_cells(row)
+        if rows:
+            #A header row after data rows starts a new section (i.e. Reserves)
+            sections.append((label, rows))
+            label, rows = cells[0], []
+        elif len(cells) == 1:
+            #A header row spanning the table names the section (i.e. 1st Quarter)
+            label = cells[0]
+        elif not header:
+            header = cells
+    if rows or not sections:
+        sections.append((label, rows))
+
+    footer = [_row_cells(row) for row in table.xpath('./tfoot/tr')]
+
+    return Table(table.get('id'), header, sections, footer)
+
+
+def parse_tables(page, table_ids = (), pattern = None):
+
+    """Helper function used to read several tables of a page in a single pass over it
+
+    Parameters
+    ----------
+        page: bytes, str or lxml.html.HtmlElement
+            raw HTML of the page, or the root of the already parsed page
+
+        table_ids: iterable[str]
+            ids of the tables to read (i.e. box-BOS-game-basic)
+
+        pattern: str
+            optional, regular expression the ids of other tables to read fully match (i.e. box-BOS-q[0-9]-basic)
+
+    Returns
+    -------
+        dict
+            Table of every table found by id, tables that are not in the page are left out
+    """
+    root = page if isinstance(page, lxml_html.HtmlElement) else load_html(page)
+    table_ids = set(table_ids)
+    pattern = re.compile(pattern) if pattern else None
+
+    tables = {}
+    for table in root.iter('table'):
+        table_id = table.get('id')
+        if (table_id in table_ids) or (table_id and pattern and pattern.fullmatch(table_id)):
+            tables[table_id] = read_table(table)
+
+    return tables
+
+
+def box_score_rows(table):
+
+    """Helper function used to split a box score table into the rows the player and team rows are built from
+
+    Parameters
+    ----------
+        table: Table
+            box score table (i.e. box-BOS-game-basic, box-BOS-game-advanced or box-BOS-q1-basic)
+
+    Returns
+    -------
+        list[str], list[list[str]], list[list[str]], list[str]
+            header, starter rows, reserve rows and team totals row of the box score
+    """
+    #Rows are starters until the Reserves header row inside the body
+    starters = table.sections[0][1]
+    reserves = [row for label, rows in table.sections[1:] for row in rows]
+    totals = table.footer[0] if table.footer else []
+
+    return table.header, starters, reserves, totals
+
+
+def read_box_score(root, team_abrv):
+
+    """Helper function used to read the basic box score table of a team from a game page
+
+    Parameters
+    ----------
+        root: lxml.html.HtmlElement
+            root of the parsed game page
+
+        team_abrv: str
+            abbreviation of the team the box score is read for (i.e. BOS)
+
+    Returns
+    -------
+        list[str], list[list[str]], list[list[str]], list[str]
+            header, starter rows, reserve rows and team totals row of the box score
+    """
+    table_id = f'box-{team_abrv}-game-basic'
+    tables = parse_tables(root, [table_id])
+    if table_id not in tables:
+        raise ValueError(f'Box score table for {team_abrv} not found in the game page')
+
+    return box_score_rows(tables[table_id])
+
+
+def read_line_score(root):
+
+    """Helper function used to read the scores by quarter from a game page
+
+    Parameters
+    ----------
+        root: lxml.html.HtmlElement
+            root of the parsed game page
+
+    Returns
+    -------
+        list[int], list[int]
+            away and home team scores by quarter, with the final score as the last element
+    """
+    table = root.xpath('//table[@id="line_score"]')
+    if len(table) == 0:
+        raise ValueError('Line score table not found in the game page')
+
+    rows = [_row_cells(row) for row in table[0].xpath('.//tr[td]')]
+
+    away_score = list(map(int, rows[-2][1:]))
+    home_score = list(map(int, rows[-1][1:]))
+
+    return away_score, home_score
+
+
+#Datasets read from the box score page of a game, the play-by-play is read from a page of its own
+BOX_SCORE_DATASETS = ('player', 'team', 'advanced', 'periods')
+DATASETS = BOX_SCORE_DATASETS + ('pbp',)
+
+#Ids of the box scores of a team by quarter, half and overtime (i.e. box-BOS-q1-basic, box-BOS-h2-basic, box-BOS-ot1-basic)
+PERIOD_TABLE = 'box-{abrv}-(?:q|h|ot)[0-9]+-basic'
+
+
+def check_datasets(datasets):
+    """Raises a ValueError if one of datasets is not in DATASETS"""
+    unknown = [name for name in datasets if name not in DATASETS]
+    if unknown:
+        raise ValueError(f'Unknown datasets {unknown}, the datasets are {list(DATASETS)}')
+
+
+def _away_team(root):
+    #Grabs the Away Team from the Title (i.e. Los Angeles Lakers at Boston Celtics Box Score, ...)
+    return root.findtext('.//title').split(' at')[0]
+
+
+def _period(label):
+    #Period of a table id or a play-by-play section (i.e. q1 or 1st Quarter is Q1, ot2 or 2nd OT is OT2)
+    match = re.fullmatch(r'(q|h|ot)(\d+)', label) or re.match(r'(\d+)(?:st|nd|rd|th) (Q|OT)', label)
+    if match is None:
+        return label
+    kind, number = match.groups() if label[0].isalpha() else match.groups()[::-1]
+    return kind.upper() + number
+
+
+def build_period_rows(tables, game_id, date_played, team_name, home_or_away):
+
+    """Helper function used to build the player rows of a team's box scores by quarter and half
+
+    Parameters
+    ----------
+        tables: list[Table]
+            box score tables of the team by period (i.e. box-BOS-q1-basic, box-BOS-h1-basic)
+
+        game_id: str
+            Game-ID of the game (i.e. 20190321BOS)
+
+        date_played: str
+            date the game is played (i.e. 2019-03-21)
+
+        team_name: str
+            full name of the team (i.e. Boston Celtics)
+
+        home_or_away: str
+            indicating whether the team is Home or Road (H or R)
+
+    Returns
+    -------
+        list[str], list[list]
+            columns and rows of the player stats by period, None if the page has no box score by period
+    """
+    df_cols = None
+    rows = []
+    for table in tables:
+        header, starters, reserves, _ = box_score_rows(table)
+        df_cols, period_rows = build_player_rows(header, starters, reserves, game_id, date_played, team_name, home_or_away)
+        period = _period(table.id.split('-')[2])
+        rows.extend(row[0:4] + [period] + row[4:] for row in period_rows)
+
+    if df_cols is None:
+        return None
+
+    return df_cols[0:4] + ['Period'] + df_cols[4:], rows
+
+
+def build_pbp_rows(table, game_id, date_played, home_team_name, away_team_name):
+
+    """Helper function used to build the play-by-play rows of a game, one row per play
+
+    Parameters
+    ----------
+        table: Table
+            play-by-play table of the game (pbp)
+
+        game_id: str
+            Game-ID of the game (i.e. 20190321BOS)
+
+        date_played: str
+            date the game is played (i.e. 2019-03-21)
+
+        home_team_name: str
+            full name of the home team (i.e. Boston Celtics)
+
+        away_team_name: str
+            full name of the away team (i.e. Los Angeles Lakers)
+
+    Returns
+    -------
+        list[str], list[list]
+            columns and rows of the plays, Team is empty for the plays of neither team (i.e. End of 1st quarter)
+    """
+    df_cols = ['Game-ID', 'Date', 'Period', 'Time', 'Team', 'Play', 'Points', 'Score']
+
+    rows = []
+    for label, plays in table.sections:
+        period = _period(label)
+        for play in plays:
+            #Plays of the away team are on the left of the score and plays of the home team on the right
+            if len(play) < 6:
+                team, text, points, score = '', play[-1], '', ''
+            elif play[1]:
+                team, text, points, score = away_team_name, play[1], play[2], play[3]
+            else:
+                team, text, points, score = home_team_name, play[5], play[4], play[3]
+            rows.append([game_id, date_played, period, play[0], team, text, points, score])
+
+    return df_cols, rows
+
+
+def parse_game_datasets(page, home_team, date_played, config = None,
+                        datasets = ('player', 'team'), pbp_page = None):
+
+    """Helper function used to parse any of the datasets of a game from the raw HTML of its pages
+
+    Every table the datasets are built from is read in a single pass over the box score page, so
+    datasets read from it (see BOX_SCORE_DATASETS) only add parsing time.
+
+    Parameters
+    ----------
+        page: bytes or str
+            raw HTML of the box score page, None if only the play-by-play is parsed
+
+        home_team: str
+            full name of the home team that played (i.e. Boston Celtics)
+
+        date_played: str
+            date the game is played, this will be added to the 'Date' column (i.e. 2019-03-21)
+
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+
+        datasets: iterable[str]
+            datasets to parse (see DATASETS): player and team stats, advanced player stats,
+            player stats by quarter and half (periods) and play-by-play (pbp)
+
+        pbp_page: bytes or str
+            raw HTML of the play-by-play page, needed for the pbp dataset
+
+    Returns
+    -------
+        dict
+            columns and rows of each dataset by name, None in place of a dataset the game has no table for
+    """
+    check_datasets(datasets)
+
+    home_team_abrv = team_abbreviation(home_team, date_played, config)
+    game_id = date_played.replace('-', '') + home_team_abrv
+
+    game_datasets = {}
+
+    if any(name in BOX_SCORE_DATASETS for name in datasets):
+        root = load_html(page)
+        away_team = _away_team(root)
+        away_team_abrv = team_abbreviation(away_team, date_played, config)
+        teams = ((home_team, home_team_abrv, 'H'), (away_team, away_team_abrv, 'R'))
+
+        table_ids = {f'box-{abrv}-game-basic' for name, abrv, venue in teams}
+        if 'advanced' in datasets:
+            table_ids.update(f'box-{abrv}-game-advanced' for name, abrv, venue in teams)
+        pattern = None
+        if 'periods' in datasets:
+            pattern = PERIOD_TABLE.format(abrv = f'({home_team_abrv}|{away_team_abrv})')
+        tables = parse_tables(root, table_ids, pattern)
+
+        box_scores = {}
+        for name, abrv, venue in teams:
+            if f'box-{abrv}-game-basic' not in tables:
+                raise ValueError(f'Box score table for {abrv} not found in the game page')
+            box_scores[abrv] = box_score_rows(tables[f'box-{abrv}-game-basic'])
+        ht_header, ht_starters, ht_reserves, ht_totals = box_scores[home_team_abrv]
+        rt_header, rt_starters, rt_reserves, rt_totals = box_scores[away_team_abrv]
+
+        if 'player' in datasets:
+            df_cols, ht_rows = build_player_rows(ht_header, ht_starters, ht_reserves,
+                                                 game_id, date_played, home_team, 'H')
+            _, rt_rows = build_player_rows(rt_header, rt_starters, rt_reserves,
+                                           game_id, date_played, away_team, 'R')
+            game_datasets['player'] = (df_cols, ht_rows + rt_rows)
+
+        if 'team' in datasets:
+            away_score, home_score = read_line_score(root)
+            game_datasets['team'] = build_team_rows(ht_header, ht_totals[1:], rt_totals[1:],
+                                                    home_score, away_score, game_id, date_played,
+                                                    home_team, away_team)
+
+        if 'advanced' in datasets:
+            #Older games have no advanced box score
+            game_datasets['advanced'] = None
+            advanced = [(name, venue, tables.get(f'box-{abrv}-game-advanced')) for name, abrv, venue in teams]
+            if all(table is not None for name, venue, table in advanced):
+                df_cols, rows = None, []
+                for name, venue, table in advanced:
+                    header, starters, reserves, _ = box_score_rows(table)
+                    df_cols, team_rows = build_player_rows(header, starters, reserves, game_id, date_played, name, venue)
+                    rows.extend(team_rows)
+                game_datasets['advanced'] = (df_cols, rows)
+
+        if 'periods' in datasets:
+            period_data = []
+            for name, abrv, venue in teams:
+                period_tables = [table for table_id, table in tables.items()
+                                 if re.fullmatch(PERIOD_TABLE.format(abrv = abrv), table_id)]
+                period_data.append(build_period_rows(period_tables, game_id, date_played, name, venue))
+            #Older games have no box score by period
+            game_datasets['periods'] = None
+            if all(data is not None for data in period_data):
+                game_datasets['periods'] = (period_data[0][0], period_data[0][1] + period_data[1][1])
+
+    if 'pbp' in datasets:
+        if pbp_page is None:
+            raise ValueError('The play-by-play page is needed to parse the pbp dataset')
+        root = load_html(pbp_page)
+        tables = parse_tables(root, ['pbp'])
+        game_datasets['pbp'] = None
+        if 'pbp' in tables:
+            game_datasets['pbp'] = build_pbp_rows(tables['pbp'], game_id, date_played, home_team, _away_team(root))
+
+    return {name: game_datasets[name] for name in datasets}
+
+
+def parse_game_rows(page, home_team, date_played, config = None,
+                    get_player_data_ind = True, get_team_data_ind = True):
+
+    """Helper function used to parse the player and team rows from the raw HTML of a game page
+
+    Parameters
+    ----------
+        page: bytes or str
+            raw HTML of the box score page
+
+        home_team: str
+            full name of the home team that played (i.e. Boston Celtics)
+
+        date_played: str
+            date the game is played, this will be added to the 'Date' column (i.e. 2019-03-21)
+
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+
+        get_player_data_ind: bool
+            Indicate whether to parse player data
+
+        get_team_data_ind: bool
+            Indicate whether to parse team data
+
+    Returns
+    -------
+        (list[str], list[list]), (list[str], list[list])
+            columns and rows of the player stats and columns and rows of the team stats for the game,
+            None is returned in place of the stats that were not requested
+    """
+    datasets = [name for name, data_ind in (('player', get_player_data_ind), ('team', get_team_data_ind)) if data_ind]
+    #The box scores are read even if no stats are requested, a page without them is not a game page
+    game_datasets = parse_game_datasets(page, home_team, date_played, config, datasets or ['player'])
+
+    player_data = game_datasets['player'] if get_player_data_ind else None
+    team_data = game_datasets.get('team')
+
+    return player_data, team_data
+
+
+def parse_game_data(page, home_team, date_played, config = None,
+                    get_player_data_ind = True, get_team_data_ind = True):
+
+    """Helper function used to parse player and team data from the raw HTML of a game page
+
+    Parameters
+    ----------
+        page: bytes or str
+            raw HTML of the box score page
+
+        home_team: str
+            full name of the home team that played (i.e. Boston Celtics)
+
+        date_played: str
+            date the game is played, this will be added to the 'Date' column (i.e. 2019-03-21)
+
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+
+        get_player_data_ind: bool
+            Indicate whether to parse player data
+
+        get_team_data_ind: bool
+            Indicate whether to parse team data
+
+    Returns
+    -------
+        pandas.DataFrame, pandas.DataFrame
+            df of the player stats and df of the team stats for the game,
+            None is returned in place of a df that was not requested
+    """
+    player_data, team_data = parse_game_rows(page, home_team, date_played, config,
+                                             get_player_data_ind, get_team_data_ind)
+
+    return rows_to_frame(player_data), rows_to_frame(team_data)
+
+
+def parse_schedule_page(page):
+
+    """Helper function used to read the games of a season's schedule page
+
+    Parameters
+    ----------
+        page: bytes or str
+            raw HTML of the schedule page (i.e. leagues/NBA_2019_games-october.html)
+
+    Returns
+    -------
+        dict, list[str]
+            home team names (i.e. Boston Celtics) of the games that have a box score by date (i.e. 2018-10-16)
+            and links to the schedule pages of every month of the season
+    """
+    root = load_html(page)
+
+    games = {}
+    for row in root.xpath('//table[@id="schedule"]/tbody/tr[td]'):
+        date_cell = row.xpath('./*[@data-stat="date_game"]')
+        home_cell = row.xpath('./td[@data-stat="home_team_name"]')
+        #Games that are not played yet have no box score
+        if not date_cell or not home_cell or not row.xpath('./td[@data-stat="box_score_text"]/a'):
+            continue
+        date_played = datetime.strptime(date_cell[0].text_content().strip(), '%a, %b %d, %Y').date()
+        games.setdefault(str(date_played), []).append(home_cell[0].text_content().strip())
+
+    month_links = [str(href) for href in root.xpath(f'//div[{_has_class("filter")}]//a/@href')]
+
+    return games, month_links
@@ -0,0 +1,384 @@
+"""Module containing the index used to look up rows of a csv dataset without reading all of it"""
+
+import json
+import os
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .schema import apply_schema, season_bounds
+from .storage import _commit, _temp_path
+
+#Columns indexed by value, Date is indexed by range
+KEY_COLS = ['Game-ID', 'Team', 'Player Name']
+_NO_DATE = np.iinfo(np.int64).min
+
+
+def _line_spans(data, skip_header):
+    #Byte offset and length of every row of data, the rows don't contain quoted newlines
+    ends = np.flatnonzero(np.frombuffer(data, dtype = np.uint8) == ord('\n')) + 1
+    if len(data) > 0 and data[-1:] != b'\n':
+        ends = np.append(ends, len(data))
+    starts = np.concatenate([[0], ends[:-1]]).astype(np.int64)
+    lengths = ends - starts
+    if skip_header:
+        starts, lengths = starts[1:], lengths[1:]
+    #Blank lines are skipped like read_csv does, a row of the datasets is always longer than \r\n
+    keep = lengths > 2
+    return starts[keep], lengths[keep]
+
+
+def _to_days(dates):
+    #Dates as days since epoch, missing dates sort first
+    dates = pd.to_datetime(pd.Series(dates), errors = 'coerce').to_numpy(dtype = 'datetime64[D]')
+    days = dates.astype(np.int64)
+    days[np.isnat(dates)] = _NO_DATE
+    return days
+
+
+def _season_range(season):
+    #Seasons are named after the year they end in, the 2020 season ran until October (see schema.season_bounds)
+    first_day, last_day = season_bounds(int(season))
+    return str(first_day), str(last_day)
+
+
+def _concat_rows(frames):
+    #Keeps the key columns categorical, plain concat would turn categoricals with other categories to object
+    frames = [frame for frame in frames if len(frame) > 0]
+    if len(frames) == 0:
+        return _empty_rows()
+    rows = pd.DataFrame({col: np.concatenate([frame[col].to_numpy() for frame in frames])
+                         for col in ['file_no', 'offset', 'length', 'date']})
+    for col in KEY_COLS:
+        rows[col] = pd.api.types.union_categoricals([frame[col] for frame in frames], ignore_order = True)
+    return rows
+
+
+def _empty_rows():
+    rows = pd.DataFrame({'file_no': np.array([], dtype = np.int32), 'offset': np.array([], dtype = np.int64),
+                         'length': np.array([], dtype = np.int64), 'date': np.array([], dtype = np.int64)})
+    for col in KEY_COLS:
+        rows[col] = pd.Categorical([], categories = pd.Index([], dtype = object))
+    return rows
+
+
+class DatasetIndex:
+
+    """Index of a csv dataset written by the scraper, used to read only the rows a lookup matches
+
+    The byte offset of every row is kept with its Game-ID, Team, Player Name and Date, so a lookup
+    (i.e. the last 10 games of a player or every game of a team in a season) finds the matching rows in
+    the index and reads only those byte ranges of the dataset instead of parsing the whole csv.
+
+    The index is kept in a sidecar file next to the dataset (<dataset>.index.npz, or _index.npz in a
+    directory of partitions). Rows appended since it was saved (see storage.append_csv) are indexed on
+    open without reading the rows indexed already, and a file that was rewritten is indexed again.
+
+    Parameters
+    ----------
+
+    path: str
+        path of the csv file or of the directory of csv partitions
+
+    """
+
+    def __init__(self, path):
+
+        self.path = Path(path)
+        if self.path.is_dir():
+            self.index_path = self.path / '_index.npz'
+        else:
+            self.index_path = self.path.with_name(self.path.name + '.index.npz')
+
+        self.files = []
+        self.rows = _empty_rows()
+        self._key_indexes = {}
+        self._date_index = None
+        self._load()
+        self.refresh()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _dataset_files(self):
+        if self.path.is_dir():
+            return sorted(self.path.glob('part-*.csv'))
+        if self.path.exists() and self.path.stat().st_size > 0:
+            return [self.path]
+        return []
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        with np.load(self.index_path, allow_pickle = False) as saved:
+            self.files = json.loads(str(saved['files']))
+            rows = pd.DataFrame({col: saved[col] for col in ['file_no', 'offset', 'length', 'date']})
+            for col in KEY_COLS:
+                rows[col] = pd.Categorical.from_codes(saved[col + '.codes'], categories = saved[col + '.categories'].astype(object))
+        self.rows = rows
+
+    def _save(self):
+        arrays = {col: self.rows[col].to_numpy() for col in ['file_no', 'offset', 'length', 'date']}
+        for col in KEY_COLS:
+            arrays[col + '.codes'] = self.rows[col].cat.codes.to_numpy()
+            arrays[col + '.categories'] = np.array(self.rows[col].cat.categories, dtype = str)
+        temp_path = _temp_path(self.index_path)
+        try:
+            with open(temp_path, 'wb') as temp_file:
+                np.savez(temp_file, files = np.array(json.dumps(self.files)), **arrays)
+            _commit(temp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _index_bytes(self, data, header, file_no, start):
+        #Index of the rows in data, which starts at byte start of the file
+        offsets, lengths = _line_spans(data, skip_header = (start == 0))
+        rows = pd.DataFrame({'file_no': np.full(len(offsets), file_no, dtype = np.int32),
+                             'offset': offsets + start, 'length': lengths})
+        if len(offsets) == 0:
+            rows['date'] = np.array([], dtype = np.int64)
+            for col in KEY_COLS:
+                rows[col] = pd.Categorical([], categories = pd.Index([], dtype = object))
+            return rows
+
+        first = offsets[0]
+        keys = pd.read_csv(BytesIO(data[first:]), header = None, names = header, dtype = str, keep_default_na = False,
+                           usecols = [col for col in KEY_COLS + ['Date'] if col in header])
+        if len(keys) != len(rows):
+            raise ValueError(f'Could not line up the rows of the dataset {self.path} with their offsets, '
+                             'rows with quoted newlines can not be indexed')
+        rows['date'] = _to_days(keys['Date']) if 'Date' in keys.columns else _NO_DATE
+        for col in KEY_COLS:
+            rows[col] = pd.Categorical(keys[col] if col in keys.columns else np.full(len(rows), '', dtype = object))
+        return rows
+
+    def refresh(self):
+        """Indexes the rows written to the dataset since the index was built or last refreshed"""
+        indexed = {meta['name']: (file_no, meta) for file_no, meta in enumerate(self.files)}
+        files, frames, changed = [], [], False
+
+        for path in self._dataset_files():
+            stat = path.stat()
+            file_no = len(files)
+            previous_no, previous = indexed.pop(path.name, (None, None))
+            if previous is not None and previous['size'] == stat.st_size and previous['mtime'] == stat.st_mtime_ns:
+                kept = self.rows[self.rows['file_no'] == previous_no].copy()
+                kept['file_no'] = np.int32(file_no)
+                frames.append(kept)
+                files.append(previous)
+                continue
+
+            changed = True
+            with open(path, 'rb') as csv_file:
+                data = csv_file.read()
+            header = pd.read_csv(BytesIO(data), nrows = 0).columns.tolist()
+
+            #append_csv only adds rows after the existing bytes, those are checked before keeping their index
+            start = 0
+            if (previous is not None and previous['header'] == header and previous['size'] <= len(data) and
+                    zlib.crc32(data[:previous['size']]) == previous['crc']):
+                start = previous['size']
+                kept = self.rows[self.rows['file_no'] == previous_no].copy()
+                kept['file_no'] = np.int32(file_no)
+                frames.append(kept)
+
+            frames.append(self._index_bytes(data[start:], header, file_no, start))
+            files.append({'name': path.name, 'size': len(data), 'mtime': stat.st_mtime_ns,
+                          'crc': zlib.crc32(data), 'header': header})
+
+        if indexed:
+            #Partitions were removed
+            changed = True
+
+        if changed:
+            self.files = files
+            self.rows = _concat_rows(frames)
+            self._key_indexes = {}
+            self._date_index = None
+            self._save()
+
+    def _key_positions(self, col, values):
+        #Rows are grouped by the code of their value once per column, a lookup is then a slice of the groups
+        if col not in self._key_indexes:
+            codes = self.rows[col].cat.codes.to_numpy()
+            order = np.argsort(codes, kind = 'stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(self.rows[col].cat.categories) + 1))
+            self._key_indexes[col] = (order, bounds)
+        order, bounds = self._key_indexes[col]
+
+        categories = self.rows[col].cat.categories
+        positions = []
+        for value in ([values] if isinstance(values, str) else values):
+            if value in categories:
+                code = categories.get_loc(value)
+                positions.append(order[bounds[code]:bounds[code + 1]])
+        if len(positions) == 0:
+            return np.array([], dtype = np.int64)
+        return np.unique(np.concatenate(positions))
+
+    def _date_positions(self, start_date, end_date):
+        #Rows sorted by date once, a date range is then a slice of them
+        if self._date_index is None:
+            dates = self.rows['date'].to_numpy()
+            order = np.argsort(dates, kind = 'stable')
+            self._date_index = (order, dates[order])
+        order, sorted_dates = self._date_index
+
+        first = 0 if start_date is None else np.searchsorted(sorted_dates, _to_days([start_date])[0], side = 'left')
+        last = len(sorted_dates) if end_date is None else np.searchsorted(sorted_dates, _to_days([end_date])[0], side = 'right')
+        if start_date is None:
+            #Rows without a date are only matched when there is no date filter
+            first = np.searchsorted(sorted_dates, _NO_DATE, side = 'right') if end_date is not None else 0
+        return np.sort(order[first:last])
+
+    def lookup(self, game_id = None, team = None, player = None, season = None, start_date = None, end_date = None):
+
+        """Function used to find the rows matching every given filter
+
+        Parameters
+        ----------
+            game_id, team, player: str or list[str]
+                optional, Game-ID(s), team(s) and player name(s) to match
+
+            season: int
+                optional, season to match, named after the year it ends in
+
+            start_date: str
+                optional, first date to match
+
+            end_date: str
+                optional, last date to match
+
+        Returns
+        -------
+            numpy.ndarray
+                positions of the matching rows in the dataset, in the order they were written
+        """
+        if season is not None:
+            season_start, season_end = _season_range(season)
+            start_date = season_start if start_date is None else max(pd.Timestamp(start_date), pd.Timestamp(season_start))
+            end_date = season_end if end_date is None else min(pd.Timestamp(end_date), pd.Timestamp(season_end))
+
+        matches = []
+        for col, values in [('Game-ID', game_id), ('Team', team), ('Player Name', player)]:
+            if values is not None:
+                matches.append(self._key_positions(col, values))
+        if start_date is not None or end_date is not None:
+            matches.append(self._date_positions(start_date, end_date))
+
+        if len(matches) == 0:
+            return np.arange(len(self.rows))
+        #Starting from the smallest match keeps the intersections short
+        matches.sort(key = len)
+        positions = matches[0]
+        for match in matches[1:]:
+            positions = np.intersect1d(positions, match, assume_unique = True)
+        return positions
+
+    def read_rows(self, positions, columns = None, typed = True):
+
+        """Function used to read rows of the dataset by position
+
+        Only the byte ranges of the rows are read, neighbouring rows with a single read.
+
+        Parameters
+        ----------
+            positions: numpy.ndarray
+                positions of the rows, as returned by lookup
+
+            columns: list[str]
+                optional, columns to read, every column is read if not inserted
+
+            typed: bool
+                Indicate whether to convert the rows with apply_schema, strings are returned otherwise
+
+        Returns
+        -------
+            pandas.DataFrame
+                rows in the order of positions
+        """
+        positions = np.asarray(positions, dtype = np.int64)
+        sorter = np.argsort(positions, kind = 'stable')
+        rows = self.rows.iloc[positions[sorter]]
+
+        frames = []
+        for file_no in pd.unique(rows['file_no']):
+            file_rows = rows[rows['file_no'] == file_no]
+            meta = self.files[file_no]
+            starts = file_rows['offset'].to_numpy()
+            ends = starts + file_rows['length'].to_numpy()
+            #Rows that follow each other in the file are read as one range
+            run_starts = np.flatnonzero(np.concatenate([[True], starts[1:] != ends[:-1]]))
+            run_ends = np.concatenate([run_starts[1:], [len(starts)]]) - 1
+
+            chunks = []
+            path = self.path / meta['name'] if self.path.is_dir() else self.path
+            with open(path, 'rb') as csv_file:
+                for first, last in zip(starts[run_starts], ends[run_ends]):
+                    csv_file.seek(first)
+                    chunk = csv_file.read(last - first)
+                    chunks.append(chunk if chunk.endswith(b'\n') else chunk + b'\n')
+
+            usecols = None if columns is None else [col for col in columns if col in meta['header']]
+            frames.append(pd.read_csv(BytesIO(b''.join(chunks)), header = None, names = meta['header'], usecols = usecols,
+                                      dtype = str, keep_default_na = False))
+
+        if len(frames) == 0:
+            header = self.files[0]['header'] if self.files else []
+            df = pd.DataFrame(columns = header if columns is None else [col for col in columns if col in header], dtype = str)
+        else:
+            df = pd.concat(frames, ignore_index = True, sort = False)
+            if columns is not None:
+                df = df[[col for col in columns if col in df.columns]]
+            #Back to the order of positions
+            df = df.iloc[np.argsort(sorter, kind = 'stable')].reset_index(drop = True)
+
+        return apply_schema(df) if typed else df
+
+    def query(self, game_id = None, team = None, player = None, season = None, start_date = None, end_date = None,
+              columns = None, typed = True):
+
+        """Function used to read the rows matching every given filter, see lookup and read_rows
+
+        Returns
+        -------
+            pandas.DataFrame
+                matching rows in the order they were written
+        """
+        positions = self.lookup(game_id, team, player, season, start_date, end_date)
+        return self.read_rows(positions, columns, typed)
+
+    def last_games(self, player = None, team = None, n = 10, columns = None, typed = True):
+
+        """Function used to read the rows of the last n games of a player or a team
+
+        Parameters
+        ----------
+            player: str
+                optional, name of the player
+
+            team: str
+                optional, name of the team, the rows of its players in a player dataset
+
+            n: int
+                number of games
+
+        Returns
+        -------
+            pandas.DataFrame
+                rows of the last n games ordered by date
+        """
+        positions = self.lookup(team = team, player = player)
+        dates = self.rows['date'].to_numpy()[positions]
+        game_ids = self.rows['Game-ID'].cat.codes.to_numpy()[positions]
+
+        #Latest games first, the rows of a game are kept together
+        order = np.lexsort((positions, dates))
+        last_game_ids = pd.unique(game_ids[order][::-1])[:n]
+        positions = positions[order][np.isin(game_ids[order], last_game_ids)]
+        return self.read_rows(positions, columns, typed)
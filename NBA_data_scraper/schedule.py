@@ -0,0 +1,115 @@
+"""Module containing the season schedule index used to plan which games to scrape"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from .parsers import parse_schedule_page
+from .teams import season_bounds, season_of
+from .util_helpers import BASE_URL, schedule_url
+
+
+class ScheduleIndex:
+
+    """Index of the games played on every date, built once per season from its schedule pages
+
+    Looking up a date gives the home teams of its games without loading its scoreboard, so off-days,
+    the All-Star break and the off-season cost no page load. A season is built from the schedule page
+    of each of its months and saved to cache_path, it is only built again when a date that was not over
+    when it was built is looked up.
+
+    Parameters
+    ----------
+
+    fetch_page: callable
+        function returning the raw content of a page from its url (i.e. HTTPBackend.fetch_page)
+
+    base_url: str
+        root of the Basketball Reference site
+
+    cache_path: str
+        optional, json file the schedules are saved to and read from
+
+    """
+
+    def __init__(self, fetch_page, base_url = BASE_URL, cache_path = None):
+
+        self.fetch_page = fetch_page
+        self.base_url = base_url
+        self.cache_path = Path(cache_path) if cache_path else None
+        #Schedules by season, as {'built': date, 'games': {date: [home teams]}}
+        self.seasons = {}
+        self._built = set()
+        #Seasons whose schedule could not be built, they are not tried again for every date
+        self._errors = {}
+        self._lock = threading.Lock()
+
+        if self.cache_path and self.cache_path.exists():
+            with open(self.cache_path) as cache_file:
+                self.seasons = {int(season): schedule for season, schedule in json.load(cache_file).items()}
+
+    def _build(self, season, fetch_page):
+        #The first page lists the games of the first month and links to the page of every month (the first included)
+        games, month_links = parse_schedule_page(fetch_page(schedule_url(season, base_url = self.base_url)))
+        first_months = set(datetime.strptime(date_played, '%Y-%m-%d').strftime('%B').lower() for date_played in games)
+        for link in month_links:
+            if f'NBA_{season}_games-' not in link or link.split('-')[-1][:-len('.html')] in first_months:
+                continue
+            for date_played, home_teams in parse_schedule_page(fetch_page(self.base_url + link))[0].items():
+                games.setdefault(date_played, []).extend(home_teams)
+
+        self.seasons[season] = {'built': str(date.today()), 'games': games}
+        self._built.add(season)
+        self._save()
+
+    def _save(self):
+        if self.cache_path is None:
+            return
+        #Written to a temp file that is renamed, so an interrupted run never leaves a truncated cache
+        fd, temp_path = tempfile.mkstemp(dir = self.cache_path.parent, suffix = '.tmp')
+        with os.fdopen(fd, 'w') as temp_file:
+            json.dump({str(season): schedule for season, schedule in self.seasons.items()}, temp_file)
+        os.replace(temp_path, self.cache_path)
+
+    def games_on(self, date_played, fetch_page = None):
+        """Returns the home teams (i.e. Boston Celtics) of the games played on date_played (i.e. 2019-03-21)
+        
+        fetch_page optionally replaces the function the schedule pages are fetched with if the season has to be built.
+        """
+        season = season_of(date_played)
+        with self._lock:
+            schedule = self.seasons.get(season)
+            #Games finishing late only get their box score the day after
+            stale = (schedule is None) or (datetime.strptime(date_played, '%Y-%m-%d').date()
+                                           >= datetime.strptime(schedule['built'], '%Y-%m-%d').date() - timedelta(days = 1))
+            if season in self._errors:
+                raise self._errors[season]
+            if stale and season not in self._built:
+                try:
+                    self._build(season, fetch_page or self.fetch_page)
+                except Exception as error:
+                    self._errors[season] = error
+                    raise
+
+            return list(self.seasons[season]['games'].get(date_played, []))
+
+    def span(self, season, fetch_page = None):
+        """Returns the dates of the first and last game of season's schedule (i.e. 2018-10-16 and 2019-06-13), None without games"""
+        self.games_on(str(season_bounds(season)[1]), fetch_page)
+        with self._lock:
+            games = self.seasons[season]['games']
+        return (min(games), max(games)) if games else None
+
+    def covers(self, date_played, fetch_page = None):
+        """Returns whether date_played (i.e. 2019-03-21) is between the first and last game of its season's schedule
+
+        A date without games inside that span is an off-day. A date outside of it can't be told apart from
+        the off-season by the schedule (i.e. a season that ran later than usual), its scoreboard has to be read.
+        """
+        self.games_on(date_played, fetch_page)
+        with self._lock:
+            games = self.seasons[season_of(date_played)]['games']
+        return bool(games) and min(games) <= date_played <= max(games)
@@ -0,0 +1,198 @@
+"""Module containing the request scheduler throttling and retrying page fetches"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+from .instrumentation import ScrapeMetrics
+
+
+class RetryableError(Exception):
+
+    """Error raised by a page fetch that can be tried again (i.e. 429 Too Many Requests or 5xx)
+
+    Parameters
+    ----------
+
+    message: str
+        description of the error
+
+    retry_after: float
+        optional, seconds the site asked to wait before the next request (Retry-After header)
+
+    """
+
+    def __init__(self, message, retry_after = None):
+
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+
+    """Helper function used to read a Retry-After header in seconds
+
+    Parameters
+    ----------
+        value: str
+            value of the header, either a number of seconds or an HTTP date
+
+    Returns
+    -------
+        float
+            seconds to wait, None if the header is missing or can't be read
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo = timezone.utc)
+
+    return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RequestScheduler:
+
+    """Token bucket scheduler placed in front of every page fetch
+
+    Every worker takes a token before fetching a page, tokens are refilled at requests_per_minute so
+    the whole scraper stays within the budget whatever the number of workers. Fetches failing with a
+    RetryableError are retried with jittered exponential backoff, and a Retry-After sent by the site
+    pauses every worker until it has passed.
+
+    Parameters
+    ----------
+
+    requests_per_minute: float
+        budget of page fetches per minute, None to not throttle
+
+    burst: int
+        number of requests that can be sent back to back after an idle period
+
+    max_retries: int
+        number of times a failing fetch is retried before the error is raised
+
+    backoff_base: float
+        seconds waited before the first retry, doubled on every following retry
+
+    backoff_cap: float
+        maximum seconds waited before a retry
+
+    metrics: NBA_data_scraper.instrumentation.ScrapeMetrics
+        optional, metrics the waits (throttle stage) and retries are counted in
+
+    """
+
+    def __init__(self, requests_per_minute = 20, burst = 1, max_retries = 5,
+                 backoff_base = 2.0, backoff_cap = 120.0, metrics = None):
+
+        self.rate = requests_per_minute / 60 if requests_per_minute else None
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retries = 0
+        self.metrics = metrics if metrics is not None else ScrapeMetrics()
+
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token and returns the seconds the caller has to wait before sending its request"""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._paused_until - now)
+
+            if self.rate is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                #Tokens can go negative, which reserves a slot in the future for the caller
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self.rate)
+
+        if delay > 0:
+            self.metrics.observe('throttle', delay)
+
+        return delay
+
+    def acquire(self):
+        """Blocks until the caller is allowed to send a request"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self, attempt, retry_after = None):
+        """Returns the seconds to wait before retry number attempt (starting at 0)
+
+        A Retry-After sent by the site is honored and pauses every worker, otherwise the wait is
+        drawn between half and all of the exponential backoff.
+        """
+        self.metrics.incr('retries')
+
+        with self._lock:
+            self.retries += 1
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                return retry_after
+
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def call(self, fetch, *args, **kwargs):
+        """Calls fetch once a token is available, retrying it on RetryableError
+
+        Returns
+        -------
+            the value returned by fetch
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return fetch(*args, **kwargs)
+            except RetryableError as error:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt, error.retry_after)
+                self.metrics.observe('backoff', delay)
+                print(f'{error}, retrying in {delay:.1f} seconds')
+                time.sleep(delay)
+                attempt += 1
+
+    async def acall(self, fetch, *args, **kwargs):
+        """Coroutine version of call for async fetches, waits without blocking the event loop
+
+        Returns
+        -------
+            the value returned by fetch
+        """
+        attempt = 0
+        while True:
+            delay = self.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await fetch(*args, **kwargs)
+            except RetryableError as error:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt, error.retry_after)
+                self.metrics.observe('backoff', delay)
+                print(f'{error}, retrying in {delay:.1f} seconds')
+                await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,168 @@
+"""Module containing the typed schema of the scraped player and team datasets"""
+
+import re
+
+import pandas as pd
+
+#season_of and season_bounds are part of the team registry, they are kept importable from here
+from .teams import TEAM_NAMES, LATE_SEASON_ENDS, season_bounds, season_of
+
+#Columns describing the game and the player, every other column is a stat
+ID_COLS = ['Game-ID', 'Date', 'Team', 'Venue(R/H)', 'Starter(Y/N)', 'Player Name']
+CATEGORICAL_COLS = {'Venue(R/H)': ['H', 'R'], 'Starter(Y/N)': ['Y', 'N']}
+#Scores by period of the team data (i.e. 1Q, OT2 and the final score F), the only values scraped as integers
+LINE_SCORE_COL = re.compile(r'\d+Q|OT\d+|F')
+
+
+def _to_float(values):
+    #Casting the strings directly is much faster than pd.to_numeric, '+5' is read as 5 and empty stats as NaN
+    values = values.where(values != '')
+    try:
+        return values.astype('float64')
+    except (TypeError, ValueError):
+        return pd.to_numeric(values, errors = 'coerce').astype('float64')
+
+
+def _seconds_played(minutes_played):
+    #Minutes played (i.e. 34:12 for a player or 240 for a team) as seconds, read back from csv the minutes of teams are already numbers
+    if len(minutes_played) == 0:
+        return minutes_played.astype('float64')
+    parts = minutes_played.astype('string').str.split(':', n = 1, expand = True)
+    seconds = _to_float(parts[0]) * 60
+    if parts.shape[1] > 1:
+        seconds = seconds + _to_float(parts[1]).fillna(0)
+    return seconds
+
+
+def team_dtype(names = ()):
+
+    """Helper function used to get the categorical dtype of the Team column
+
+    The categories are the names of the team registry in code order, so a team has the same code in
+    every df, names missing from the registry are added after them.
+
+    Parameters
+    ----------
+        names: iterable of str
+            optional, team names of the data
+
+    Returns
+    -------
+        pandas.CategoricalDtype
+            dtype of the Team column
+    """
+    known = set(TEAM_NAMES)
+    unknown = sorted({name for name in names if isinstance(name, str) and name not in known})
+
+    return pd.CategoricalDtype(list(TEAM_NAMES) + unknown)
+
+
+def compact_ids(df):
+
+    """Function used to store the Team and Game-ID columns of a dataset as categoricals
+
+    Every row repeats the name of its team and its Game-ID, as categoricals each row only holds a small
+    integer code and every distinct string is stored once. Game-IDs are sorted, so their codes follow the
+    date order of the games. The df is modified in place.
+
+    Parameters
+    ----------
+        df: pandas.DataFrame
+            player or team data
+
+    Returns
+    -------
+        pandas.DataFrame
+            the same df
+    """
+    if 'Team' in df.columns and not isinstance(df['Team'].dtype, pd.CategoricalDtype):
+        df['Team'] = df['Team'].astype(team_dtype(df['Team'].unique()))
+
+    if 'Game-ID' in df.columns and not isinstance(df['Game-ID'].dtype, pd.CategoricalDtype):
+        df['Game-ID'] = df['Game-ID'].astype('category')
+
+    return df
+
+
+def scraped_types(df):
+
+    """Function used to give data read back from csv as strings the types of the data returned by the scraper
+
+    Stats stay strings as they were scraped, scores by period become integers ('' for the overtimes a game
+    didn't have) and the Team and Game-ID columns become categoricals. The df is modified in place.
+
+    Parameters
+    ----------
+        df: pandas.DataFrame
+            player or team data read back from csv with every value as a string (empty values as '')
+
+    Returns
+    -------
+        pandas.DataFrame
+            the same df
+    """
+    for col in df.columns:
+        if not LINE_SCORE_COL.fullmatch(col):
+            continue
+        played = df[col] != ''
+        if played.all():
+            df[col] = df[col].astype('int64')
+        elif played.any():
+            df[col] = pd.Series([int(score) if score != '' else '' for score in df[col]], index = df.index, dtype = object)
+
+    return compact_ids(df)
+
+
+def apply_schema(df):
+
+    """Function used to convert a scraped player or team dataset from strings to typed columns
+
+    Date becomes a datetime, MP is converted to seconds played, percentages become floats, every other
+    stat becomes a nullable integer (or a float if it has decimals) and Game-ID, Team, Venue(R/H) and
+    Starter(Y/N) become categoricals. Empty stats become missing values. Data that is already typed is returned as is.
+
+    Parameters
+    ----------
+        df: pandas.DataFrame
+            player or team data as returned by the scraper or read back from csv
+
+    Returns
+    -------
+        pandas.DataFrame
+            typed copy of the data
+    """
+    #Data that went through the schema already (i.e. read back from Parquet) has a datetime Date
+    if ('Date' in df.columns) and pd.api.types.is_datetime64_any_dtype(df['Date']):
+        return df.copy()
+
+    df = df.copy()
+
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'])
+
+    if 'Player Name' in df.columns:
+        df['Player Name'] = df['Player Name'].astype('string')
+
+    compact_ids(df)
+
+    for col, categories in CATEGORICAL_COLS.items():
+        if col in df.columns:
+            df[col] = pd.Categorical(df[col], categories = categories)
+
+    for col in df.columns:
+        if col in ID_COLS:
+            continue
+
+        if col == 'MP':
+            values = _seconds_played(df[col])
+        else:
+            values = _to_float(df[col])
+
+        if col.endswith('%'):
+            df[col] = values.astype('float64')
+        elif values.dropna().mod(1).eq(0).all():
+            df[col] = values.round().astype('Int64')
+        else:
+            df[col] = values.astype('float64')
+
+    return df
@@ -0,0 +1,564 @@
+"""Module containing the helpers used to read and write the scraped datasets"""
+
+import csv
+import json
+import os
+import tempfile
+import time
+import uuid
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+from .schema import apply_schema, scraped_types, season_of
+
+
+def read_csv_header(path):
+
+    """Helper function used to read the columns of a csv dataset without reading its rows
+
+    Parameters
+    ----------
+        path: str
+            path of the csv file
+
+    Returns
+    -------
+        list[str]
+            columns of the dataset, empty if the file is empty
+    """
+    with open(path, newline = '') as csv_file:
+        return next(csv.reader(csv_file), [])
+
+
+def _temp_path(path):
+    #Temp file next to path, so the final rename stays on the same filesystem and is atomic
+    fd, temp_path = tempfile.mkstemp(dir = Path(path).parent, prefix = '.' + Path(path).name + '.', suffix = '.tmp')
+    os.close(fd)
+    return temp_path
+
+
+def _commit(temp_path, path):
+    #Flushes the temp file to disk before renaming it over path
+    with open(temp_path, 'rb') as temp_file:
+        os.fsync(temp_file.fileno())
+    os.replace(temp_path, path)
+
+
+def write_csv_atomic(df, path):
+
+    """Helper function used to write a df to csv through a temp file renamed over path
+
+    A crash while writing leaves the previous file untouched.
+
+    Parameters
+    ----------
+        df: pandas.DataFrame
+            data to write
+
+        path: str
+            path of the csv file
+    """
+    temp_path = _temp_path(path)
+    try:
+        df.to_csv(temp_path, index = False)
+        _commit(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _pending_path(path):
+    #Sidecar holding the size of a csv file while rows are appended to it
+    return path.with_name(path.name + '.appending')
+
+
+def repair_csv(path):
+
+    """Helper function used to cut the rows an interrupted append_csv left in a csv file
+
+    append_csv records the size of the file in <path>.appending before writing and removes it once the
+    rows are on disk, a file that still has one was being written when its process was killed. Only the
+    process writing to the dataset should call it, an append in progress would be cut.
+
+    Parameters
+    ----------
+        path: str
+            path of the csv file
+
+    Returns
+    -------
+        bool
+            whether rows had to be cut
+    """
+    path = Path(path)
+    pending_path = _pending_path(path)
+    if not pending_path.exists():
+        return False
+
+    try:
+        size = int(pending_path.read_text())
+    except ValueError:
+        #Killed while recording the size, before any row was written
+        size = None
+    if (size is not None) and path.exists() and (path.stat().st_size > size):
+        with open(path, 'rb+') as csv_file:
+            csv_file.truncate(size)
+            os.fsync(csv_file.fileno())
+    os.remove(pending_path)
+    return size is not None
+
+
+def append_csv(df, path):
+
+    """Helper function used to add the rows of a df to an existing dataset without rewriting it
+
+    If path is a directory, the rows are written as a new partition file in it. If path is a csv file,
+    the new rows are appended to it in place. Its size is recorded before writing, the file is truncated
+    back to it if the write fails, and if the process is killed mid-write the next append_csv or GameIndex
+    of the file cuts the partial rows (see repair_csv). Either way the existing rows are never parsed,
+    copied or loaded in memory.
+
+    Parameters
+    ----------
+        df: pandas.DataFrame
+            rows to add
+
+        path: str
+            path of the csv file or of the directory of csv partitions
+
+    Returns
+    -------
+        str
+            path of the file the rows were written to
+    """
+    path = Path(path)
+
+    if len(df) == 0:
+        return str(path)
+
+    if path.is_dir():
+        partition = path / f'part-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{time.monotonic_ns()}.csv'
+        write_csv_atomic(df, partition)
+        return str(partition)
+
+    repair_csv(path)
+    if not path.exists() or path.stat().st_size == 0:
+        write_csv_atomic(df, path)
+        return str(path)
+
+    header = read_csv_header(path)
+    new_cols = [col for col in df.columns if col not in header]
+    if new_cols:
+        raise ValueError(f'Columns {new_cols} are not in the existing dataset {path}, '
+                         'please rewrite the dataset or use a directory of partitions')
+    #Lines up the new rows with the columns of the existing file
+    df = df.reindex(columns = header, fill_value = '')
+
+    rows = df.to_csv(header = False, index = False).encode('utf-8')
+    pending_path = _pending_path(path)
+    with open(path, 'rb+') as csv_file:
+        size = csv_file.seek(0, os.SEEK_END)
+        temp_path = _temp_path(pending_path)
+        with open(temp_path, 'w') as temp_file:
+            temp_file.write(str(size))
+        _commit(temp_path, pending_path)
+        try:
+            #Makes sure the new rows start on their own line
+            csv_file.seek(-1, os.SEEK_END)
+            if csv_file.read(1) != b'\n':
+                csv_file.seek(0, os.SEEK_END)
+                csv_file.write(b'\n')
+            csv_file.seek(0, os.SEEK_END)
+            csv_file.write(rows)
+            csv_file.flush()
+            os.fsync(csv_file.fileno())
+        except BaseException:
+            #Cuts the partly written rows, the dataset is left as it was
+            csv_file.truncate(size)
+            raise
+        finally:
+            os.remove(pending_path)
+
+    return str(path)
+
+
+def open_checkpoint(checkpoint_dir, manifest):
+
+    """Helper function used to start a checkpoint or check an existing one was started by the same scrape
+
+    Parameters
+    ----------
+        checkpoint_dir: str
+            directory of the checkpoint
+
+        manifest: dict
+            parameters of the scrape (i.e. dates), saved to checkpoint.json in the checkpoint
+    """
+    manifest_path = Path(checkpoint_dir) / 'checkpoint.json'
+    manifest_path.parent.mkdir(parents = True, exist_ok = True)
+
+    if manifest_path.exists():
+        with open(manifest_path) as manifest_file:
+            checkpoint = json.load(manifest_file)
+        if checkpoint != manifest:
+            raise ValueError(f'{checkpoint_dir} holds the checkpoint of another scrape ({checkpoint}), '
+                             'please use another checkpoint_dir or remove it')
+        return
+
+    temp_path = _temp_path(manifest_path)
+    with open(temp_path, 'w') as temp_file:
+        json.dump(manifest, temp_file)
+    _commit(temp_path, manifest_path)
+
+
+def read_dataset(path, as_scraped = False):
+
+    """Helper function used to read a dataset written by the scraper
+
+    Parameters
+    ----------
+        path: str
+            path of the csv file or of the directory of csv partitions
+
+        as_scraped: bool
+            Indicate whether to read the data with the types of the data returned by the scraper (see
+            schema.scraped_types) instead of letting pandas infer the types
+
+    Returns
+    -------
+        pandas.DataFrame
+            every row of the dataset, partitions are read in the order they were written
+    """
+    path = Path(path)
+    read_options = {'dtype': str, 'keep_default_na': False} if as_scraped else {}
+
+    if path.is_dir():
+        frames = [pd.read_csv(partition, **read_options) for partition in sorted(path.glob('part-*.csv'))]
+        if len(frames) == 0:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index = True, sort = False)
+    else:
+        df = pd.read_csv(path, **read_options)
+
+    return scraped_types(df) if as_scraped else df
+
+
+def _import_pyarrow():
+    #pyarrow is only needed for the Parquet datasets (pip install NBA_data_scraper[parquet])
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Parquet datasets require pyarrow 8.0 or later, please install it with pip install NBA_data_scraper[parquet]')
+    return pyarrow
+
+
+def write_parquet(df, path):
+
+    """Function used to add scraped data to a Parquet dataset partitioned by season and sorted by date
+
+    The data is converted with apply_schema and written to path/Season=<season>/ as a new file sorted by
+    date, so existing files are never rewritten, reading a few seasons only opens their directories and
+    the date statistics of each file let a date range skip the rest. A directory per date would leave
+    hundreds of tiny files per season that are slower to read than the csv.
+
+    Parameters
+    ----------
+        df: pandas.DataFrame
+            player or team data as returned by the scraper
+
+        path: str
+            root directory of the Parquet dataset
+
+    Returns
+    -------
+        list[str]
+            paths of the files written
+    """
+    pa = _import_pyarrow()
+
+    if len(df) == 0:
+        return []
+
+    df = apply_schema(df)
+    df.insert(0, 'Season', df['Date'].map(season_of).astype('int16'))
+    df = df.sort_values('Date', kind = 'stable')
+
+    written = []
+    pa.parquet.write_to_dataset(pa.Table.from_pandas(df, preserve_index = False), root_path = str(path), 
+                                partition_cols = ['Season'], 
+                                basename_template = 'part-' + uuid.uuid4().hex + '-{i}.parquet', 
+                                existing_data_behavior = 'overwrite_or_ignore', 
+                                file_visitor = lambda written_file: written.append(written_file.path))
+    return written
+
+
+def read_parquet(path, columns = None, seasons = None, start_date = None, end_date = None):
+
+    """Function used to read a Parquet dataset written by write_parquet
+
+    Parameters
+    ----------
+        path: str
+            root directory of the Parquet dataset
+
+        columns: list[str]
+            optional, columns to read, every column is read if not inserted
+
+        seasons: list[int]
+            optional, seasons to read, only the directories of these seasons are opened
+
+        start_date: str
+            optional, first date to read
+
+        end_date: str
+            optional, last date to read
+
+    Returns
+    -------
+        pandas.DataFrame
+            typed data ordered by date
+    """
+    pa = _import_pyarrow()
+
+    dataset = pa.dataset.dataset(str(path), format = 'parquet', partitioning = 'hive')
+    filters = []
+    if seasons is not None:
+        filters.append(pa.dataset.field('Season').isin([int(season) for season in seasons]))
+    if start_date is not None:
+        filters.append(pa.dataset.field('Date') >= pd.Timestamp(start_date))
+    if end_date is not None:
+        filters.append(pa.dataset.field('Date') <= pd.Timestamp(end_date))
+    filter_expression = None
+    for expression in filters:
+        filter_expression = expression if filter_expression is None else filter_expression & expression
+    if columns is not None:
+        #Date is always read to order the rows
+        columns = list(columns) + (['Date'] if 'Date' not in columns else [])
+
+    df = dataset.to_table(columns = columns, filter = filter_expression).to_pandas()
+    if 'Season' in df.columns:
+        #Partition values are read back as categoricals
+        df['Season'] = df['Season'].astype('int16')
+
+    return df.sort_values('Date', kind = 'stable').reset_index(drop = True)
+
+
+class GameIndex:
+
+    """Set of the Game-IDs already in a dataset, used to skip the games that were already scraped
+
+    The index is kept in a sidecar file next to the dataset (<dataset>.gameids, or _gameids in a directory
+    of partitions) with one Game-ID per line. It is rebuilt from the Game-ID column of the dataset when it
+    is missing or older than the dataset, i.e. if the dataset was edited by hand.
+
+    Parameters
+    ----------
+
+    path: str
+        path of the csv file or of the directory of csv partitions
+
+    """
+
+    def __init__(self, path):
+
+        self.path = Path(path)
+        if self.path.is_dir():
+            self.index_path = self.path / '_gameids'
+        else:
+            self.index_path = self.path.with_name(self.path.name + '.gameids')
+        self.game_ids = self._load()
+
+    def _dataset_files(self):
+        if self.path.is_dir():
+            return sorted(self.path.glob('part-*.csv'))
+        #Rows of an append killed mid-write are cut before the index is read or rebuilt
+        repair_csv(self.path)
+        if self.path.exists() and self.path.stat().st_size > 0:
+            return [self.path]
+        return []
+
+    def _load(self):
+        files = self._dataset_files()
+        if len(files) == 0:
+            return set()
+
+        dataset_mtime = max(path.stat().st_mtime for path in files)
+        if self.index_path.exists() and self.index_path.stat().st_mtime >= dataset_mtime:
+            with open(self.index_path) as index_file:
+                return set(line.strip() for line in index_file if line.strip())
+
+        #Only the Game-ID column of the dataset is read to rebuild the index
+        game_ids = set()
+        for path in files:
+            if 'Game-ID' not in read_csv_header(path):
+                continue
+            values = pd.read_csv(path, usecols = ['Game-ID'], dtype = str)['Game-ID']
+            with open(path, 'rb') as csv_file:
+                csv_file.seek(-1, os.SEEK_END)
+                #An unterminated last row may have been cut mid-write, its game is not counted as scraped
+                if csv_file.read(1) != b'\n':
+                    values = values.iloc[:-1]
+            game_ids.update(values.dropna())
+        self._write(game_ids)
+        return game_ids
+
+    def _write(self, game_ids):
+        temp_path = _temp_path(self.index_path)
+        try:
+            with open(temp_path, 'w') as temp_file:
+                temp_file.writelines(game_id + '\n' for game_id in sorted(game_ids))
+            _commit(temp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def __contains__(self, game_id):
+        return game_id in self.game_ids
+
+    def __len__(self):
+        return len(self.game_ids)
+
+    def add(self, game_ids):
+        """Adds the Game-IDs of newly written rows to the index and saves it"""
+        self.game_ids.update(game_ids)
+        self._write(self.game_ids)
+
+
+class FlushedGameIds:
+
+    """Game-IDs whose rows a checkpointed scrape already wrote to a dataset
+
+    Kept in <checkpoint_dir>/<name>.gameids with one Game-ID per line, appended after every batch, so a
+    resumed scrape skips the games an interrupted run wrote whether or not it skips the games that were
+    already in the dataset. The Game-IDs of a batch are recorded in <checkpoint_dir>/<name>.pending with
+    the size of the dataset before its rows are written (see begin), if the scrape is killed before they
+    are added the Game-IDs of the rows written since are added when the checkpoint is opened again.
+
+    Parameters
+    ----------
+
+    checkpoint_dir: str
+        directory of the checkpoint
+
+    name: str
+        name of the dataset (i.e. player)
+
+    dataset_path: str
+        path of the csv file or of the directory of csv partitions the rows are written to
+
+    """
+
+    def __init__(self, checkpoint_dir, name, dataset_path):
+
+        self.path = Path(checkpoint_dir) / f'{name}.gameids'
+        self.pending_path = Path(checkpoint_dir) / f'{name}.pending'
+        self.dataset_path = Path(dataset_path)
+        self.game_ids = set()
+        if self.path.exists():
+            with open(self.path) as index_file:
+                self.game_ids = set(line.strip() for line in index_file if line.strip())
+        if self.pending_path.exists():
+            self._recover()
+
+    def _dataset_size(self):
+        if self.dataset_path.is_dir() or not self.dataset_path.exists():
+            return None
+        return self.dataset_path.stat().st_size
+
+    def _recover(self):
+        #Looks for the Game-IDs of the interrupted batch in the rows written after it was recorded
+        with open(self.pending_path) as pending_file:
+            pending = json.load(pending_file)
+
+        written = []
+        if self.dataset_path.is_dir():
+            #Partitions are written whole, a partition newer than the record holds the batch
+            for partition in self.dataset_path.glob('part-*.csv'):
+                if partition.stat().st_mtime >= pending['recorded_at'] - 1:
+                    written.append(pd.read_csv(partition, usecols = ['Game-ID'], dtype = str)['Game-ID'])
+        elif self.dataset_path.exists():
+            #The rows of an append killed mid-write are cut first, what is left past the recorded size was written whole
+            repair_csv(self.dataset_path)
+            size = pending['size'] or 0
+            if self.dataset_path.stat().st_size > size:
+                header = read_csv_header(self.dataset_path)
+                with open(self.dataset_path, 'rb') as csv_file:
+                    csv_file.seek(size)
+                    rows = csv_file.read()
+                if size == 0:
+                    written.append(pd.read_csv(BytesIO(rows), usecols = ['Game-ID'], dtype = str)['Game-ID'])
+                else:
+                    written.append(pd.read_csv(BytesIO(rows), names = header, usecols = ['Game-ID'], dtype = str)['Game-ID'])
+
+        pending_game_ids = set(pending['game_ids'])
+        self.add(game_id for values in written for game_id in values.dropna() if game_id in pending_game_ids)
+
+    def begin(self, game_ids):
+        """Records the Game-IDs of a batch before its rows are written, see add once they are"""
+        temp_path = _temp_path(self.pending_path)
+        with open(temp_path, 'w') as temp_file:
+            json.dump({'game_ids': sorted(set(game_ids)), 'size': self._dataset_size(), 'recorded_at': time.time()}, temp_file)
+        _commit(temp_path, self.pending_path)
+
+    def __contains__(self, game_id):
+        return game_id in self.game_ids
+
+    def __len__(self):
+        return len(self.game_ids)
+
+    def add(self, game_ids):
+        """Adds the Game-IDs of newly written rows to the checkpoint"""
+        new_game_ids = sorted(set(game_ids) - self.game_ids)
+        with open(self.path, 'a') as index_file:
+            index_file.writelines(game_id + '\n' for game_id in new_game_ids)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        self.game_ids.update(new_game_ids)
+        if self.pending_path.exists():
+            os.remove(self.pending_path)
+
+
+class CSVSink:
+
+    """Sink appending the rows of each game it is given to csv datasets, i.e. for NBA_scraper.watch
+
+    Rows are appended with append_csv as soon as a game is handed to the sink, so readers of the datasets
+    see a game once it is final. The Game-IDs already in the datasets are in game_ids, watch doesn't
+    scrape them again after a restart.
+
+    Parameters
+    ----------
+
+    player_path: str
+        optional, path of the csv file or of the directory of csv partitions the player rows are added to
+
+    team_path: str
+        optional, path of the csv file or of the directory of csv partitions the team rows are added to
+
+    """
+
+    def __init__(self, player_path = None, team_path = None):
+
+        self.paths = {name: path for name, path in (('player', player_path), ('team', team_path)) if path is not None}
+        self.indexes = {name: GameIndex(path) for name, path in self.paths.items()}
+
+    @property
+    def game_ids(self):
+        """Game-IDs in every dataset of the sink"""
+        if not self.indexes:
+            return set()
+        return set.intersection(*(index.game_ids for index in self.indexes.values()))
+
+    def __call__(self, game):
+        """Appends the rows of game (a GameRecord) to the datasets"""
+        for name, df in (('player', game.player_df()), ('team', game.team_df())):
+            if name not in self.paths or df is None or game.game_id in self.indexes[name]:
+                continue
+            append_csv(df, self.paths[name])
+            self.indexes[name].add([game.game_id])
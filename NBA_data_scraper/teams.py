@@ -0,0 +1,304 @@
+"""Module containing the registry of NBA teams, the single source of every team name, city and abbreviation"""
+
+from datetime import date, datetime
+from typing import NamedTuple, Optional, Tuple
+
+
+class Team(NamedTuple):
+
+    """Franchise under one name and abbreviation, i.e. the Seattle SuperSonics (SEA) from 1968 to 2008
+
+    code is the small integer identifying the team in the registry and in the compact columns, city is
+    the name the scoreboards give the team (i.e. LA Lakers) and the seasons are named after the year
+    they end in, last_season is None for the current teams. other_cities are other names the scoreboards
+    gave the team during its seasons.
+    """
+
+    code: int
+    abbreviation: str
+    full_name: str
+    city: str
+    first_season: int
+    last_season: Optional[int]
+    other_cities: Tuple[str, ...] = ()
+
+    def played_in(self, season):
+        """Returns whether the team played under this name and abbreviation in season"""
+        return self.first_season <= season and (self.last_season is None or season <= self.last_season)
+
+
+#Current teams come first so their codes are 0 to 29, codes are never reused or reordered
+TEAMS = tuple(Team(code, *team) for code, team in enumerate([
+    ('ATL', 'Atlanta Hawks', 'Atlanta', 1969, None),
+    ('BOS', 'Boston Celtics', 'Boston', 1947, None),
+    ('BRK', 'Brooklyn Nets', 'Brooklyn', 2013, None),
+    ('CHI', 'Chicago Bulls', 'Chicago', 1967, None),
+    ('CHO', 'Charlotte Hornets', 'Charlotte', 2015, None),
+    ('CLE', 'Cleveland Cavaliers', 'Cleveland', 1971, None),
+    ('DAL', 'Dallas Mavericks', 'Dallas', 1981, None),
+    ('DEN', 'Denver Nuggets', 'Denver', 1977, None),
+    ('DET', 'Detroit Pistons', 'Detroit', 1958, None),
+    ('GSW', 'Golden State Warriors', 'Golden State', 1972, None),
+    ('HOU', 'Houston Rockets', 'Houston', 1972, None),
+    ('IND', 'Indiana Pacers', 'Indiana', 1977, None),
+    ('LAC', 'Los Angeles Clippers', 'LA Clippers', 1985, None),
+    ('LAL', 'Los Angeles Lakers', 'LA Lakers', 1961, None),
+    ('MIA', 'Miami Heat', 'Miami', 1989, None),
+    ('MIL', 'Milwaukee Bucks', 'Milwaukee', 1969, None),
+    ('MIN', 'Minnesota Timberwolves', 'Minnesota', 1990, None),
+    ('MEM', 'Memphis Grizzlies', 'Memphis', 2002, None),
+    ('NOP', 'New Orleans Pelicans', 'New Orleans', 2014, None),
+    ('NYK', 'New York Knicks', 'New York', 1947, None),
+    ('OKC', 'Oklahoma City Thunder', 'Oklahoma City', 2009, None),
+    ('ORL', 'Orlando Magic', 'Orlando', 1990, None),
+    ('PHI', 'Philadelphia 76ers', 'Philadelphia', 1964, None),
+    ('PHO', 'Phoenix Suns', 'Phoenix', 1969, None),
+    ('POR', 'Portland Trail Blazers', 'Portland', 1971, None),
+    ('SAC', 'Sacramento Kings', 'Sacramento', 1986, None),
+    ('SAS', 'San Antonio Spurs', 'San Antonio', 1977, None),
+    ('TOR', 'Toronto Raptors', 'Toronto', 1996, None),
+    ('UTA', 'Utah Jazz', 'Utah', 1980, None),
+    ('WAS', 'Washington Wizards', 'Washington', 1998, None),
+    ('NJN', 'New Jersey Nets', 'New Jersey', 1978, 2012),
+    ('SEA', 'Seattle SuperSonics', 'Seattle', 1968, 2008),
+    ('CHA', 'Charlotte Bobcats', 'Charlotte', 2005, 2014),
+    ('CHH', 'Charlotte Hornets', 'Charlotte', 1989, 2002),
+    ('NOH', 'New Orleans Hornets', 'New Orleans', 2003, 2013),
+    ('NOK', 'New Orleans/Oklahoma City Hornets', 'New Orleans/Oklahoma City', 2006, 2007, ('New Orleans',)),
+    ('VAN', 'Vancouver Grizzlies', 'Vancouver', 1996, 2001),
+    ('WSB', 'Washington Bullets', 'Washington', 1975, 1997),
+    ('KCK', 'Kansas City Kings', 'Kansas City', 1976, 1985),
+    ('SDC', 'San Diego Clippers', 'San Diego', 1979, 1984),
+]))
+
+_BY_ABBREVIATION = {team.abbreviation: team for team in TEAMS}
+
+#Full names in code order, a name used by two teams (i.e. Charlotte Hornets) is kept once
+TEAM_NAMES = tuple(dict.fromkeys(team.full_name for team in TEAMS))
+
+
+#Seasons run from August to July, except the seasons below which ran past July, by the last day they were played
+#(the 2020 season was suspended in March and finished in the bubble in October)
+LATE_SEASON_ENDS = {2020: date(2020, 10, 11)}
+
+
+def season_of(date_played):
+
+    """Function used to get the season of a game, named after the year it ends in
+
+    Parameters
+    ----------
+        date_played: str, datetime.date or datetime.datetime
+            date of the game (i.e. 2019-03-21)
+
+    Returns
+    -------
+        int
+            season of the game, i.e. 2019 for a game played on 2018-11-01 or 2019-03-21
+            and 2020 for a game of the bubble played on 2020-08-15
+    """
+    if isinstance(date_played, str):
+        date_played = date.fromisoformat(date_played[0:10])
+    elif isinstance(date_played, datetime):
+        date_played = date_played.date()
+    late_end = LATE_SEASON_ENDS.get(date_played.year)
+
+    if date_played.month >= 8 and not (late_end and date_played <= late_end):
+        return date_played.year + 1
+    return date_played.year
+
+
+def season_bounds(season):
+
+    """Function used to get the first and last day of a season, named after the year it ends in
+
+    Parameters
+    ----------
+        season: int
+            season (i.e. 2019 for 2018-19)
+
+    Returns
+    -------
+        datetime.date, datetime.date
+            first and last day of the season, every date in between has season_of equal to season
+    """
+    previous_end = LATE_SEASON_ENDS.get(season - 1)
+    first_day = date(season - 1, 8, 1) if previous_end is None else date.fromordinal(previous_end.toordinal() + 1)
+    last_day = LATE_SEASON_ENDS.get(season, date(season, 7, 31))
+
+    return first_day, last_day
+
+
+def _latest_first(team):
+    return -(team.last_season or 10**4)
+
+
+def _seasons_played(team):
+    return (team.last_season or 10**4) - team.first_season
+
+
+def _find(field, value, season):
+    #Teams with the value, the one that played in season or otherwise the most recent one
+    teams = sorted((team for team in TEAMS if getattr(team, field) == value 
+                    or (field == 'city' and value in team.other_cities)), key = _latest_first)
+    if not teams:
+        raise KeyError(value)
+    if season is not None:
+        #The team of the shortest stint wins, i.e. the Hornets were NOK and not NOH while they played in Oklahoma City
+        played = [team for team in teams if team.played_in(season)]
+        if played:
+            return min(played, key = _seasons_played)
+    return teams[0]
+
+
+def team_by_code(code):
+
+    """Function used to get a team from its code
+
+    Parameters
+    ----------
+        code: int
+            code of the team in the registry (i.e. 13)
+
+    Returns
+    -------
+        NBA_data_scraper.teams.Team
+            team with the code
+    """
+    if not 0 <= code < len(TEAMS):
+        raise KeyError(code)
+    return TEAMS[code]
+
+
+def team_by_abbreviation(abbreviation):
+
+    """Function used to get a team from its abbreviation
+
+    Parameters
+    ----------
+        abbreviation: str
+            abbreviation of the team (i.e. LAL or SEA)
+
+    Returns
+    -------
+        NBA_data_scraper.teams.Team
+            team with the abbreviation
+    """
+    return _BY_ABBREVIATION[abbreviation]
+
+
+def team_by_name(full_name, season = None):
+
+    """Function used to get a team from its full name, names used by two teams are told apart by the season
+
+    Parameters
+    ----------
+        full_name: str
+            full name of the team (i.e. Charlotte Hornets)
+
+        season: int
+            optional, season of the game (i.e. 1998 for the CHH Hornets), the most recent team is returned without it
+
+    Returns
+    -------
+        NBA_data_scraper.teams.Team
+            team with the name
+    """
+    return _find('full_name', full_name, season)
+
+
+def team_by_city(city, season = None):
+
+    """Function used to get a team from the city the scoreboards give it
+
+    Parameters
+    ----------
+        city: str
+            city of the team as in the scoreboard (i.e. Charlotte or LA Lakers)
+
+        season: int
+            optional, season of the game (i.e. 2010 for the Bobcats), the most recent team is returned without it
+
+    Returns
+    -------
+        NBA_data_scraper.teams.Team
+            team of the city
+    """
+    return _find('city', city, season)
+
+
+def team_abbreviation(full_name, date_played = None, config = None):
+
+    """Function used to get the abbreviation of a team at the time of a game
+
+    Parameters
+    ----------
+        full_name: str
+            full name of the team (i.e. Charlotte Hornets)
+
+        date_played: str
+            optional, date of the game (i.e. 1999-03-21 for CHH or 2019-03-21 for CHO), the most recent team is used without it
+
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the registry
+
+    Returns
+    -------
+        str
+            abbreviation of the team (i.e. CHH)
+    """
+    if config is not None:
+        return config[full_name]
+
+    return team_by_name(full_name, None if date_played is None else season_of(date_played)).abbreviation
+
+
+def current_teams():
+    """Returns the teams currently in the league"""
+    return [team for team in TEAMS if team.last_season is None]
+
+
+def game_key(game_id):
+
+    """Function used to turn a Game-ID into an integer, i.e. 20190321LAL into 2019032113
+
+    Parameters
+    ----------
+        game_id: str
+            Game-ID of the game, its date and the abbreviation of the home team
+
+    Returns
+    -------
+        int
+            yyyymmdd of the game times 100 plus the code of the home team
+    """
+    return int(game_id[0:8]) * 100 + _BY_ABBREVIATION[game_id[8:]].code
+
+
+def game_keys(game_ids):
+
+    """Vectorized game_key, used to join datasets on integers instead of Game-ID strings
+
+    Parameters
+    ----------
+        game_ids: pandas.Series
+            Game-IDs, as strings or categorical
+
+    Returns
+    -------
+        pandas.Series
+            int64 keys, missing for a Game-ID of an unknown team
+    """
+    import pandas as pd
+
+    #Each distinct Game-ID is converted once and the keys are spread with the codes
+    if isinstance(game_ids.dtype, pd.CategoricalDtype):
+        codes, uniques = game_ids.cat.codes.to_numpy(), game_ids.cat.categories
+    else:
+        codes, uniques = pd.factorize(game_ids)
+    uniques = pd.Series(uniques, dtype = object).astype(str)
+    team_codes = uniques.str[8:].map({abbreviation: team.code for abbreviation, team in _BY_ABBREVIATION.items()})
+    keys = pd.to_numeric(uniques.str[0:8], errors = 'coerce') * 100 + team_codes
+    keys = pd.array(keys.to_numpy(), dtype = 'Int64')
+
+    return pd.Series(keys.take(codes, allow_fill = True), index = game_ids.index, name = game_ids.name)
@@ -1,48 +1,352 @@
 """Module containing the util functions for scraping data"""
 
-import selenium 
-import pandas as pd
-import numpy as np
-import yaml
-import os
-from pathlib import Path
-from selenium import webdriver 
-
-
-team_config = { 
-  'Atlanta Hawks': 'ATL', 
-  'Boston Celtics': 'BOS',
-  'Brooklyn Nets': 'BRK',
-  'Chicago Bulls': 'CHI',
-  'Charlotte Hornets': 'CHO',
-  'Cleveland Cavaliers': 'CLE',
-  'Dallas Mavericks': 'DAL',
-  'Denver Nuggets': 'DEN',
-  'Detroit Pistons': 'DET',
-  'Golden State Warriors': 'GSW',
-  'Houston Rockets': 'HOU',
-  'Indiana Pacers': 'IND',
-  'Los Angeles Clippers': 'LAC',
-  'Los Angeles Lakers': 'LAL',
-  'Miami Heat': 'MIA',
-  'Milwaukee Bucks': 'MIL',
-  'Minnesota Timberwolves': 'MIN',
-  'Memphis Grizzlies': 'MEM',
-  'New Orleans Pelicans': 'NOP',
-  'New York Knicks': 'NYK',
-  'Oklahoma City Thunder': 'OKC',
-  'Orlando Magic': 'ORL',
-  'Philadelphia 76ers': 'PHI',
-  'Phoenix Suns': 'PHO',
-  'Portland Trail Blazers': 'POR',
-  'Sacramento Kings': 'SAC',
-  'San Antonio Spurs': 'SAS',
-  'Toronto Raptors': 'TOR',
-  'Utah Jazz': 'UTA',
-  'Washington Wizards': 'WAS',
-}
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .teams import TEAMS, team_abbreviation
+
+#Root of the Basketball Reference site, all page urls are built from it
+BASE_URL = 'https://www.basketball-reference.com'
+
+#Full names mapped to abbreviations, a name used by two teams (i.e. Charlotte Hornets) maps to the most recent one,
+#pages and Game-IDs are built with teams.team_abbreviation which tells those teams apart by season
+team_config = {team.full_name: team.abbreviation for team in sorted(TEAMS, key = lambda team: team.last_season or 10**4)}
+
+
+def scoreboard_url(games_date, base_url = BASE_URL):
+    
+    """Helper function used to build the url of the page listing all games on a specific date
+    
+    Parameters
+    ----------
+        games_date: str
+            date in which games are played (i.e. 2019-03-21)
+            
+        base_url: str
+            root of the Basketball Reference site
+            
+    Returns
+    -------
+        str
+            url of the scoreboard page
+    """
+    modified_date = games_date.replace('-', '')
+    year = modified_date[0:4]
+    month = modified_date[4:6]
+    days = modified_date[6:8]
+    
+    return f'{base_url}/boxscores/?month={month}&day={days}&year={year}'
+
+
+def boxscore_url(modified_date, home_team_abrv, base_url = BASE_URL):
+    
+    """Helper function used to build the url of a game's box score page
+    
+    Parameters
+    ----------
+        modified_date: str
+            date string without the hypens (i.e. 20190321)
+            
+        home_team_abrv: str
+            abbreviation of the home team that played (i.e. BOS)
+            
+        base_url: str
+            root of the Basketball Reference site
+            
+    Returns
+    -------
+        str
+            url of the box score page
+    """
+    return base_url + '/boxscores/' + modified_date + '0' + home_team_abrv + '.html'
+
+
+def pbp_url(modified_date, home_team_abrv, base_url = BASE_URL):
+    
+    """Helper function used to build the url of a game's play-by-play page
+    
+    Parameters
+    ----------
+        modified_date: str
+            date string without the hypens (i.e. 20190321)
+            
+        home_team_abrv: str
+            abbreviation of the home team that played (i.e. BOS)
+            
+        base_url: str
+            root of the Basketball Reference site
+            
+    Returns
+    -------
+        str
+            url of the play-by-play page
+    """
+    return base_url + '/boxscores/pbp/' + modified_date + '0' + home_team_abrv + '.html'
+
+
+def schedule_url(season, month = None, base_url = BASE_URL):
+    
+    """Helper function used to build the url of a season's schedule page
+    
+    Parameters
+    ----------
+        season: int
+            season of the schedule, named after the year it ends in (i.e. 2019 for 2018-19)
+            
+        month: str
+            optional, month of the schedule (i.e. october), the first month is returned if not inserted
+            
+        base_url: str
+            root of the Basketball Reference site
+            
+    Returns
+    -------
+        str
+            url of the schedule page
+    """
+    if month:
+        return f'{base_url}/leagues/NBA_{season}_games-{month}.html'
+    return f'{base_url}/leagues/NBA_{season}_games.html'
 
         
+def build_player_rows(header, starters, reserves, game_id, date_played, team_name, home_or_away):
+
+    """Helper function used to build the player rows of a team from its box score
+
+    Parameters
+    ----------
+        header: list[str]
+            header of the box score (i.e. Starters, MP, FG, ...)
+
+        starters: list[list[str]]
+            rows of the starters, player name first
+
+        reserves: list[list[str]]
+            rows of the reserves that played, player name first
+
+        game_id: str
+            Game-ID of the game (i.e. 20190321BOS)
+
+        date_played: str
+            date the game is played (i.e. 2019-03-21)
+
+        team_name: str
+            full name of the team (i.e. Boston Celtics)
+
+        home_or_away: str
+            indicating whether the team is Home or Road (H or R)
+
+    Returns
+    -------
+        list[str], list[list]
+            columns and rows of the player stats
+    """
+    df_cols = ['Game-ID', 'Date', 'Team', 'Venue(R/H)', 'Starter(Y/N)', 'Player Name'] + header[1:]
+
+    rows = []
+    for starter, player_rows in (('Y', starters), ('N', reserves)):
+        for player_stats in player_rows:
+            row = [game_id, date_played, team_name, home_or_away, starter] + player_stats
+            #checks if the +/- field is empty (there are instances in Basketball Reference where the +/- field for a player who has played doesn't exist)
+            rows.append(row + [''] * (len(df_cols) - len(row)))
+
+    return df_cols, rows
+
+
+def build_team_rows(header, home_totals, away_totals, home_score, away_score,
+                    game_id, date_played, home_team_name, away_team_name):
+
+    """Helper function used to build the team rows of a game from the box scores and line score
+
+    Parameters
+    ----------
+        header: list[str]
+            header of the box score (i.e. Starters, MP, FG, ...)
+
+        home_totals: list[str]
+            team totals of the home team, stats only starting with MP
+
+        away_totals: list[str]
+            team totals of the away team, stats only starting with MP
+
+        home_score: list[int]
+            home team scores by quarter, with the final score as the last element
+
+        away_score: list[int]
+            away team scores by quarter, with the final score as the last element
+
+        game_id: str
+            Game-ID of the game (i.e. 20190321BOS)
+
+        date_played: str
+            date the game is played (i.e. 2019-03-21)
+
+        home_team_name: str
+            full name of the home team (i.e. Boston Celtics)
+
+        away_team_name: str
+            full name of the away team (i.e. Los Angeles Lakers)
+
+    Returns
+    -------
+        list[str], list[list]
+            columns and rows of the team stats, home team first
+    """
+    #Team totals don't have a +/- field
+    stat_cols = [col for col in header[1:] if col != '+/-']
+    df_cols = (['Game-ID', 'Date', 'Team', 'Venue(R/H)', '1Q', '2Q', '3Q', '4Q',
+                'OT1', 'OT2', 'OT3', 'OT4', 'OT5', 'F'] + stat_cols)
+
+    #Transforms box scores to append to Team DF
+    num_zeros = 9 - len(home_score[0: len(home_score) - 1])
+    ht_box_score = home_score[0: len(home_score) - 1] + ['']*num_zeros + [home_score[-1]]
+    rt_box_score = away_score[0: len(away_score) - 1] + ['']*num_zeros + [away_score[-1]]
+
+    ht_team_stats = [game_id, date_played, home_team_name, 'H'] + ht_box_score + home_totals[0: len(stat_cols)]
+    rt_team_stats = [game_id, date_played, away_team_name, 'R'] + rt_box_score + away_totals[0: len(stat_cols)]
+
+    return df_cols, [ht_team_stats, rt_team_stats]
+
+
+def split_player_line(line):
+    
+    """Helper function used to split a player line of the box score text into its fields
+    
+    Empty fields are dropped from the text of the box score, so they are re-inserted to keep the
+    stats aligned with the columns.
+    
+    Parameters
+    ----------
+        line: str
+            line of the box score text (i.e. Jayson Tatum 36:12 10 20 .500 ...)
+            
+    Returns
+    -------
+        list[str]
+            player name followed by the stats of the player
+    """
+    tokens = line.split(' ')
+    player_stats = [tokens[0] + ' ' + tokens[1]] + tokens[2:]
+    #checks if FGA is empty
+    if player_stats[3] == '0':
+        player_stats.insert(4, '')
+    #checks if 3PA is empty 
+    if player_stats[6] == '0':
+        player_stats.insert(7, '')
+    #checks if FTA is empty 
+    if player_stats[9] == '0':
+        player_stats.insert(10, '')
+    
+    return player_stats
+
+
+def split_box_score_text(text):
+    
+    """Helper function used to split the text of a basic box score element into rows
+    
+    Parameters
+    ----------
+        text: str
+            text of the basic box score element (i.e. all_box-BOS-game-basic)
+            
+    Returns
+    -------
+        list[str], list[list[str]], list[list[str]], list[str]
+            header, starter rows, reserve rows and team totals row of the box score
+    """
+    lines = text.split('\n')
+    
+    #Grabs the line with columns
+    header = lines[4].split(' ')
+    
+    #Grabs the stats for the starters
+    starters = [split_player_line(line) for line in lines[5:10]]
+    
+    #Grabs the stats for the reserves
+    #Data for Players that didn't play or not with team are not stored
+    reserves = []
+    for line in lines[11:]:
+        tokens = line.split(' ')
+        if (tokens[2] == 'Did') or (tokens[2] == 'Not') or (tokens[0] == 'Team'):
+            break
+        reserves.append(split_player_line(line))
+    
+    #Team totals are split like a player line since their percentages can be empty as well
+    totals = split_player_line(lines[-1])
+    
+    return header, starters, reserves, totals
+
+
+def split_line_score_text(text):
+    
+    """Helper function used to split the text of the line score element into scores by quarter
+    
+    Parameters
+    ----------
+        text: str
+            text of the line_score element
+            
+    Returns
+    -------
+        list[int], list[int]
+            away and home team scores by quarter, with the final score as the last element
+    """
+    lines = text.split('\n')
+    
+    #Grabs box score stats basketball ref
+    away_score = lines[-2].split(' ')
+    home_score = lines[-1].split(' ')
+    del away_score[0]
+    del home_score[0]
+    
+    #Converts data to integers
+    return list(map(int, away_score)), list(map(int, home_score))
+
+
+def read_element_text(driver, element_id):
+    
+    """Helper function used to read the text of an element of the loaded page by its id
+    
+    Parameters
+    ----------
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver
+            
+        element_id: str
+            id of the element (i.e. line_score)
+            
+    Returns
+    -------
+        str
+            text of the element
+    """
+    #selenium is only imported by the selenium backend
+    from selenium.webdriver.common.by import By
+    
+    return driver.find_element(By.ID, element_id).text
+
+
+def read_box_score_text(driver, team_abrv):
+    
+    """Helper function used to read the text of a team's basic box score from the loaded game page
+    
+    Parameters
+    ----------
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver, already navigated to the game's box score page
+            
+        team_abrv: str
+            abbreviation of the team the box score is read for (i.e. BOS)
+            
+    Returns
+    -------
+        str
+            text of the box score element
+    """
+    #ID of the box score on the Basketball Reference
+    element_id = 'all_box-' + team_abrv + '-game-basic'
+    return read_element_text(driver, element_id)
+
+
 def scrape_player_data(driver, date_played, modified_date, team_name, 
                        home_team_abrv, team_abrv, home_or_away):
    
@@ -77,82 +381,16 @@ def scrape_player_data(driver, date_played, modified_date, team_name,
             df of the player stats for the team on the specified date
     """
     
+    #The box score text is read from the driver once and split into rows
+    header, starters, reserves, _ = split_box_score_text(read_box_score_text(driver, team_abrv))
     
-    #ID of the box score on the Basketball Reference
-    element_id = 'all_box-' + team_abrv + '-game-basic'
-    source = driver.find_element_by_id(element_id)
-    
-    #Creates the columns for the Dataframe
-    #Grabs the line with columns
-    df_cols = source.text.split('\n')[4].split(' ')
-    df_cols[0] = 'Player Name'
-    #Inserts additional columns
-    df_cols.insert(0, 'Starter(Y/N)')
-    df_cols.insert(0, 'Venue(R/H)')
-    df_cols.insert(0, 'Team')
-    df_cols.insert(0, 'Date')
-    df_cols.insert(0, 'Game-ID')
-    
-    player_df = pd.DataFrame(columns = df_cols)
-    
-    #Grabs the stats for the starters on the Home Team
-    for i in range(0, 5):
-        player_stats = source.text.split('\n')[i + 5].split(' ')
-        player_stats[0] = player_stats[0] +  ' ' + player_stats[1]
-        del player_stats[1]
-        player_stats.insert(0, 'Y')
-        player_stats.insert(0, home_or_away)
-        player_stats.insert(0, team_name)
-        player_stats.insert(0, date_played)
-        player_stats.insert(0, modified_date + home_team_abrv)
-        #checks if FGA is empty
-        if player_stats[8] == '0':
-            player_stats.insert(9, '')
-        #checks if 3PA is empty 
-        if player_stats[11] == '0':
-            player_stats.insert(12, '')
-        #checks if FTA is empty 
-        if player_stats[14] == '0':
-            player_stats.insert(15, '')
-        #checks if the +/- field is empty (there are instances in Basketball Reference where the +/- field for a player who has played doesn't exist)
-        if (len(df_cols) - len(player_stats)) == 1:
-            player_stats = player_stats + ['']
+    df_cols, rows = build_player_rows(header, starters, reserves, 
+                                      game_id = modified_date + home_team_abrv, 
+                                      date_played = date_played, 
+                                      team_name = team_name, 
+                                      home_or_away = home_or_away)
         
-        
-        player_df.loc[i] = player_stats
-
-    #Grabs the stats for the starters on the Away Team    
-    #Data for Players that didn't play or not with team are not stored
-    k = 11    
-    while ((source.text.split('\n')[k].split(' ')[2] != 'Did') and 
-           (source.text.split('\n')[k].split(' ')[2] != 'Not') and 
-           (source.text.split('\n')[k].split(' ')[0] != 'Team')):
-        player_stats = source.text.split('\n')[k].split(' ')
-        player_stats[0] = player_stats[0] +  ' ' + player_stats[1]
-        del player_stats[1]
-        player_stats.insert(0, 'N')
-        player_stats.insert(0, home_or_away)
-        player_stats.insert(0, team_name)
-        player_stats.insert(0, date_played)
-        player_stats.insert(0, modified_date + home_team_abrv)
-        #checks if FGA is empty
-        if player_stats[8] == '0':
-            player_stats.insert(9, '')
-        #checks if 3PA is empty 
-        if player_stats[11] == '0':
-            player_stats.insert(12, '')
-        #checks if FTA is empty 
-        if player_stats[14] == '0':
-            player_stats.insert(15, '')
-        #checks if the +/- field is empty (there are instances in Basketball Reference where the +/- field for a player who has played doesn't exist)
-        if (len(df_cols) - len(player_stats)) == 1:
-            player_stats = player_stats + ['']
-
-        player_df.loc[k - 6] = player_stats
-
-        k+=1
-        
-    return player_df 
+    return rows_to_frame((df_cols, rows))
 
 
 def scrape_team_data(driver, date_played, modified_date, home_team_name,
@@ -189,68 +427,18 @@ def scrape_team_data(driver, date_played, modified_date, home_team_name,
             df of the team stats for the team on the specified date
     """
     
-    #ID of the home team box score on the Basketball Reference
-    home_team_element_id = 'all_box-' + home_team_abrv + '-game-basic'
-    ht_source = driver.find_element_by_id(home_team_element_id)
-    ht_team_stats = ht_source.text.split('\n')[-1].split(' ')
-    del ht_team_stats[0]
-    del ht_team_stats[0]
-    
-    #ID of the away team box score on the Basketball Reference
-    away_team_element_id = 'all_box-' + away_team_abrv + '-game-basic'
-    rt_source = driver.find_element_by_id(away_team_element_id)
-    rt_team_stats = rt_source.text.split('\n')[-1].split(' ')
-    del rt_team_stats[0]
-    del rt_team_stats[0]
-    
-    #Creates the columns for the Dataframe
-    #Grabs the line with columns
-    df_cols = ht_source.text.split('\n')[4].split(' ')
-    
-    #Inserts additional columns
-    df_cols[0] = 'F'
-    df_cols.insert(0, 'OT5')
-    df_cols.insert(0, 'OT4')
-    df_cols.insert(0, 'OT3')
-    df_cols.insert(0, 'OT2')
-    df_cols.insert(0, 'OT1')
-    df_cols.insert(0, '4Q')
-    df_cols.insert(0, '3Q')
-    df_cols.insert(0, '2Q')
-    df_cols.insert(0, '1Q')
-    df_cols.insert(0, 'Venue(R/H)')
-    df_cols.insert(0, 'Team')
-    df_cols.insert(0, 'Date')
-    df_cols.insert(0, 'Game-ID')
-    del df_cols[-1]
-    
-    #Creates team_df 
-    team_df = pd.DataFrame(columns = df_cols)
-    
-    #Grabs the box score by source id 
-    box_source = driver.find_element_by_id('line_score')
-    
-    #Grabs box score stats basketball ref
-    away_score = box_source.text.split('\n')[-2].split(' ')
-    home_score = box_source.text.split('\n')[-1].split(' ')
-    del away_score[0]
-    del home_score[0]
-    #Converts data to integers
-    away_score = list(map(int, away_score))
-    home_score = list(map(int, home_score))
-    
-    #Transforms box scores to append to Team DF
-    num_zeros = 9 - len(home_score[0: len(home_score) - 1])
-    ht_box_score = home_score[0: len(home_score) - 1] + ['']*num_zeros + [home_score[-1]]
-    rt_box_score = away_score[0: len(away_score) - 1] + ['']*num_zeros + [away_score[-1]]
-    
-    ht_team_stats = [modified_date + home_team_abrv, date_played, home_team_name, 'H'] + ht_box_score + ht_team_stats
-    rt_team_stats = [modified_date + home_team_abrv, date_played, away_team_name, 'R'] + rt_box_score + rt_team_stats
+    #The text of each element is read from the driver once
+    ht_header, _, _, ht_totals = split_box_score_text(read_box_score_text(driver, home_team_abrv))
+    _, _, _, rt_totals = split_box_score_text(read_box_score_text(driver, away_team_abrv))
+    away_score, home_score = split_line_score_text(read_element_text(driver, 'line_score'))
     
-    team_df.loc[0] = ht_team_stats
-    team_df.loc[1] = rt_team_stats
+    df_cols, rows = build_team_rows(ht_header, ht_totals[1:], rt_totals[1:], home_score, away_score, 
+                                    game_id = modified_date + home_team_abrv, 
+                                    date_played = date_played, 
+                                    home_team_name = home_team_name, 
+                                    away_team_name = away_team_name)
     
-    return team_df
+    return rows_to_frame((df_cols, rows))
 
 
 #Returns list of Home Teams that have played on a certain date
@@ -272,32 +460,109 @@ def get_list_of_hometeams(driver, games_date):
             list of home team names that played on the specified date
             
     """
-    modified_date = games_date.replace('-', '')
-    year = modified_date[0:4]
-    month = modified_date[4:6]
-    days = modified_date[6:8]
-    
     #Directory for all games on a specific date 
-    scores_dir = f'https://www.basketball-reference.com/boxscores/?month={month}&day={days}&year={year}'
+    scores_dir = scoreboard_url(games_date)
     driver.get(scores_dir)
-    source = driver.find_elements_by_class_name('game_summaries')
+    
+    return read_list_of_hometeams(driver, games_date)
+
+def read_list_of_hometeams(driver, games_date):
+    
+    """Helper function used to read the list of Home Team names from an already loaded scoreboard page
+    
+    Parameters
+    ----------
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver, already navigated to the scoreboard page of games_date
+            
+        games_date: str
+            date in which games are played (i.e. 2019-03-21)
+            
+    Returns
+    -------
+        list[str]
+            list of home team names that played on the specified date
+            
+    """
+    from selenium.webdriver.common.by import By
+    
+    source = driver.find_elements(By.CLASS_NAME, 'game_summaries')
     
     if len(source) == 1:
         print(f'On {games_date}, there are no games in the NBA.')
         return []
     
     else:    
-        num_games = len(source[1].text.split('\n')) / 8
+        lines = source[1].text.split('\n')
+        num_games = len(lines) / 8
         print(f'On {games_date} there are {int(num_games)} games in the NBA.')
         home_team_list = []
         position = 4
         for i in range(0, int(num_games)):
-            home_team_list.append(source[1].text.split('\n')[position].split('  ')[0])
+            home_team_list.append(lines[position].split('  ')[0])
             position += 8
 
         return home_team_list
     
-def get_team_data(home_team, date_played, driver, config = team_config):
+def load_game_page(driver, home_team_abrv, modified_date, config = None):
+    
+    """Helper function used to navigate the driver to a game's box score page
+    
+    Parameters
+    ----------
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver
+            
+        home_team_abrv: str
+            abbreviation of the home team that played (i.e. BOS)
+            
+        modified_date: str
+            date string without the hypens (i.e. 20190321)
+        
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+        
+    Returns
+    -------
+        str, str
+            full name and abbreviation of the away team
+    """
+    
+    game_dir = boxscore_url(modified_date, home_team_abrv)
+    driver.get(game_dir)
+    
+    date_played = f'{modified_date[0:4]}-{modified_date[4:6]}-{modified_date[6:8]}'
+    return read_away_team(driver, config, date_played)
+
+def read_away_team(driver, config = None, date_played = None):
+    
+    """Helper function used to read the away team from the title of an already loaded game page
+    
+    Parameters
+    ----------
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver, already navigated to the game's box score page
+        
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+        
+        date_played: str
+            optional, date the game is played (i.e. 2019-03-21), the abbreviation of a name used by 
+            two teams (i.e. Charlotte Hornets) depends on it
+        
+    Returns
+    -------
+        str, str
+            full name and abbreviation of the away team
+    """
+    
+    #Grabs the Away Team from the Title
+    away_team = driver.title.split(' at')[0]
+    away_team_abrv = team_abbreviation(away_team, date_played, config)
+    
+    return away_team, away_team_abrv
+
+def get_team_data(home_team, date_played, driver, config = None):
     
     """Helper function used to scrape team data for both home and away team no a particular date
     
@@ -313,7 +578,7 @@ def get_team_data(home_team, date_played, driver, config = team_config):
             Selenium webdriver
         
         config: dict
-            yaml file containing abbreviation mappings of NBA teams (i.e. Boston Celtics abbreviated is BOS)
+            optional, mappings of full team names to abbreviations used instead of the team registry
         
     Returns
     -------
@@ -321,27 +586,11 @@ def get_team_data(home_team, date_played, driver, config = team_config):
             df of the team stats for the home and away team on the specified date
     """
     
-    #Converts team name to abbreviations 
-    home_team_abrv = config[home_team]
-    modified_date = date_played.replace('-', '')
-    
-    game_dir = 'https://www.basketball-reference.com/boxscores/' + modified_date + '0' + home_team_abrv + '.html'
-    driver.get(game_dir)
-    
-    #Grabs the Away Team from the Title
-    away_team = driver.title.split(' at')[0]
-    away_team_abrv = config[away_team]
-    
-    team_df = scrape_team_data(driver, 
-                               date_played = date_played, 
-                               modified_date = modified_date, 
-                               home_team_name = home_team, 
-                               away_team_name = away_team, 
-                               home_team_abrv = home_team_abrv, 
-                               away_team_abrv = away_team_abrv)
+    _, team_df = get_game_data(home_team, date_played, driver, config, 
+                               get_player_data_ind = False, get_team_data_ind = True)
     return team_df
 
-def get_player_data(home_team, date_played, driver, config = team_config):
+def get_player_data(home_team, date_played, driver, config = None):
     
     """Helper function used to scrape player data for both home and away team no a particular date
     
@@ -357,7 +606,7 @@ def get_player_data(home_team, date_played, driver, config = team_config):
             Selenium webdriver
         
         config: dict
-            yaml file containing abbreviation mappings of NBA teams (i.e. Boston Celtics abbreviated is BOS)
+            optional, mappings of full team names to abbreviations used instead of the team registry
         
     Returns
     -------
@@ -365,33 +614,233 @@ def get_player_data(home_team, date_played, driver, config = team_config):
             df of the player stats for the home and away team on the specified date
     """
     
+    player_df, _ = get_game_data(home_team, date_played, driver, config, 
+                                 get_player_data_ind = True, get_team_data_ind = False)
+    return player_df
+
+def get_game_rows(home_team, date_played, driver, config = None, 
+                  get_player_data_ind = True, get_team_data_ind = True):
+    
+    """Helper function used to scrape the player and team rows of a game with a single page load
+    
+    The box score page is loaded once and the text of each box score element is read from the 
+    driver once, both the player and team stats are then built from that text. Rows are returned 
+    as plain lists so they can be collected over many games and turned into a df once. 
+    
+    Parameters
+    ----------
+        home_team: str
+            full name of the home team that played (i.e. Boston Celtics)
+    
+        date_played: str
+            date the game is played, this will be added to the 'Date' column (i.e. 2019-03-21)
+        
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver
+        
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+            
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+            
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        
+    Returns
+    -------
+        (list[str], list[list]), (list[str], list[list])
+            columns and rows of the player stats and columns and rows of the team stats for the game, 
+            None is returned in place of the stats that were not requested
+    """
+    
+    driver.get(boxscore_url(date_played.replace('-', ''), team_abbreviation(home_team, date_played, config)))
+    
+    return read_game_rows(home_team, date_played, driver, config, 
+                          get_player_data_ind, get_team_data_ind)
+
+def read_game_rows(home_team, date_played, driver, config = None, 
+                   get_player_data_ind = True, get_team_data_ind = True):
+    
+    """Helper function used to read the player and team rows of a game from an already loaded game page
+    
+    Parameters
+    ----------
+        home_team: str
+            full name of the home team that played (i.e. Boston Celtics)
+    
+        date_played: str
+            date the game is played, this will be added to the 'Date' column (i.e. 2019-03-21)
+        
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver, already navigated to the game's box score page
+        
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+            
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+            
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        
+    Returns
+    -------
+        (list[str], list[list]), (list[str], list[list])
+            columns and rows of the player stats and columns and rows of the team stats for the game, 
+            None is returned in place of the stats that were not requested
+    """
+    
     #Converts team name to abbreviations 
-    home_team_abr = config[home_team]
+    home_team_abrv = team_abbreviation(home_team, date_played, config)
     modified_date = date_played.replace('-', '')
+    game_id = modified_date + home_team_abrv
     
-    game_dir = 'https://www.basketball-reference.com/boxscores/' + modified_date + '0' + home_team_abr + '.html'
-    driver.get(game_dir)
+    away_team, away_team_abrv = read_away_team(driver, config, date_played)
     
-    #Grabs the Away Team from the Title
-    away_team = driver.title.split(' at')[0]
-    away_team_abr = config[away_team]
-    
-    home_team_df = scrape_player_data(driver, 
-                                      date_played, 
-                                      modified_date, 
-                                      team_name = home_team, 
-                                      home_team_abrv = home_team_abr,
-                                      team_abrv = home_team_abr, 
-                                      home_or_away = 'H')
-    
-    away_team_df = scrape_player_data(driver, 
-                                      date_played, 
-                                      modified_date, 
-                                      team_name = away_team, 
-                                      home_team_abrv = home_team_abr,
-                                      team_abrv = away_team_abr, 
-                                      home_or_away = 'R')
-    
-    player_df = pd.concat([home_team_df, away_team_df])
-    
-    return player_df
\ No newline at end of file
+    ht_header, ht_starters, ht_reserves, ht_totals = split_box_score_text(read_box_score_text(driver, home_team_abrv))
+    rt_header, rt_starters, rt_reserves, rt_totals = split_box_score_text(read_box_score_text(driver, away_team_abrv))
+    
+    player_data = None
+    team_data = None
+    
+    if get_player_data_ind:
+        df_cols, ht_rows = build_player_rows(ht_header, ht_starters, ht_reserves, 
+                                             game_id, date_played, home_team, 'H')
+        _, rt_rows = build_player_rows(rt_header, rt_starters, rt_reserves, 
+                                       game_id, date_played, away_team, 'R')
+        player_data = (df_cols, ht_rows + rt_rows)
+        
+    if get_team_data_ind:
+        away_score, home_score = split_line_score_text(read_element_text(driver, 'line_score'))
+        team_data = build_team_rows(ht_header, ht_totals[1:], rt_totals[1:], 
+                                    home_score, away_score, game_id, date_played, 
+                                    home_team, away_team)
+    
+    return player_data, team_data
+
+def get_game_data(home_team, date_played, driver, config = None, 
+                  get_player_data_ind = True, get_team_data_ind = True):
+    
+    """Helper function used to scrape player and team data for a game with a single page load
+    
+    Parameters
+    ----------
+        home_team: str
+            full name of the home team that played (i.e. Boston Celtics)
+    
+        date_played: str
+            date the game is played, this will be added to the 'Date' column (i.e. 2019-03-21)
+        
+        driver: selenium.webdriver.chrome.webdriver.WebDriver
+            Selenium webdriver
+        
+        config: dict
+            optional, mappings of full team names to abbreviations used instead of the team registry
+            
+        get_player_data_ind: bool
+            Indicate whether to scrape player data    
+            
+        get_team_data_ind: bool
+            Indicate whether to scrape team data
+        
+    Returns
+    -------
+        pandas.DataFrame, pandas.DataFrame
+            df of the player stats and df of the team stats for the game, 
+            None is returned in place of a df that was not requested
+    """
+    
+    player_data, team_data = get_game_rows(home_team, date_played, driver, config, 
+                                           get_player_data_ind, get_team_data_ind)
+    
+    return rows_to_frame(player_data), rows_to_frame(team_data)
+
+
+def rows_to_frame(data):
+    
+    """Helper function used to turn the columns and rows of scraped stats into a df
+    
+    Parameters
+    ----------
+        data: (list[str], list[list])
+            columns and rows of the stats, can be None
+            
+    Returns
+    -------
+        pandas.DataFrame
+            df of the stats, None if data is None
+    """
+    if data is None:
+        return None
+    
+    #pandas is only loaded once a df is built, the parsers and team mappings don't need it
+    import pandas as pd
+    
+    df_cols, rows = data
+    return pd.DataFrame(rows, columns = df_cols)
+
+
+class RowBuffer:
+    
+    """Buffer collecting scraped rows over many games
+    
+    Rows are kept as plain lists grouped by their columns (older seasons have fewer columns, i.e. no +/-) 
+    and the df is built once when all the games are collected, instead of growing a df game by game. 
+    """
+    
+    def __init__(self):
+        
+        self.rows = {}
+        
+    def extend(self, data):
+        """Adds the columns and rows of a game, data can be None"""
+        if data is not None:
+            df_cols, rows = data
+            self.rows.setdefault(tuple(df_cols), []).extend(rows)
+        
+    def __len__(self):
+        return sum(len(rows) for rows in self.rows.values())
+    
+    def to_frame(self):
+        """Builds a single df out of every collected row, with its Team and Game-ID columns as categoricals"""
+        import pandas as pd
+        from .schema import compact_ids
+        
+        frames = [pd.DataFrame(rows, columns = list(df_cols)) for df_cols, rows in self.rows.items()]
+        
+        if len(frames) == 0:
+            return pd.DataFrame()
+        elif len(frames) == 1:
+            return compact_ids(frames[0])
+        
+        return compact_ids(pd.concat(frames, ignore_index = True, sort = False))
+
+
+class GameRecord(NamedTuple):
+    
+    """Scraped stats of one game
+    
+    player_data and team_data are the columns and rows of the player and team stats, None if they 
+    were not requested. datasets holds the columns and rows of the other datasets that were requested 
+    (i.e. advanced), by name.
+    """
+    
+    game_id: str
+    date: str
+    home_team: str
+    player_data: Optional[Tuple[List[str], List[list]]]
+    team_data: Optional[Tuple[List[str], List[list]]]
+    datasets: Optional[Dict[str, Optional[Tuple[List[str], List[list]]]]] = None
+    
+    def player_df(self):
+        """Returns the player stats as a df, None if they were not requested"""
+        return rows_to_frame(self.player_data)
+    
+    def team_df(self):
+        """Returns the team stats as a df, None if they were not requested"""
+        return rows_to_frame(self.team_data)
+    
+    def dataset_df(self, name):
+        """Returns one of the other datasets as a df, None if it was not requested or the game has no table for it"""
+        return rows_to_frame((self.datasets or {}).get(name))
@@ -0,0 +1,71 @@
+"""Benchmark of computing the advanced metrics of a decade of games
+
+A synthetic season is scraped from fixture pages and repeated over ten seasons (Game-IDs and dates
+shifted by a year each time). The vectorized metrics of advanced_stats run over the whole decade, and
+a row by row version of the team metrics runs over one season for comparison.
+
+Usage:
+    python benchmarks/bench_advanced_stats.py [--seasons 10] [--games 1230]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from bench_season_assembly import assemble_row_buffer, parse_season
+
+from NBA_data_scraper.advanced_stats import add_player_advanced_stats, add_team_advanced_stats
+from NBA_data_scraper.schema import apply_schema
+
+
+def repeat_seasons(df, num_seasons):
+    frames = []
+    for season in range(num_seasons):
+        shifted = df.copy()
+        shifted['Game-ID'] = (shifted['Game-ID'].str[0:4].astype(int) - season).astype(str) + shifted['Game-ID'].str[4:]
+        shifted['Date'] = (shifted['Date'].str[0:4].astype(int) - season).astype(str) + shifted['Date'].str[4:]
+        frames.append(shifted)
+    return pd.concat(frames, ignore_index = True)
+
+
+def team_metrics_by_row(team_df):
+    #How the metrics were computed before, one team row and a lookup of its opponent at a time
+    team_df = apply_schema(team_df)
+    rows = {}
+    for index, row in team_df.iterrows():
+        opp = team_df[(team_df['Game-ID'] == row['Game-ID']) & (team_df.index != index)].iloc[0]
+        team_poss = row['FGA'] + 0.4 * row['FTA'] - 1.07 * (row['ORB'] / (row['ORB'] + opp['DRB'])) * (row['FGA'] - row['FG']) + row['TOV']
+        opp_poss = opp['FGA'] + 0.4 * opp['FTA'] - 1.07 * (opp['ORB'] / (opp['ORB'] + row['DRB'])) * (opp['FGA'] - opp['FG']) + opp['TOV']
+        poss = 0.5 * (team_poss + opp_poss)
+        rows[index] = {'Poss': poss, 'ORtg': 100 * row['PTS'] / poss, 'DRtg': 100 * opp['PTS'] / poss,
+                       'eFG%': (row['FG'] + 0.5 * row['3P']) / row['FGA'],
+                       'TS%': row['PTS'] / (2 * (row['FGA'] + 0.44 * row['FTA'])),
+                       'Pace': 48 * poss / (row['MP'] / 60 / 5)}
+    return pd.DataFrame.from_dict(rows, orient = 'index')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--seasons', type = int, default = 10)
+    parser.add_argument('--games', type = int, default = 1230)
+    args = parser.parse_args()
+
+    player_df, team_df = assemble_row_buffer(parse_season(args.games))
+    decade_player_df = repeat_seasons(player_df, args.seasons)
+    decade_team_df = repeat_seasons(team_df, args.seasons)
+    print(f'{args.seasons} seasons: {len(decade_team_df)} team rows, {len(decade_player_df)} player rows')
+
+    start = time.perf_counter()
+    team_metrics = add_team_advanced_stats(decade_team_df)
+    print(f'team metrics, vectorized      {time.perf_counter() - start:7.2f} s')
+
+    start = time.perf_counter()
+    add_player_advanced_stats(decade_player_df, decade_team_df)
+    print(f'player metrics, vectorized    {time.perf_counter() - start:7.2f} s')
+
+    start = time.perf_counter()
+    by_row = team_metrics_by_row(team_df)
+    print(f'team metrics, row by row      {time.perf_counter() - start:7.2f} s  (one season)')
+
+    pd.testing.assert_frame_equal(team_metrics.loc[by_row.index, by_row.columns].astype(float), by_row.astype(float))
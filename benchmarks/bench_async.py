@@ -0,0 +1,62 @@
+"""Benchmark of the asyncio engine against the threaded workers on a high latency site
+
+Scrapes a range of the synthetic season from the local stand-in server with the blocking workers and
+with aget_player_team_data at a few concurrency limits, and checks that every run returns the same rows.
+The stand-in server renders pages in the same process, keep the latency high so the runs measure
+waiting on the network rather than the CPU.
+
+Usage:
+    python benchmarks/bench_async.py [--workers 8] [--concurrency 8 32 64] [--latency-ms 500] [--days 15]
+"""
+
+import argparse
+import asyncio
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+
+from fixtures import make_season
+from server import serve
+
+from NBA_data_scraper import NBA_scraper
+
+
+def report(name, elapsed, team_df):
+    num_games = len(team_df) // 2
+    print(f'{name:<22} {elapsed:7.2f} s  {num_games / elapsed * 60:8.1f} games/min')
+
+
+def run(workers, concurrencies, latency, days):
+    game_ids = make_season()
+    server, base_url = serve(game_ids, latency = latency)
+    start_date = datetime.strptime(game_ids[0][0:8], '%Y%m%d').date()
+    end_date = start_date + timedelta(days = days - 1)
+
+    scraper = NBA_scraper(backend = 'http', base_url = base_url, n_workers = workers, max_workers = workers,
+                          requests_per_minute = None)
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        baseline = scraper.get_player_team_data(str(start_date), str(end_date))
+    report(f'{workers} threaded workers', time.perf_counter() - start, baseline[1])
+
+    for concurrency in concurrencies:
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            player_df, team_df = asyncio.run(scraper.aget_player_team_data(str(start_date), str(end_date),
+                                                                           concurrency = concurrency))
+        report(f'async, {concurrency} in flight', time.perf_counter() - start, team_df)
+        assert player_df.equals(baseline[0]) and team_df.equals(baseline[1])
+
+    scraper.quit()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--workers', type = int, default = 8)
+    parser.add_argument('--concurrency', type = int, nargs = '+', default = [8, 32, 64])
+    parser.add_argument('--latency-ms', type = float, default = 500.0)
+    parser.add_argument('--days', type = int, default = 15)
+    args = parser.parse_args()
+    run(args.workers, args.concurrency, args.latency_ms / 1000, args.days)
@@ -0,0 +1,89 @@
+"""Benchmark counting the WebDriver calls made to scrape a game
+
+Each WebDriver call is a round trip to chromedriver, so the benchmark replaces the driver with one
+that serves synthetic box score text, counts every call and sleeps a fixed latency per call.
+
+Usage:
+    python benchmarks/bench_driver_calls.py [--games 20] [--latency-ms 5]
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from fixtures import abbreviation_team, make_game, game_title, render_box_score_text, render_line_score_text
+
+from NBA_data_scraper.util_helpers import get_game_data
+
+
+class CountingElement:
+
+    def __init__(self, driver, text):
+        self._driver = driver
+        self._text = text
+
+    @property
+    def text(self):
+        self._driver.call('text')
+        return self._text
+
+
+class CountingDriver:
+
+    """Stand-in for the selenium webdriver serving the text of a single synthetic game"""
+
+    def __init__(self, game, latency):
+        self.calls = Counter()
+        self.latency = latency
+        self.game = game
+        self.elements = {
+            'all_box-' + game['Home']['Abbreviation'] + '-game-basic': render_box_score_text(game['Home']),
+            'all_box-' + game['Away']['Abbreviation'] + '-game-basic': render_box_score_text(game['Away']),
+            'line_score': render_line_score_text(game),
+        }
+
+    def call(self, name):
+        self.calls[name] += 1
+        time.sleep(self.latency)
+
+    def get(self, url):
+        self.call('get')
+
+    @property
+    def title(self):
+        self.call('title')
+        return game_title(self.game)
+
+    def find_element(self, by, value):
+        #Only the selenium 4 locator API, the find_element_by_* methods were removed in selenium 4.3
+        self.call('find_element')
+        if by != 'id':
+            raise ValueError(f'Unexpected locator {by}')
+        return CountingElement(self, self.elements[value])
+
+
+def run(num_games, latency):
+    games = [make_game('201903%02d%s' % (1 + i % 28, abrv))
+             for i, abrv in enumerate(['BOS', 'LAL', 'MIA', 'DEN', 'TOR'] * (num_games // 5 + 1))][0:num_games]
+
+    calls = Counter()
+    start = time.perf_counter()
+    for game in games:
+        driver = CountingDriver(game, latency)
+        get_game_data(home_team = abbreviation_team[game['Home']['Abbreviation']], date_played = str(game['Date']), driver = driver)
+        calls += driver.calls
+    elapsed = time.perf_counter() - start
+
+    print(f'games: {num_games}, simulated latency per driver call: {latency * 1000:.1f} ms')
+    for name, count in sorted(calls.items()):
+        print(f'  {name:<20} {count / num_games:8.1f} per game')
+    print(f'  {"total":<20} {sum(calls.values()) / num_games:8.1f} per game')
+    print(f'per game latency: {elapsed / num_games * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--games', type = int, default = 20)
+    parser.add_argument('--latency-ms', type = float, default = 5.0)
+    args = parser.parse_args()
+    run(args.games, args.latency_ms / 1000)
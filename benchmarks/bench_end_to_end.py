@@ -0,0 +1,168 @@
+"""End-to-end benchmark of get_player_team_data against the local stand-in server
+
+Scenarios scrape a single day, a month and a full season. The day is the recorded day shipped in
+benchmarks/pages (overtimes, players who did not play and players without a +/-) and its rows are
+checked against pages/expected.json, the month and the season are synthetic pages generated by the
+server. Each scenario runs in its own process so its peak memory is its own. Throughput, per-game
+latency, peak memory, the scrape counters and the machine they ran on are saved as json
+(results/local/<version>.json by default, which is not tracked, the committed baselines are only
+replaced on purpose with --output) and compared with the results of another version with --compare.
+
+Usage:
+    python benchmarks/bench_end_to_end.py [--scenarios day month season] [--workers 4] [--latency-ms 0]
+                                          [--output results/local/0.1.0.json] [--compare results/0.1.0.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pandas as pd
+
+from fixtures import RECORDED_DATE, make_season
+from server import serve
+
+from NBA_data_scraper import NBA_scraper, __version__
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+SCENARIOS = {'day': (RECORDED_DATE, RECORDED_DATE),
+             'month': ('2019-03-01', '2019-03-31'),
+             'season': ('2018-10-16', RECORDED_DATE)}
+#Higher is better for these results, lower for every other compared result
+HIGHER_IS_BETTER = {'games_per_min'}
+
+
+def check_recorded_day(player_df, team_df):
+    #Rows read from the recorded pages must match what was recorded in them
+    with open(os.path.join(PAGES_DIR, 'expected.json')) as expected_file:
+        expected = json.load(expected_file)
+    assert sorted(team_df['Game-ID'].unique()) == sorted(expected)
+    for game_id, game in expected.items():
+        players = player_df[player_df['Game-ID'] == game_id]
+        assert len(players) == game['played'], f'{game_id}: {len(players)} player rows, {game["played"]} played'
+        assert (players['+/-'].astype(str).isin(['', 'nan'])).sum() == game['missing_plus_minus'], f'{game_id}: +/-'
+        teams = team_df[team_df['Game-ID'] == game_id]
+        overtimes = [f'OT{i}' for i in range(1, 6)]
+        played_overtimes = (teams[overtimes].astype(str).replace('nan', '') != '').all(axis = 0).sum()
+        assert played_overtimes == game['overtimes'], f'{game_id}: {played_overtimes} overtimes, {game["overtimes"]} played'
+
+
+def run_scenario(name, base_url, workers):
+    start_date, end_date = SCENARIOS[name]
+    scraper = NBA_scraper(backend = 'http', base_url = base_url, n_workers = workers, max_workers = workers,
+                          requests_per_minute = None)
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        player_df, team_df = scraper.get_player_team_data(start_date, end_date)
+    elapsed = time.perf_counter() - start
+    scraper.quit()
+
+    if name == 'day':
+        check_recorded_day(player_df, team_df)
+
+    metrics = scraper.metrics.to_dict()
+    game = metrics['stages']['game']
+    num_games = len(team_df) // 2
+    return {'games': num_games,
+            'player_rows': len(player_df),
+            'seconds': elapsed,
+            'games_per_min': num_games / elapsed * 60,
+            'game_latency_mean_ms': game['mean'] * 1000,
+            'game_latency_p95_ms': game['p95'] * 1000,
+            'game_latency_max_ms': game['max'] * 1000,
+            'parse_mean_ms': metrics['stages']['parse']['mean'] * 1000,
+            #ru_maxrss is in KiB on Linux
+            'peak_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'counters': metrics['counters']}
+
+
+def machine_info():
+    #Results are only comparable between runs on similar machines
+    cpu_model = platform.processor() or None
+    memory_gib = None
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            cpu_model = next((line.split(':', 1)[1].strip() for line in cpuinfo if line.startswith('model name')), cpu_model)
+        with open('/proc/meminfo') as meminfo:
+            memory_gib = next(int(line.split()[1]) / 2**20 for line in meminfo if line.startswith('MemTotal'))
+    except (OSError, StopIteration):
+        pass
+    return {'platform': platform.platform(),
+            'arch': platform.machine(),
+            'cpu_model': cpu_model,
+            'cpus': os.cpu_count(),
+            'memory_gib': round(memory_gib, 1) if memory_gib else None}
+
+
+def compare(results, previous):
+    print(f'\ncompared with {previous["version"]}:')
+    machine, previous_machine = results['machine'], previous.get('machine', {})
+    if any(machine[key] != previous_machine.get(key) for key in ['cpu_model', 'cpus']):
+        print(f'(recorded on {previous_machine.get("cpus", previous.get("cpus"))} cpus of {previous_machine.get("cpu_model")}, '
+              f'this run on {machine["cpus"]} cpus of {machine["cpu_model"]})')
+    for name, result in results['scenarios'].items():
+        before = previous['scenarios'].get(name)
+        if before is None:
+            continue
+        changes = []
+        for key in ['games_per_min', 'game_latency_mean_ms', 'peak_rss_mib']:
+            change = (result[key] - before[key]) / before[key] * 100
+            worse = change < 0 if key in HIGHER_IS_BETTER else change > 0
+            changes.append(f'{key} {change:+6.1f}%{" (worse)" if worse and abs(change) > 10 else ""}')
+        print(f'{name:<8} ' + '  '.join(changes))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--scenarios', nargs = '+', choices = list(SCENARIOS), default = list(SCENARIOS))
+    parser.add_argument('--workers', type = int, default = 4)
+    parser.add_argument('--latency-ms', type = float, default = 0.0)
+    parser.add_argument('--output', default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'local', f'{__version__}.json'))
+    parser.add_argument('--compare', default = None)
+    #Used by the benchmark to run a scenario in a process of its own
+    parser.add_argument('--run-one', default = None, help = argparse.SUPPRESS)
+    parser.add_argument('--base-url', default = None, help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_scenario(args.run_one, args.base_url, args.workers)))
+        sys.exit(0)
+
+    server, base_url = serve(make_season(), latency = args.latency_ms / 1000, pages_dir = PAGES_DIR)
+    results = {'version': __version__,
+               'python': platform.python_version(),
+               'pandas': pd.__version__,
+               'cpus': os.cpu_count(),
+               'machine': machine_info(),
+               'workers': args.workers,
+               'latency_ms': args.latency_ms,
+               'scenarios': {}}
+    try:
+        for name in args.scenarios:
+            child = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-one', name, '--base-url', base_url,
+                                    '--workers', str(args.workers)], capture_output = True, text = True)
+            if child.returncode != 0:
+                raise RuntimeError(f'Scenario {name} failed:\n{child.stderr}')
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            results['scenarios'][name] = result
+            print(f'{name:<8} {result["games"]:>5} games  {result["seconds"]:7.2f} s  {result["games_per_min"]:8.1f} games/min  '
+                  f'game {result["game_latency_mean_ms"]:6.1f} ms mean {result["game_latency_p95_ms"]:6.0f} ms p95  '
+                  f'peak RSS {result["peak_rss_mib"]:6.1f} MiB')
+    finally:
+        server.shutdown()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok = True)
+    with open(args.output, 'w') as output_file:
+        json.dump(results, output_file, indent = 2)
+    print(f'results saved to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as previous_file:
+            compare(results, json.load(previous_file))
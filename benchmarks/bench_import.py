@@ -0,0 +1,49 @@
+"""Benchmark of the import time of the package and of the modules used without scraping
+
+Each import runs in a fresh interpreter, so nothing is already loaded, and is repeated to keep the
+median. The heavy dependencies it loaded are listed, importing the package itself must load none.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['pandas', 'numpy', 'selenium', 'requests', 'lxml', 'yaml', 'pyarrow', 'aiohttp']
+IMPORTS = ['import NBA_data_scraper',
+           'from NBA_data_scraper.util_helpers import team_config',
+           'from NBA_data_scraper.parsers import parse_game_rows',
+           'from NBA_data_scraper import NBA_scraper']
+
+CHILD = '''
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [module for module in {heavy} if module in sys.modules]]))
+'''
+
+
+def time_import(statement):
+    child = subprocess.run([sys.executable, '-c', CHILD.format(statement = statement, heavy = HEAVY_MODULES)],
+                           cwd = ROOT, capture_output = True, text = True, check = True)
+    return json.loads(child.stdout)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--repeat', type = int, default = 5)
+    args = parser.parse_args()
+
+    for statement in IMPORTS:
+        runs = [time_import(statement) for _ in range(args.repeat)]
+        loaded = runs[0][1]
+        print(f'{statement:<56} {statistics.median(run[0] for run in runs) * 1000:8.1f} ms  loads {", ".join(loaded) or "nothing heavy"}')
+        if statement == 'import NBA_data_scraper':
+            assert loaded == [], f'import NBA_data_scraper loads {loaded}'
@@ -0,0 +1,63 @@
+"""Benchmark of re-parsing a cached range of games with parsing on the workers or on a process pool
+
+The range is scraped once from the local stand-in server to fill a page cache, then scraped again
+offline from the cache with parse_workers processes parsing the pages, checking that every run returns
+the same rows. Parsing is CPU-bound so the process pool only helps with as many cores as processes.
+
+Usage:
+    python benchmarks/bench_parse.py [--parse-workers 0 1 2 4] [--days 30]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+
+from fixtures import make_season
+from server import serve
+
+from NBA_data_scraper import NBA_scraper
+
+
+def run(parse_workers, days):
+    game_ids = make_season()
+    server, base_url = serve(game_ids)
+    start_date = datetime.strptime(game_ids[0][0:8], '%Y%m%d').date()
+    end_date = start_date + timedelta(days = days - 1)
+    cache_dir = tempfile.mkdtemp()
+
+    try:
+        def scrape(workers):
+            scraper = NBA_scraper(backend = 'http', base_url = base_url, n_workers = 4, requests_per_minute = None,
+                                  cache_dir = cache_dir, parse_workers = workers)
+            start = time.perf_counter()
+            with redirect_stdout(StringIO()):
+                data = scraper.get_player_team_data(str(start_date), str(end_date))
+            elapsed = time.perf_counter() - start
+            scraper.quit()
+            return data, elapsed
+
+        baseline, elapsed = scrape(0)
+        print(f'{len(baseline[1]) // 2} games cached in {elapsed:.2f} s, {os.cpu_count()} cores')
+
+        served = server.requests_served
+        for workers in parse_workers:
+            (player_df, team_df), elapsed = scrape(workers)
+            print(f'{workers:>3} parse processes  {elapsed:7.2f} s  {len(team_df) // 2 / elapsed * 60:8.1f} games/min')
+            assert player_df.equals(baseline[0]) and team_df.equals(baseline[1])
+        assert server.requests_served == served
+    finally:
+        shutil.rmtree(cache_dir)
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--parse-workers', type = int, nargs = '+', default = [0, 1, 2, 4])
+    parser.add_argument('--days', type = int, default = 30)
+    args = parser.parse_args()
+    run(args.parse_workers, args.days)
@@ -0,0 +1,72 @@
+"""Benchmark of looking up rows of a multi-season player dataset with and without the DatasetIndex
+
+A synthetic season is scraped from fixture pages and repeated over several seasons into a single csv,
+as get_player_team_data writes it. Each lookup is answered by reading and filtering the whole csv and by
+the index, which reads only the byte ranges of the matching rows, checking both return the same rows.
+
+Usage:
+    python benchmarks/bench_query.py [--seasons 10] [--games 1230]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from bench_advanced_stats import repeat_seasons
+from bench_season_assembly import assemble_row_buffer, parse_season
+
+from NBA_data_scraper.query import DatasetIndex
+from NBA_data_scraper.schema import apply_schema
+
+
+def timed(load):
+    start = time.perf_counter()
+    result = load()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--seasons', type = int, default = 10)
+    parser.add_argument('--games', type = int, default = 1230)
+    args = parser.parse_args()
+
+    player_df = repeat_seasons(assemble_row_buffer(parse_season(args.games))[0], args.seasons)
+    work_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(work_dir, 'player.csv')
+        player_df.to_csv(csv_path, index = False)
+        print(f'{len(player_df)} player rows, csv {os.path.getsize(csv_path) / 2**20:.1f} MiB')
+
+        index, elapsed = timed(lambda: DatasetIndex(csv_path))
+        print(f'index built             {elapsed * 1000:8.1f} ms')
+        index, elapsed = timed(lambda: DatasetIndex(csv_path))
+        print(f'index opened            {elapsed * 1000:8.1f} ms')
+
+        def read_full():
+            return apply_schema(pd.read_csv(csv_path, dtype = str, keep_default_na = False))
+
+        player, team, game_id = player_df['Player Name'].iloc[0], player_df['Team'].iloc[0], player_df['Game-ID'].iloc[-1]
+        season = int(player_df['Date'].iloc[0][0:4]) + 1
+        lookups = [
+            ('player, last 10 games', lambda: index.last_games(player = player, n = 10),
+             lambda df: df[df['Game-ID'].isin(df[df['Player Name'] == player].sort_values('Date')['Game-ID'].unique()[-10:])
+                           & (df['Player Name'] == player)].sort_values('Date', kind = 'stable')),
+            ('team, one season', lambda: index.query(team = team, season = season),
+             lambda df: df[(df['Team'] == team) & (df['Date'] >= f'{season - 1}-08-01') & (df['Date'] <= f'{season}-07-31')]),
+            ('one game', lambda: index.query(game_id = game_id), lambda df: df[df['Game-ID'] == game_id]),
+            ('one week', lambda: index.query(start_date = f'{season - 1}-12-01', end_date = f'{season - 1}-12-07'),
+             lambda df: df[(df['Date'] >= f'{season - 1}-12-01') & (df['Date'] <= f'{season - 1}-12-07')]),
+        ]
+        for name, indexed, filtered in lookups:
+            expected, full_elapsed = timed(lambda: filtered(read_full()))
+            result, elapsed = timed(indexed)
+            print(f'{name:<22}  full read {full_elapsed * 1000:8.1f} ms   index {elapsed * 1000:6.1f} ms  ({len(result)} rows)')
+            #Game-ID categories are the games read, not every game of the dataset
+            pd.testing.assert_frame_equal(result, expected.reset_index(drop = True), check_dtype = False, check_categorical = False)
+    finally:
+        shutil.rmtree(work_dir)
@@ -0,0 +1,57 @@
+"""Benchmark of the page loads needed to list the games of a backfill with and without the season schedule
+
+Scrapes a year of the synthetic season (off-season included) from the local stand-in server, once
+loading the scoreboard of every date and once reading the games from the season schedule, and checks
+that both runs return the same rows. Time at the default budget of 20 requests per minute is projected
+from the page loads.
+
+Usage:
+    python benchmarks/bench_schedule.py [--start 2018-08-01] [--end 2019-07-31] [--games 1230]
+"""
+
+import argparse
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from fixtures import make_season
+from server import serve
+
+from NBA_data_scraper import NBA_scraper
+
+
+def run(start_date, end_date, num_games):
+    server, base_url = serve(make_season(num_games = num_games))
+
+    baseline = None
+    for use_schedule in (False, True):
+        scraper = NBA_scraper(backend = 'http', base_url = base_url, n_workers = 8, requests_per_minute = None,
+                              use_schedule = use_schedule)
+        served = server.requests_served
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            player_df, team_df = scraper.get_player_team_data(start_date, end_date)
+        elapsed = time.perf_counter() - start
+        scraper.quit()
+
+        page_loads = server.requests_served - served
+        listing = page_loads - len(team_df) // 2
+        name = 'schedule' if use_schedule else 'scoreboards'
+        print(f'{name:<12} {page_loads:6d} page loads ({listing:4d} to list the games)  {elapsed:6.2f} s  '
+              f'{page_loads / 20 / 60:6.1f} h at 20 requests/min')
+
+        if baseline is None:
+            baseline = (player_df, team_df)
+        else:
+            assert player_df.equals(baseline[0]) and team_df.equals(baseline[1])
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--start', default = '2018-08-01')
+    parser.add_argument('--end', default = '2019-07-31')
+    parser.add_argument('--games', type = int, default = 1230)
+    args = parser.parse_args()
+    run(args.start, args.end, args.games)
@@ -0,0 +1,114 @@
+"""Benchmark of assembling a full season of scraped games into dfs
+
+Compares growing the player and team dfs game by game (the DataFrame.append pattern, every append
+copies everything collected so far) with collecting plain rows in a RowBuffer and building each df once.
+Pages of a synthetic 1,230 game season are parsed up front so only the assembly is measured.
+
+Usage:
+    python benchmarks/bench_season_assembly.py [--games 1230]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import pandas as pd
+
+from fixtures import abbreviation_team, make_game, make_season, render_box_score_page
+
+from NBA_data_scraper.parsers import parse_game_rows
+from NBA_data_scraper.schema import compact_ids
+from NBA_data_scraper.util_helpers import RowBuffer, rows_to_frame
+
+
+def parse_season(num_games):
+    games = []
+    for game_id in make_season(num_games = num_games):
+        game = make_game(game_id)
+        date_played = str(game['Date'])
+        games.append(parse_game_rows(render_box_score_page(game),
+                                     abbreviation_team[game['Home']['Abbreviation']], date_played))
+    return games
+
+
+def assemble_per_game(games):
+    player_df_full = None
+    team_df_full = None
+    for player_data, team_data in games:
+        player_df = rows_to_frame(player_data)
+        team_df = rows_to_frame(team_data)
+        if player_df_full is None:
+            player_df_full, team_df_full = player_df, team_df
+        else:
+            player_df_full = pd.concat([player_df_full, player_df], ignore_index = True)
+            team_df_full = pd.concat([team_df_full, team_df], ignore_index = True)
+    #Same compact Team and Game-ID columns as RowBuffer.to_frame
+    return compact_ids(player_df_full), compact_ids(team_df_full)
+
+
+def assemble_row_buffer(games):
+    player_buffer = RowBuffer()
+    team_buffer = RowBuffer()
+    for player_data, team_data in games:
+        player_buffer.extend(player_data)
+        team_buffer.extend(team_data)
+    return player_buffer.to_frame(), team_buffer.to_frame()
+
+
+def current_rss():
+    #Resident memory in bytes (Linux), pandas buffers are not all visible to tracemalloc
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+class PeakRSS(threading.Thread):
+
+    """Samples the resident memory of the process until stopped and keeps the peak"""
+
+    def __init__(self, interval = 0.002):
+        super().__init__(daemon = True)
+        self.interval = interval
+        self.baseline = current_rss()
+        self.peak = self.baseline
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.peak = max(self.peak, current_rss())
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, current_rss())
+        return self.peak - self.baseline
+
+
+def measure(name, assemble, games):
+    sampler = PeakRSS()
+    sampler.start()
+    start = time.perf_counter()
+    player_df, team_df = assemble(games)
+    elapsed = time.perf_counter() - start
+    peak = sampler.stop()
+    size = player_df.memory_usage(deep = True).sum() + team_df.memory_usage(deep = True).sum()
+    print(f'{name:<12} {elapsed:8.3f} s  peak RSS growth {peak / 2**20:7.1f} MiB  '
+          f'result {size / 2**20:6.1f} MiB  ({len(player_df)} player rows, {len(team_df)} team rows)')
+    return player_df, team_df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--games', type = int, default = 1230)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    games = parse_season(args.games)
+    print(f'parsed {args.games} fixture pages in {time.perf_counter() - start:.2f} s')
+
+    #The row buffer runs first so its peak is not hidden by memory the per game run freed
+    row_buffer = measure('row buffer', assemble_row_buffer, games)
+    per_game = measure('per game', assemble_per_game, games)
+
+    assert per_game[0].equals(row_buffer[0]) and per_game[1].equals(row_buffer[1])
@@ -0,0 +1,83 @@
+"""Benchmark of loading a few columns of the player dataset over several seasons from csv and Parquet
+
+Synthetic seasons are scraped from fixture pages and written both as a csv (as the scraper writes it)
+and as a Parquet dataset partitioned by season and date. Loading reads the columns a downstream job
+typically needs and types them, i.e. re-parsing the csv strings with apply_schema.
+
+Usage:
+    python benchmarks/bench_storage.py [--seasons 3] [--games 1230]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from bench_season_assembly import PeakRSS, assemble_row_buffer
+from fixtures import abbreviation_team, make_game, make_season, render_box_score_page
+
+from NBA_data_scraper.parsers import parse_game_rows
+from NBA_data_scraper.schema import apply_schema
+from NBA_data_scraper.storage import read_parquet, write_parquet
+
+COLUMNS = ['Game-ID', 'Player Name', 'MP', 'PTS', '+/-']
+
+
+def scrape_seasons(num_seasons, num_games):
+    frames = []
+    for season in range(num_seasons):
+        games = []
+        for game_id in make_season(start_date = f'{2018 - season}-10-16', num_games = num_games):
+            game = make_game(game_id)
+            games.append(parse_game_rows(render_box_score_page(game),
+                                         abbreviation_team[game['Home']['Abbreviation']], str(game['Date'])))
+        frames.append(assemble_row_buffer(games)[0])
+    return pd.concat(frames, ignore_index = True)
+
+
+def measure(name, load):
+    sampler = PeakRSS()
+    sampler.start()
+    start = time.perf_counter()
+    df = load()
+    elapsed = time.perf_counter() - start
+    peak = sampler.stop()
+    print(f'{name:<22} {elapsed:8.3f} s  peak RSS growth {peak / 2**20:7.1f} MiB  ({len(df)} rows)')
+    return df
+
+
+def disk_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--seasons', type = int, default = 3)
+    parser.add_argument('--games', type = int, default = 1230)
+    args = parser.parse_args()
+
+    player_df = scrape_seasons(args.seasons, args.games)
+    work_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(work_dir, 'player.csv')
+        parquet_path = os.path.join(work_dir, 'player')
+        player_df.to_csv(csv_path, index = False)
+        write_parquet(player_df, parquet_path)
+        print(f'{len(player_df)} player rows, csv {disk_size(csv_path) / 2**20:.1f} MiB, '
+              f'parquet {disk_size(parquet_path) / 2**20:.1f} MiB')
+
+        #Parquet runs first so its peak is not hidden by memory the csv runs freed
+        parquet_df = measure('parquet, typed', lambda: read_parquet(parquet_path, columns = COLUMNS))
+        measure('parquet, one season', lambda: read_parquet(parquet_path, columns = COLUMNS, seasons = [2019]))
+        csv_df = measure('csv, typed', lambda: apply_schema(pd.read_csv(csv_path, dtype = str, keep_default_na = False)))
+        measure('csv columns, typed', lambda: apply_schema(pd.read_csv(csv_path, usecols = COLUMNS + ['Date'],
+                                                                       dtype = str, keep_default_na = False)))
+
+        assert parquet_df['PTS'].sum() == csv_df['PTS'].sum()
+    finally:
+        shutil.rmtree(work_dir)
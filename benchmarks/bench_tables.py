@@ -0,0 +1,93 @@
+"""Benchmark of scraping the advanced box scores and box scores by period along with the player and team stats
+
+Parsing: every dataset of a full box score page read in a single pass over one parsed page, against
+parsing the page again for each dataset. Scraping: get_datasets for every dataset in one run, against
+one run per dataset (a full set of page loads per dataset) from the stand-in server with some latency.
+
+Usage:
+    python benchmarks/bench_tables.py [--days 3] [--latency-ms 20] [--repeat 20]
+"""
+
+import argparse
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+
+from fixtures import make_game, make_season, render_box_score_page, render_pbp_page
+from server import serve
+
+from NBA_data_scraper import NBA_scraper
+from NBA_data_scraper.parsers import BOX_SCORE_DATASETS, parse_game_datasets
+
+GAME_ID = '20190321BOS'
+
+
+def bench_parse(repeat):
+    game = make_game(GAME_ID)
+    page = render_box_score_page(game, full = True)
+    pbp_page = render_pbp_page(game)
+    args = ('Boston Celtics', '2019-03-21')
+
+    def best(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    one_pass = parse_game_datasets(page, *args, datasets = BOX_SCORE_DATASETS)
+    per_dataset = {name: parse_game_datasets(page, *args, datasets = [name])[name] for name in BOX_SCORE_DATASETS}
+    assert one_pass == per_dataset
+
+    basic = best(lambda: parse_game_datasets(page, *args, datasets = ['player', 'team']))
+    single = best(lambda: parse_game_datasets(page, *args, datasets = BOX_SCORE_DATASETS))
+    separate = best(lambda: [parse_game_datasets(page, *args, datasets = [name]) for name in BOX_SCORE_DATASETS])
+    pbp = best(lambda: parse_game_datasets(None, *args, datasets = ['pbp'], pbp_page = pbp_page))
+
+    print(f'page of {len(page) / 1024:.0f} KiB, play-by-play page of {len(pbp_page) / 1024:.0f} KiB')
+    print(f'parse player + team               {basic * 1000:7.2f} ms')
+    print(f'parse {len(BOX_SCORE_DATASETS)} datasets in one pass       {single * 1000:7.2f} ms')
+    print(f'parse {len(BOX_SCORE_DATASETS)} datasets one by one        {separate * 1000:7.2f} ms')
+    print(f'parse play-by-play                {pbp * 1000:7.2f} ms')
+
+
+def bench_scrape(days, latency):
+    game_ids = make_season()
+    start_date = datetime.strptime(game_ids[0][0:8], '%Y%m%d').date()
+    end_date = start_date + timedelta(days = days - 1)
+
+    def scrape(runs):
+        server, base_url = serve(game_ids, latency = latency, full_pages = True)
+        try:
+            scraper = NBA_scraper(backend = 'http', base_url = base_url, n_workers = 4, requests_per_minute = None)
+            start = time.perf_counter()
+            dfs = {}
+            with redirect_stdout(StringIO()):
+                for datasets in runs:
+                    dfs.update(scraper.get_datasets(str(start_date), str(end_date), datasets = datasets))
+            return dfs, time.perf_counter() - start, server.requests_served
+        finally:
+            server.shutdown()
+
+    together, together_seconds, together_requests = scrape([BOX_SCORE_DATASETS])
+    apart, apart_seconds, apart_requests = scrape([[name] for name in BOX_SCORE_DATASETS])
+    for name in BOX_SCORE_DATASETS:
+        assert together[name].equals(apart[name]), name
+
+    num_games = together['team']['Game-ID'].nunique()
+    print(f'{num_games} games, {", ".join(f"{len(df)} {name} rows" for name, df in together.items())}')
+    print(f'one run for every dataset     {together_requests:4d} requests {together_seconds:6.2f} s')
+    print(f'one run per dataset           {apart_requests:4d} requests {apart_seconds:6.2f} s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--days', type = int, default = 3)
+    parser.add_argument('--latency-ms', type = float, default = 20.0)
+    parser.add_argument('--repeat', type = int, default = 20)
+    args = parser.parse_args()
+
+    bench_parse(args.repeat)
+    bench_scrape(args.days, args.latency_ms / 1000)
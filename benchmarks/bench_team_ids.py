@@ -0,0 +1,64 @@
+"""Benchmark of the memory of a season of scraped data and of joining player and team data by game
+
+The season is assembled from fixture pages with the Team and Game-ID columns kept as strings (as the
+scraper did before the team registry) and as categoricals, then typed with apply_schema. Player rows
+are joined to the team totals of their game on the Game-ID strings and on the integer game keys.
+
+Usage:
+    python benchmarks/bench_team_ids.py [--games 1230] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import time
+
+from bench_season_assembly import assemble_row_buffer, parse_season
+
+from NBA_data_scraper.schema import apply_schema
+from NBA_data_scraper.teams import game_keys
+
+ID_COLS = ['Game-ID', 'Date', 'Team']
+
+
+def memory(df, columns = None):
+    df = df if columns is None else df[columns]
+    return df.memory_usage(deep = True, index = False).sum() / 2**20
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--games', type = int, default = 1230)
+    parser.add_argument('--repeat', type = int, default = 5)
+    args = parser.parse_args()
+
+    player_df, team_df = assemble_row_buffer(parse_season(args.games))
+    strings = player_df.astype({'Game-ID': str, 'Team': str})
+    typed = apply_schema(player_df)
+
+    print(f'{len(player_df)} player rows        {"all columns":>12} {"Game-ID, Date, Team":>20}')
+    for name, df in [('strings', strings), ('categoricals', player_df), ('typed', typed)]:
+        print(f'{name:<24} {memory(df):9.2f} MiB {memory(df, ID_COLS):17.2f} MiB')
+
+    totals = team_df[['Game-ID', 'Team', 'PTS']]
+    string_totals = totals.astype({'Game-ID': str, 'Team': str})
+    joined, string_elapsed = best_of(args.repeat, lambda: strings[['Game-ID', 'Team']].merge(
+        string_totals, on = ['Game-ID', 'Team'], how = 'left', validate = 'many_to_one'))
+
+    #Keys are computed once per df, every following join is on integers
+    (player_keys, team_keys), key_elapsed = best_of(args.repeat, lambda: (game_keys(player_df['Game-ID']), game_keys(totals['Game-ID'])))
+    keys = player_df[['Team']].assign(**{'Game-Key': player_keys})
+    right = totals[['Team', 'PTS']].assign(**{'Game-Key': team_keys})
+    keyed, join_elapsed = best_of(args.repeat, lambda: keys.merge(right, on = ['Game-Key', 'Team'], how = 'left', validate = 'many_to_one'))
+
+    assert (joined['PTS'].to_numpy() == keyed['PTS'].to_numpy()).all()
+    print(f'join on Game-ID strings  {string_elapsed * 1000:8.1f} ms')
+    print(f'join on game keys        {join_elapsed * 1000:8.1f} ms  (keys of both dfs computed once in {key_elapsed * 1000:.1f} ms)')
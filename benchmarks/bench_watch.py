@@ -0,0 +1,81 @@
+"""Benchmark of following a day of games live, with watch and by calling get_player_team_data repeatedly
+
+The stand-in server plays a live day where games go final one by one. Calling get_player_team_data for
+the day on every poll reloads the scoreboard and the box score of every game each time, watch polls the
+scoreboard with conditional requests and loads each box score once. Requests, bytes served and the delay
+between a game going final and its rows being handed out are compared.
+
+Usage:
+    python benchmarks/bench_watch.py [--final-every 1.0] [--poll-every 0.5]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from fixtures import make_season
+from server import serve
+
+from NBA_data_scraper import NBA_scraper
+from NBA_data_scraper.storage import CSVSink, read_dataset
+
+LIVE_DATE = '2019-01-15'
+
+
+def make_scraper(base_url):
+    #The scoreboard is the only way to follow a live day, the schedule doesn't tell which games are final
+    return NBA_scraper(backend = 'http', base_url = base_url, requests_per_minute = None, use_schedule = False)
+
+
+def run_repeated(base_url, server, poll_every):
+    emitted = {}
+    num_games = len(server.games[LIVE_DATE.replace('-', '')])
+    with make_scraper(base_url) as scraper, redirect_stdout(StringIO()):
+        while len(emitted) < num_games:
+            team_df = scraper.get_player_team_data(LIVE_DATE, get_player_data_ind = False)
+            now = time.time()
+            for game_id in team_df['Game-ID'].unique() if len(team_df) else []:
+                emitted.setdefault(game_id, now)
+            time.sleep(poll_every)
+    return emitted
+
+
+def run_watch(base_url, server, poll_every, work_dir):
+    emitted = {}
+    csv_sink = CSVSink(os.path.join(work_dir, 'player.csv'), os.path.join(work_dir, 'team.csv'))
+
+    def sink(game):
+        csv_sink(game)
+        emitted[game.game_id] = time.time()
+
+    with make_scraper(base_url) as scraper, redirect_stdout(StringIO()):
+        scraper.watch(sink, LIVE_DATE, poll_every = poll_every)
+    assert len(read_dataset(os.path.join(work_dir, 'team.csv'))) == 2 * len(emitted)
+    return emitted
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--final-every', type = float, default = 1.0)
+    parser.add_argument('--poll-every', type = float, default = 0.5)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        for name, run in [('get_player_team_data', lambda base_url, server: run_repeated(base_url, server, args.poll_every)),
+                          ('watch', lambda base_url, server: run_watch(base_url, server, args.poll_every, work_dir))]:
+            server, base_url = serve(make_season(), live_date = LIVE_DATE, final_every = args.final_every)
+            try:
+                emitted = run(base_url, server)
+            finally:
+                server.shutdown()
+            delays = [emitted[game_id] - server.final_at(game_id) for game_id in emitted]
+            print(f'{name:<22} {len(emitted)} games  {server.requests_served:4d} requests ({server.not_modified_served} not modified)  '
+                  f'{server.bytes_served / 2**20:6.2f} MiB  delay after final {statistics.mean(delays):5.2f} s mean {max(delays):5.2f} s max')
+    finally:
+        shutil.rmtree(work_dir)
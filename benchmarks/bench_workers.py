@@ -0,0 +1,55 @@
+"""Benchmark of scraping throughput against the number of workers
+
+Scrapes a range of the synthetic season from the local stand-in server with a fixed latency per
+request, once per worker count, and checks that every run returns the same rows in the same order.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1 2 4 8] [--latency-ms 50] [--days 7]
+"""
+
+import argparse
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+
+from fixtures import make_season
+from server import serve
+
+from NBA_data_scraper import NBA_scraper
+
+
+def run(workers, latency, days):
+    game_ids = make_season()
+    server, base_url = serve(game_ids, latency = latency)
+    start_date = datetime.strptime(game_ids[0][0:8], '%Y%m%d').date()
+    end_date = start_date + timedelta(days = days - 1)
+
+    baseline = None
+    for n_workers in workers:
+        scraper = NBA_scraper(backend = 'http', base_url = base_url, n_workers = n_workers, max_workers = max(workers),
+                              requests_per_minute = None)
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            player_df, team_df = scraper.get_player_team_data(str(start_date), str(end_date))
+        elapsed = time.perf_counter() - start
+        scraper.quit()
+
+        num_games = len(team_df) // 2
+        print(f'{n_workers:>3} workers  {elapsed:7.2f} s  {num_games / elapsed * 60:8.1f} games/min')
+
+        if baseline is None:
+            baseline = (player_df, team_df)
+        else:
+            assert player_df.equals(baseline[0]) and team_df.equals(baseline[1])
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--workers', type = int, nargs = '+', default = [1, 2, 4, 8])
+    parser.add_argument('--latency-ms', type = float, default = 50.0)
+    parser.add_argument('--days', type = int, default = 7)
+    args = parser.parse_args()
+    run(args.workers, args.latency_ms / 1000, args.days)
@@ -0,0 +1,448 @@
+"""Synthetic Basketball Reference pages used by the benchmarks
+
+Games are generated deterministically from their Game-ID, so the same page is produced on every run
+and both the HTML served to the http backend and the element text read by the selenium backend
+describe the same game.
+"""
+
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBA_data_scraper.teams import current_teams
+
+HEADER = ['Starters', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%', 'FT', 'FTA', 'FT%',
+          'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', '+/-']
+ADVANCED_HEADER = ['Starters', 'MP', 'TS%', 'eFG%', '3PAr', 'FTr', 'ORB%', 'DRB%', 'TRB%', 'AST%',
+                   'STL%', 'BLK%', 'TOV%', 'USG%', 'ORtg', 'DRtg', 'BPM']
+
+FIRST_NAMES = ['James', 'Marcus', 'Kevin', 'Anthony', 'Chris', 'Jaylen', 'Derrick', 'Tyler',
+               'Brandon', 'Kyle', 'Jordan', 'Malik', 'Devin', 'Terry', 'Andre', 'Luka']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Miller', 'Davis', 'Wilson',
+              'Moore', 'Taylor', 'Thomas', 'Harris', 'Martin', 'Walker', 'Young', 'Allen']
+
+abbreviation_team = {team.abbreviation: team.full_name for team in current_teams()}
+full_name_city = {team.full_name: team.city for team in current_teams()}
+
+
+def _pct(made, attempted):
+    #Basketball Reference leaves the percentage empty when there are no attempts
+    if attempted == 0:
+        return ''
+    pct = '%.3f' % (made / attempted)
+    return pct[1:] if pct.startswith('0') else pct
+
+
+def _player_stats(rng, minutes, plus_minus):
+    fga = rng.randint(0, max(1, minutes // 2))
+    fg = rng.randint(0, fga)
+    tpa = rng.randint(0, fga)
+    tp = rng.randint(0, min(tpa, fg))
+    fta = rng.choice([0, 0, rng.randint(1, 10)])
+    ft = rng.randint(0, fta)
+    orb = rng.randint(0, 4)
+    drb = rng.randint(0, 10)
+    stats = {'MP': '%d:%02d' % (minutes, rng.randint(0, 59)), 'FG': fg, 'FGA': fga, 'FG%': _pct(fg, fga),
+             '3P': tp, '3PA': tpa, '3P%': _pct(tp, tpa), 'FT': ft, 'FTA': fta, 'FT%': _pct(ft, fta),
+             'ORB': orb, 'DRB': drb, 'TRB': orb + drb, 'AST': rng.randint(0, 10),
+             'STL': rng.randint(0, 3), 'BLK': rng.randint(0, 3), 'TOV': rng.randint(0, 5),
+             'PF': rng.randint(0, 6), 'PTS': 2 * (fg - tp) + 3 * tp + ft, '+/-': plus_minus}
+    return stats
+
+
+def make_team_box(rng, team_abrv, overtimes, num_dnp = None, missing_plus_minus = ()):
+    """Returns the players and team totals of a team's box score
+
+    num_dnp forces the number of players who did not play and missing_plus_minus the positions of the
+    players who played without a +/-, the random draws are made either way so other games don't change.
+    """
+    players = []
+    names = set()
+    num_played = rng.randint(9, 12)
+    drawn_dnp = rng.randint(0, 13 - num_played)
+    num_dnp = drawn_dnp if num_dnp is None else num_dnp
+    for i in range(num_played + num_dnp):
+        name = rng.choice(FIRST_NAMES) + ' ' + rng.choice(LAST_NAMES)
+        while name in names:
+            name = rng.choice(FIRST_NAMES) + ' ' + rng.choice(LAST_NAMES)
+        names.add(name)
+        if i >= num_played:
+            players.append({'Player': name, 'Reason': rng.choice(['Did Not Play', 'Not With Team'])})
+            continue
+        minutes = rng.randint(25, 40) if i < 5 else rng.randint(2, 24)
+        #Some players who played have no +/- on Basketball Reference
+        plus_minus = '' if rng.random() < 0.05 else '%+d' % rng.randint(-20, 20)
+        plus_minus = '0' if plus_minus == '+0' else plus_minus
+        plus_minus = '' if i in missing_plus_minus else plus_minus
+        player = {'Player': name}
+        player.update(_player_stats(rng, minutes, plus_minus))
+        players.append(player)
+
+    return {'Abbreviation': team_abrv, 'Players': players, 'Totals': _totals(players, 240 + 25 * overtimes)}
+
+
+def _totals(players, minutes):
+    played = [player for player in players if 'Reason' not in player]
+    totals = {col: sum(player[col] for player in played)
+              for col in ['FG', 'FGA', '3P', '3PA', 'FT', 'FTA', 'ORB', 'DRB', 'TRB',
+                          'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']}
+    totals['MP'] = str(minutes)
+    totals['FG%'] = _pct(totals['FG'], totals['FGA'])
+    totals['3P%'] = _pct(totals['3P'], totals['3PA'])
+    totals['FT%'] = _pct(totals['FT'], totals['FTA'])
+    totals['+/-'] = ''
+    return totals
+
+
+def _split_score(rng, points, periods):
+    #Splits the final score into points per period
+    cuts = sorted(rng.randint(0, points) for _ in range(periods - 1))
+    bounds = [0] + cuts + [points]
+    return [bounds[i + 1] - bounds[i] for i in range(periods)]
+
+
+def make_game(game_id, away_team_abrv = None, overtimes = None, num_dnp = None, missing_plus_minus = ()):
+    """Returns a deterministic synthetic game for a Game-ID (i.e. 20190321BOS), see make_team_box for the options"""
+    rng = random.Random(game_id)
+    date_played = datetime.strptime(game_id[0:8], '%Y%m%d').date()
+    home_team_abrv = game_id[8:]
+
+    if away_team_abrv is None:
+        away_team_abrv = rng.choice(sorted(abrv for abrv in abbreviation_team if abrv != home_team_abrv))
+    if overtimes is None:
+        overtimes = 1 if rng.random() < 0.06 else 0
+
+    home = make_team_box(rng, home_team_abrv, overtimes, num_dnp, missing_plus_minus)
+    away = make_team_box(rng, away_team_abrv, overtimes, num_dnp, missing_plus_minus)
+    periods = 4 + overtimes
+    home['Score'] = _split_score(rng, home['Totals']['PTS'], periods) + [home['Totals']['PTS']]
+    away['Score'] = _split_score(rng, away['Totals']['PTS'], periods) + [away['Totals']['PTS']]
+
+    return {'Game-ID': game_id, 'Date': date_played, 'Home': home, 'Away': away}
+
+
+def _cell(tag, value, stat = None):
+    stat = f' data-stat="{stat}"' if stat else ''
+    return f'<{tag}{stat}>{value}</{tag}>'
+
+
+def make_game_extras(game):
+    """Returns the advanced box scores, box scores by period and plays of a game, by team abbreviation and period
+
+    The extras are drawn from their own generator, so adding them doesn't change the rest of the game.
+    """
+    rng = random.Random(game['Game-ID'] + ' extras')
+    periods = ['q1', 'q2', 'h1', 'q3', 'q4', 'h2'] + ['ot%d' % (i + 1) for i in range(len(game['Home']['Score']) - 5)]
+
+    extras = {'Advanced': {}, 'Periods': {}, 'Plays': []}
+    for team in (game['Away'], game['Home']):
+        advanced = []
+        for player in team['Players']:
+            if 'Reason' in player:
+                advanced.append(player)
+                continue
+            stats = {'Player': player['Player'], 'MP': player['MP'], 'TS%': _pct(rng.randint(0, 700), 1000),
+                     'eFG%': _pct(rng.randint(0, 700), 1000), '3PAr': _pct(rng.randint(0, 600), 1000),
+                     'FTr': _pct(rng.randint(0, 400), 1000), 'ORtg': rng.randint(60, 150),
+                     'DRtg': rng.randint(90, 125), 'BPM': '%.1f' % rng.uniform(-10, 10)}
+            stats.update({col: '%.1f' % rng.uniform(0, 40) for col in ADVANCED_HEADER[6:14]})
+            advanced.append(stats)
+        extras['Advanced'][team['Abbreviation']] = advanced
+
+        extras['Periods'][team['Abbreviation']] = {}
+        for period in periods:
+            players = []
+            for player in team['Players']:
+                if 'Reason' in player:
+                    players.append(player)
+                    continue
+                minutes = int(player['MP'].split(':')[0]) // (2 if period[0] == 'h' else 4)
+                stats = {'Player': player['Player']}
+                stats.update(_player_stats(rng, minutes, '%+d' % rng.randint(-10, 10)))
+                players.append(stats)
+            extras['Periods'][team['Abbreviation']][period] = {'Players': players, 'Totals': _totals(players, 60)}
+
+    #Plays alternate between the teams, made shots move the score
+    names = {team['Abbreviation']: [player['Player'] for player in team['Players'] if 'Reason' not in player]
+             for team in (game['Away'], game['Home'])}
+    score = {'Away': 0, 'Home': 0}
+    for number in range(len(game['Home']['Score']) - 1):
+        ordinal = ['1st', '2nd', '3rd', '4th'][number] if number < 4 else ['1st', '2nd', '3rd', '4th'][number - 4]
+        period = (ordinal + ' Q') if number < 4 else (ordinal + ' OT')
+        length = 720 if number < 4 else 300
+        kind = 'quarter' if number < 4 else 'overtime'
+        plays = [('%d:00.0' % (length // 60), None, f'Start of {ordinal} {kind}', '', '')]
+        clock = length * 10
+        while clock > 150:
+            clock -= rng.randint(40, 150)
+            side = rng.choice(['Away', 'Home'])
+            name = rng.choice(names[game[side]['Abbreviation']])
+            points = rng.choice([0, 0, 2, 2, 3, 1])
+            if points:
+                score[side] += points
+                text = f'{name} makes {points}-pt shot' if points > 1 else f'{name} makes free throw 1 of 2'
+            else:
+                text = rng.choice([f'{name} misses 2-pt shot', f'Defensive rebound by {name}', f'Turnover by {name}'])
+            plays.append(('%d:%04.1f' % (clock // 600, clock % 600 / 10), side, text, '+%d' % points if points else '',
+                          '%d-%d' % (score['Away'], score['Home'])))
+        plays.append(('0:00.0', None, f'End of {ordinal} {kind}', '', ''))
+        extras['Plays'].append((period, plays))
+
+    return extras
+
+
+def _player_table(table_id, heading, over_header, header, players, totals):
+    rows = []
+    for i, player in enumerate(players):
+        if i == 5:
+            rows.append('<tr class="thead">' + ''.join(_cell('th', col) for col in ['Reserves'] + header[1:]) + '</tr>')
+        cells = _cell('th', f'<a href="/players/x/x.html">{player["Player"]}</a>', 'player')
+        if 'Reason' in player:
+            cells += f'<td class="center" data-stat="reason" colspan="{len(header) - 1}">{player["Reason"]}</td>'
+        else:
+            cells += ''.join(_cell('td', player[col]) for col in header[1:])
+        rows.append('<tr>' + cells + '</tr>')
+    footer = ''
+    if totals is not None:
+        footer = '<tfoot><tr>' + _cell('th', 'Team Totals') + ''.join(_cell('td', totals[col]) for col in header[1:]) + '</tr></tfoot>'
+
+    return (f'<div id="all_{table_id}" class="table_wrapper">'
+            f'<div class="section_heading"><h2>{heading}</h2></div>'
+            f'<div class="table_container"><table class="sortable stats_table" id="{table_id}">'
+            f'<thead><tr class="over_header"><th colspan="{len(header)}">{over_header}</th></tr>'
+            '<tr>' + ''.join(_cell('th', col) for col in header) + '</tr></thead>'
+            '<tbody>' + ''.join(rows) + '</tbody>'
+            + footer + '</table></div></div>')
+
+
+def _box_score_table(team):
+    abrv = team['Abbreviation']
+    return _player_table(f'box-{abrv}-game-basic', f'{abbreviation_team[abrv]} Basic and Advanced Stats',
+                         'Basic Box Score Stats', HEADER, team['Players'], team['Totals'])
+
+
+def _extra_tables(team, extras):
+    #Box scores by period and the advanced box score of a team, in the order of Basketball Reference
+    abrv = team['Abbreviation']
+    tables = ''
+    for period, box in extras['Periods'][abrv].items():
+        tables += _player_table(f'box-{abrv}-{period}-basic', f'{abbreviation_team[abrv]} Basic Stats ({period.upper()})',
+                                'Basic Box Score Stats', HEADER, box['Players'], box['Totals'])
+    advanced_totals = {col: '' for col in ADVANCED_HEADER}
+    advanced_totals['MP'] = team['Totals']['MP']
+    return tables + _player_table(f'box-{abrv}-game-advanced', f'{abbreviation_team[abrv]} Advanced Stats',
+                                  'Advanced Box Score Stats', ADVANCED_HEADER, extras['Advanced'][abrv], advanced_totals)
+
+
+def _line_score_table(game):
+    periods = len(game['Home']['Score']) - 1
+    labels = [str(i + 1) for i in range(4)] + ['%dOT' % (i + 1) for i in range(periods - 4)] + ['T']
+    rows = ''
+    for team in (game['Away'], game['Home']):
+        rows += ('<tr>' + _cell('th', f'<a href="/teams/{team["Abbreviation"]}/2019.html">{team["Abbreviation"]}</a>')
+                 + ''.join(_cell('td', score) for score in team['Score']) + '</tr>')
+
+    #The line score is commented out in the static page and rendered by JavaScript
+    return ('<div id="all_line_score" class="table_wrapper"><!--\n'
+            '<div class="table_container"><table id="line_score" class="suppress_all stats_table">'
+            '<thead><tr class="over_header"><th colspan="8">Scoring</th></tr>'
+            '<tr>' + _cell('th', '') + ''.join(_cell('th', label) for label in labels) + '</tr></thead>'
+            '<tbody>' + rows + '</tbody></table></div>\n--></div>')
+
+
+def game_title(game):
+    """Returns the title of a game's box score page"""
+    return (f'{abbreviation_team[game["Away"]["Abbreviation"]]} at {abbreviation_team[game["Home"]["Abbreviation"]]} '
+            f'Box Score, {game["Date"].strftime("%B %d, %Y")} | Basketball-Reference.com')
+
+
+def render_box_score_page(game, full = False):
+    """Returns the HTML of a game's box score page as bytes, full adds the box scores by period and advanced box scores"""
+    tables = _line_score_table(game)
+    extras = make_game_extras(game) if full else None
+    for team in (game['Away'], game['Home']):
+        tables += _box_score_table(team)
+        if full:
+            tables += _extra_tables(team, extras)
+
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{game_title(game)}</title></head><body><div id="content">'
+            + tables + '</div></body></html>').encode('utf-8')
+
+
+def render_pbp_page(game):
+    """Returns the HTML of a game's play-by-play page as bytes"""
+    away = abbreviation_team[game['Away']['Abbreviation']]
+    home = abbreviation_team[game['Home']['Abbreviation']]
+    rows = ''
+    for number, (period, plays) in enumerate(make_game_extras(game)['Plays']):
+        rows += f'<tr class="thead" id="q{number + 1}"><th colspan="6">{period}</th></tr>'
+        rows += '<tr class="thead">' + ''.join(_cell('th', col) for col in ['Time', away, '', 'Score', '', home]) + '</tr>'
+        for clock, side, text, points, score in plays:
+            if side is None:
+                rows += '<tr>' + _cell('td', clock) + f'<td class="center" colspan="5">{text}</td></tr>'
+            elif side == 'Away':
+                rows += '<tr>' + ''.join(_cell('td', value) for value in [clock, text, points, score, '', '']) + '</tr>'
+            else:
+                rows += '<tr>' + ''.join(_cell('td', value) for value in [clock, '', '', score, points, text]) + '</tr>'
+    title = game_title(game).replace('Box Score', 'Play-By-Play')
+
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{title}</title></head><body><div id="content">'
+            '<div id="all_pbp" class="table_wrapper"><div class="table_container">'
+            '<table id="pbp" class="suppress_all sortable stats_table">' + rows + '</table></div></div>'
+            '</div></body></html>').encode('utf-8')
+
+
+def render_scoreboard_page(games, finished = None):
+    """Returns the HTML of the scoreboard page listing the games as bytes
+
+    Games whose Game-ID is not in finished (every game if it is None) are listed as still to be played.
+    """
+    summaries = ''
+    for game in games:
+        rows = ''
+        final = finished is None or game['Game-ID'] in finished
+        for team in (game['Away'], game['Home']):
+            city = full_name_city[abbreviation_team[team['Abbreviation']]]
+            if final:
+                rows += (f'<tr class="loser"><td><a href="/teams/{team["Abbreviation"]}/2019.html">{city}</a></td>'
+                         f'<td class="right">{team["Totals"]["PTS"]}</td>'
+                         f'<td class="right gamelink"><a href="/boxscores/{game["Game-ID"][0:8]}0{game["Home"]["Abbreviation"]}.html">Final</a></td></tr>')
+            else:
+                rows += (f'<tr><td><a href="/teams/{team["Abbreviation"]}/2019.html">{city}</a></td>'
+                         f'<td class="right"></td>'
+                         f'<td class="right gamelink"><a href="/previews/{game["Game-ID"][0:8]}0{game["Home"]["Abbreviation"]}.html">Preview</a></td></tr>')
+        summaries += f'<div class="game_summary expanded nohover"><table class="teams"><tbody>{rows}</tbody></table></div>'
+
+    return ('<!DOCTYPE html><html><head><title>NBA Games | Basketball-Reference.com</title></head><body>'
+            f'<div class="game_summaries">{summaries}</div></body></html>').encode('utf-8')
+
+
+def render_schedule_page(games, month_pages):
+    """Returns the HTML of a schedule page listing the games (dicts of make_game) as bytes
+
+    month_pages are the paths of the schedule page of every month of the season, linked from the page.
+    """
+    rows = ''
+    for game in games:
+        day = game['Date']
+        rows += (f'<tr><th scope="row" class="left" data-stat="date_game">'
+                 f'<a href="/boxscores/?month={day.month}&amp;day={day.day}&amp;year={day.year}">'
+                 f'{day.strftime("%a, %b")} {day.day}, {day.year}</a></th>'
+                 f'<td data-stat="game_start_time">7:30p</td>'
+                 f'<td data-stat="visitor_team_name">{abbreviation_team[game["Away"]["Abbreviation"]]}</td>'
+                 f'<td data-stat="visitor_pts">{game["Away"]["Totals"]["PTS"]}</td>'
+                 f'<td data-stat="home_team_name">{abbreviation_team[game["Home"]["Abbreviation"]]}</td>'
+                 f'<td data-stat="home_pts">{game["Home"]["Totals"]["PTS"]}</td>'
+                 f'<td data-stat="box_score_text"><a href="/boxscores/{game["Game-ID"][0:8]}0{game["Home"]["Abbreviation"]}.html">Box Score</a></td></tr>')
+    links = ''.join(f'<div><a href="{path}">{path.split("-")[-1].split(".")[0].title()}</a></div>' for path in month_pages)
+
+    return ('<!DOCTYPE html><html><head><title>NBA Schedule and Results | Basketball-Reference.com</title></head><body>'
+            f'<div class="filter">{links}</div>'
+            '<table id="schedule"><thead><tr><th data-stat="date_game">Date</th><th>Start (ET)</th>'
+            '<th>Visitor/Neutral</th><th>PTS</th><th>Home/Neutral</th><th>PTS</th><th></th></tr></thead>'
+            f'<tbody>{rows}</tbody></table></body></html>').encode('utf-8')
+
+
+def _text_line(cells):
+    #Selenium joins the visible cells of a row with spaces, empty cells are dropped
+    return ' '.join(str(cell) for cell in cells if str(cell) != '')
+
+
+def render_box_score_text(team):
+    """Returns the text selenium reads from a team's all_box-<ABRV>-game-basic element"""
+    lines = [f'{abbreviation_team[team["Abbreviation"]]} Basic and Advanced Stats',
+             'Share & Export', 'Glossary', 'Basic Box Score Stats', _text_line(HEADER)]
+    for i, player in enumerate(team['Players']):
+        if i == 5:
+            lines.append(_text_line(['Reserves'] + HEADER[1:]))
+        if 'Reason' in player:
+            lines.append(player['Player'] + ' ' + player['Reason'])
+        else:
+            lines.append(_text_line([player['Player']] + [player[col] for col in HEADER[1:]]))
+    lines.append(_text_line(['Team Totals'] + [team['Totals'][col] for col in HEADER[1:]]))
+
+    return '\n'.join(lines)
+
+
+def render_line_score_text(game):
+    """Returns the text selenium reads from the line_score element"""
+    periods = len(game['Home']['Score']) - 1
+    labels = [str(i + 1) for i in range(4)] + ['%dOT' % (i + 1) for i in range(periods - 4)] + ['T']
+    lines = ['Scoring', ' '.join(labels)]
+    for team in (game['Away'], game['Home']):
+        lines.append(_text_line([team['Abbreviation']] + team['Score']))
+
+    return '\n'.join(lines)
+
+
+def make_season(start_date = '2018-10-16', num_games = 1230, games_per_day = 7):
+    """Returns the Game-IDs of a synthetic season, every team hosts at most one game per day"""
+    teams = sorted(abbreviation_team)
+    start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+
+    game_ids = []
+    for i in range(num_games):
+        day = start_date + timedelta(days = i // games_per_day)
+        game_ids.append(day.strftime('%Y%m%d') + teams[i % len(teams)])
+
+    return game_ids
+
+
+#Day of the recorded pages, the day after the last day of the synthetic season
+RECORDED_DATE = '2019-04-10'
+#Overtimes, players who did not play per team and players without a +/- of each recorded game
+RECORDED_CASES = [(0, 0, ()), (1, 2, ()), (2, 0, (3,)), (0, 3, (0, 7)), (3, 1, ()), (0, 0, (5,))]
+
+
+def make_recorded_games(date_played = RECORDED_DATE):
+    """Returns the games of the recorded day, covering overtimes, players who did not play and missing +/-"""
+    teams = sorted(abbreviation_team)
+    modified_date = date_played.replace('-', '')
+    games = []
+    for i, (overtimes, num_dnp, missing_plus_minus) in enumerate(RECORDED_CASES):
+        games.append(make_game(modified_date + teams[2 * i], away_team_abrv = teams[2 * i + 1], overtimes = overtimes,
+                               num_dnp = num_dnp, missing_plus_minus = missing_plus_minus))
+    return games
+
+
+def scoreboard_file(modified_date):
+    """Returns the path of a recorded scoreboard page relative to the pages directory"""
+    return os.path.join('boxscores', f'scoreboard-{modified_date}.html')
+
+
+def record_pages(pages_dir, games):
+    """Writes the scoreboard and box score pages of games to pages_dir, with what the parsers should read from them
+
+    The pages are laid out like their urls (boxscores/201904100ATL.html), the scoreboard of a date is
+    boxscores/scoreboard-20190410.html. expected.json holds the number of players who played, did not
+    play and have no +/- and the number of overtimes of every game.
+    """
+    os.makedirs(os.path.join(pages_dir, 'boxscores'), exist_ok = True)
+    by_date = {}
+    expected = {}
+    for game in games:
+        modified_date = game['Game-ID'][0:8]
+        by_date.setdefault(modified_date, []).append(game)
+        with open(os.path.join(pages_dir, 'boxscores', f'{modified_date}0{game["Home"]["Abbreviation"]}.html'), 'wb') as page:
+            page.write(render_box_score_page(game))
+        players = game['Home']['Players'] + game['Away']['Players']
+        expected[game['Game-ID']] = {'played': sum(1 for player in players if 'Reason' not in player),
+                                     'did_not_play': sum(1 for player in players if 'Reason' in player),
+                                     'missing_plus_minus': sum(1 for player in players if player.get('+/-') == ''),
+                                     'overtimes': len(game['Home']['Score']) - 5}
+    for modified_date, day_games in by_date.items():
+        with open(os.path.join(pages_dir, scoreboard_file(modified_date)), 'wb') as page:
+            page.write(render_scoreboard_page(day_games))
+    with open(os.path.join(pages_dir, 'expected.json'), 'w') as expected_file:
+        json.dump(expected, expected_file, indent = 2, sort_keys = True)
+
+
+if __name__ == '__main__':
+    #Records the pages shipped in benchmarks/pages
+    record_pages(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages'), make_recorded_games())
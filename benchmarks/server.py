@@ -0,0 +1,224 @@
+"""Local stand-in for Basketball Reference serving synthetic scoreboard and box score pages
+
+Pages recorded in a pages directory (see fixtures.record_pages) are served from disk, every other page
+is generated. Usage from a benchmark:
+
+    server, base_url = serve(make_season(), latency = 0.05, pages_dir = 'benchmarks/pages')
+    scraper = NBA_scraper(backend = 'http', base_url = base_url)
+    ...
+    server.shutdown()
+
+With full_pages, box score pages also have the box scores by period and the advanced box scores of
+real pages. The play-by-play pages (boxscores/pbp/...) are generated for every game.
+
+With live_date, the games of that date go final one by one every final_every seconds after the server
+starts, its scoreboard answers conditional requests (ETag / Last-Modified) with 304 Not Modified and the
+box score of a game that is not final yet is not found.
+
+Run on its own to browse the pages:
+
+    python benchmarks/server.py [--port 8000] [--latency-ms 0]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from fixtures import (make_game, make_season, render_box_score_page, render_pbp_page, render_schedule_page,
+                      render_scoreboard_page, scoreboard_file)
+
+BOXSCORE_PATH = re.compile(r'^/boxscores/(\d{8})0([A-Z]{3})\.html$')
+PBP_PATH = re.compile(r'^/boxscores/pbp/(\d{8})0([A-Z]{3})\.html$')
+SCHEDULE_PATH = re.compile(r'^/leagues/NBA_(\d{4})_games(?:-([a-z]+))?\.html$')
+
+
+class StandInServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address, game_ids, latency = 0.0, error_rate = 0.0, retry_after = 1, pages_dir = None,
+                 live_date = None, final_every = 60.0, full_pages = False):
+        super().__init__(address, StandInHandler)
+        self.pages_dir = pages_dir
+        self.full_pages = full_pages
+        self.latency = latency
+        #Share of requests answered with 429 Too Many Requests or 503 Service Unavailable
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(0)
+        self.games = defaultdict(list)
+        for game_id in game_ids:
+            self.games[game_id[0:8]].append(game_id)
+        #Recorded games replace the synthetic games of their date
+        recorded = defaultdict(list)
+        if pages_dir is not None:
+            for name in sorted(os.listdir(os.path.join(pages_dir, 'boxscores'))):
+                game_path = BOXSCORE_PATH.match('/boxscores/' + name)
+                if game_path:
+                    recorded[game_path.group(1)].append(game_path.group(1) + game_path.group(2))
+        self.games.update(recorded)
+        self.live_date = live_date.replace('-', '') if live_date else None
+        self.final_every = final_every
+        self.started = time.time()
+        self.requests_served = 0
+        self.errors_served = 0
+        self.not_modified_served = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+
+    def final_at(self, game_id):
+        """Returns the time a game goes final, games not played on the live date are final from the start"""
+        if game_id[0:8] != self.live_date:
+            return 0.0
+        return self.started + (sorted(self.games[self.live_date]).index(game_id) + 1) * self.final_every
+
+    def is_final(self, game_id):
+        return time.time() >= self.final_at(game_id)
+
+    def recorded_page(self, path):
+        """Returns the recorded page at path relative to pages_dir, None if it was not recorded"""
+        if self.pages_dir is None:
+            return None
+        try:
+            with open(os.path.join(self.pages_dir, path), 'rb') as page:
+                return page.read()
+        except OSError:
+            return None
+
+    def season_months(self, season):
+        """Returns the Game-IDs of a season by month name (i.e. october), months in season order"""
+        months = {}
+        for modified_date in sorted(self.games):
+            day = datetime.strptime(modified_date, '%Y%m%d').date()
+            if (day.year + 1 if day.month >= 8 else day.year) == season:
+                months.setdefault(day.strftime('%B').lower(), []).extend(self.games[modified_date])
+        return months
+
+    def count_request(self):
+        """Counts the request and returns the error status to answer it with, None to serve the page"""
+        with self._lock:
+            self.requests_served += 1
+            if self.random.random() < self.error_rate:
+                self.errors_served += 1
+                return self.random.choice([429, 503])
+        return None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_page(self, status, body, headers = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server._lock:
+            self.server.bytes_served += len(body)
+
+    def send_live_page(self, page, modified):
+        #Pages of the live date are validated by their ETag, or by their Last-Modified date
+        etag = '"' + hashlib.md5(page).hexdigest() + '"'
+        last_modified = formatdate(modified, usegmt = True)
+        if (self.headers.get('If-None-Match') == etag) or (self.headers.get('If-None-Match') is None 
+                                                           and self.headers.get('If-Modified-Since') == last_modified):
+            with self.server._lock:
+                self.server.not_modified_served += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_page(200, page, {'ETag': etag, 'Last-Modified': last_modified})
+
+    def do_GET(self):
+        error = self.server.count_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if error == 429:
+            self.send_response(429)
+            self.send_header('Retry-After', str(self.server.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        elif error is not None:
+            self.send_page(error, b'<html><head><title>Service Unavailable</title></head></html>')
+            return
+
+        url = urlparse(self.path)
+        game_path = BOXSCORE_PATH.match(url.path) or PBP_PATH.match(url.path)
+        schedule_path = SCHEDULE_PATH.match(url.path)
+
+        if url.path == '/boxscores/' and url.query:
+            query = parse_qs(url.query)
+            modified_date = query['year'][0] + query['month'][0].zfill(2) + query['day'][0].zfill(2)
+            if modified_date == self.server.live_date:
+                game_ids = self.server.games.get(modified_date, [])
+                finished = [game_id for game_id in game_ids if self.server.is_final(game_id)]
+                modified = max([self.server.started] + [self.server.final_at(game_id) for game_id in finished])
+                self.send_live_page(render_scoreboard_page([make_game(game_id) for game_id in game_ids], finished), modified)
+                return
+            page = self.server.recorded_page(scoreboard_file(modified_date))
+            if page is None:
+                page = render_scoreboard_page([make_game(game_id) for game_id in self.server.games.get(modified_date, [])])
+            self.send_page(200, page)
+        elif (game_path and game_path.group(1) + game_path.group(2) in self.server.games.get(game_path.group(1), [])
+              and self.server.is_final(game_path.group(1) + game_path.group(2))):
+            game = make_game(game_path.group(1) + game_path.group(2))
+            if PBP_PATH.match(url.path):
+                page = render_pbp_page(game)
+            else:
+                page = self.server.recorded_page(url.path.lstrip('/')) or render_box_score_page(game, self.server.full_pages)
+            self.send_page(200, page)
+        elif schedule_path and self.server.season_months(int(schedule_path.group(1))):
+            season = int(schedule_path.group(1))
+            months = self.server.season_months(season)
+            #The page without a month is the page of the first month
+            month = schedule_path.group(2) or next(iter(months))
+            month_pages = [f'/leagues/NBA_{season}_games-{name}.html' for name in months]
+            games = [make_game(game_id) for game_id in months.get(month, [])]
+            if schedule_path.group(2) and month not in months:
+                self.send_page(404, b'<html><head><title>Page Not Found</title></head></html>')
+            else:
+                self.send_page(200, render_schedule_page(games, month_pages))
+        else:
+            self.send_page(404, b'<html><head><title>Page Not Found</title></head></html>')
+
+
+def serve(game_ids, latency = 0.0, port = 0, error_rate = 0.0, retry_after = 1, pages_dir = None,
+          live_date = None, final_every = 60.0, full_pages = False):
+    """Starts the stand-in server on a background thread and returns it with its base url"""
+    server = StandInServer(('127.0.0.1', port), game_ids, latency, error_rate, retry_after, pages_dir,
+                           live_date, final_every, full_pages)
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+
+    return server, 'http://127.0.0.1:%d' % server.server_address[1]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('--port', type = int, default = 8000)
+    parser.add_argument('--latency-ms', type = float, default = 0.0)
+    parser.add_argument('--error-rate', type = float, default = 0.0)
+    parser.add_argument('--pages-dir', default = None)
+    parser.add_argument('--full-pages', action = 'store_true')
+    args = parser.parse_args()
+
+    server = StandInServer(('127.0.0.1', args.port), make_season(), args.latency_ms / 1000, args.error_rate,
+                           pages_dir = args.pages_dir, full_pages = args.full_pages)
+    print('Serving a synthetic season on http://127.0.0.1:%d' % args.port)
+    server.serve_forever()
@@ -10,10 +10,18 @@ setup(
     author_email="willyliu802@gmail.com",
     packages=find_packages(),
     install_requires=[
-        "pandas>=0.25.1",
-        "pyyaml>=5.3.1",
-        "selenium>=3.141.0",
+        "pandas>=1.1.0",
         "numpy>=1.19.4",
+        "requests>=2.24.0",
+        "lxml>=4.6.2",
     ],
-    python_requires=">=3.6",
+    extras_require={
+        "selenium": ["selenium>=4.10.0,<5"],
+        "parquet": ["pyarrow>=8.0.0"],
+        "async": ["aiohttp>=3.7.0"],
+    },
+    entry_points={
+        "console_scripts": ["nba-backfill=NBA_data_scraper.backfill:main"],
+    },
+    python_requires=">=3.7",
 )
\ No newline at end of file
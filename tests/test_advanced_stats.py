@@ -0,0 +1,53 @@
+"""Tests of the advanced metrics computed from the box score of tests/pages"""
+
+import pytest
+
+from NBA_data_scraper.advanced_stats import add_player_advanced_stats, add_team_advanced_stats, opponent_stats
+from NBA_data_scraper.parsers import parse_game_rows
+from NBA_data_scraper.util_helpers import rows_to_frame
+
+from test_parsers import BOX_SCORE
+
+
+def _frames():
+    player_data, team_data = parse_game_rows(BOX_SCORE, 'Boston Celtics', '2019-02-07')
+    return rows_to_frame(player_data), rows_to_frame(team_data)
+
+
+def test_opponent_stats():
+    _, team_df = _frames()
+
+    opp = opponent_stats(team_df)
+
+    assert list(opp['Opp PTS']) == [129, 128]
+    assert list(opp['Opp FGA']) == [90, 95]
+
+
+def test_team_advanced_stats():
+    _, team_df = _frames()
+
+    team_df = add_team_advanced_stats(team_df)
+
+    #FGA + 0.4 FTA - 1.07 ORB / (ORB + Opp DRB) (FGA - FG) + TOV of each team, averaged
+    bos_poss = 95 + 0.4 * 24 - 1.07 * 9 / (9 + 38) * (95 - 48) + 12
+    lal_poss = 90 + 0.4 * 26 - 1.07 * 10 / (10 + 36) * (90 - 48) + 14
+    assert list(team_df['Poss']) == pytest.approx([(bos_poss + lal_poss) / 2] * 2)
+    assert team_df['ORtg'][0] == pytest.approx(100 * 128 / team_df['Poss'][0])
+    assert team_df['ORtg'][0] == team_df['DRtg'][1]
+    assert team_df['NetRtg'][0] == pytest.approx(-team_df['NetRtg'][1])
+    assert team_df['eFG%'][0] == pytest.approx((48 + 0.5 * 12) / 95)
+    assert team_df['TS%'][1] == pytest.approx(129 / (2 * (90 + 0.44 * 26)))
+    #A game without overtime is 48 minutes, the pace is the number of possessions
+    assert team_df['Pace'][0] == pytest.approx(team_df['Poss'][0])
+
+
+def test_player_advanced_stats():
+    player_df, team_df = _frames()
+
+    player_df = add_player_advanced_stats(player_df, team_df)
+    irving = player_df[player_df['Player Name'] == 'Kyrie Irving'].iloc[0]
+
+    assert irving['eFG%'] == pytest.approx((9 + 0.5 * 3) / 18)
+    assert irving['TS%'] == pytest.approx(25 / (2 * (18 + 0.44 * 4)))
+    assert irving['USG%'] == pytest.approx(100 * (18 + 0.44 * 4 + 3) * 48 / ((36 + 12 / 60) * (95 + 0.44 * 24 + 12)))
+    assert list(player_df['Pace'].unique()) == pytest.approx([add_team_advanced_stats(team_df)['Pace'][0]])
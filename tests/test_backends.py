@@ -0,0 +1,170 @@
+"""Tests of the http backends and the scraper's game iterators on the pages of tests/pages"""
+
+import asyncio
+import os
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from NBA_data_scraper import NBA_scraper
+from NBA_data_scraper.backends import HTTPBackend
+from NBA_data_scraper.scheduler import RequestScheduler, RetryableError
+
+from test_parsers import PAGES
+
+BASE_URL = 'http://bbref.test'
+
+
+def page_path(path, query):
+    #Path of a page of tests/pages, the scoreboard of a date is boxscores/scoreboard-20190207.html
+    if path == '/boxscores/' and query:
+        query = {key: int(values[0]) for key, values in parse_qs(query).items()}
+        path = f'/boxscores/scoreboard-{query["year"]}{query["month"]:02}{query["day"]:02}.html'
+    return os.path.join(PAGES, *path.strip('/').split('/'))
+
+
+def _response(url, status_code, content = b'', headers = None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+
+    """Session answering with the pages of tests/pages, or with the statuses queued for a url"""
+
+    def __init__(self, statuses = None):
+        self.statuses = statuses or {}
+        self.requests = []
+
+    def get(self, url, timeout = None, headers = None):
+        self.requests.append((url, headers))
+        statuses = self.statuses.get(url)
+        if statuses:
+            status_code, status_headers = statuses.pop(0)
+            return _response(url, status_code, headers = status_headers)
+        parsed = urlparse(url)
+        path = page_path(parsed.path, parsed.query)
+        if not os.path.exists(path):
+            return _response(url, 404)
+        with open(path, 'rb') as page:
+            return _response(url, 200, page.read(), {'ETag': '"20190207"'})
+
+    def close(self):
+        pass
+
+
+def test_http_backend_parses_the_pages():
+    backend = HTTPBackend(FakeSession(), base_url = BASE_URL)
+
+    assert backend.get_list_of_hometeams('2019-02-07') == ['Boston', 'Milwaukee', 'Sacramento']
+    datasets = backend.get_game_datasets('Boston Celtics', '2019-02-07', ('player', 'pbp'))
+    assert len(datasets['player'][1]) == 6
+    assert len(datasets['pbp'][1]) == 7
+    assert backend.metrics.counters['pages_fetched'] == 3
+
+
+def test_http_errors():
+    scoreboard = f'{BASE_URL}/boxscores/?month=02&day=07&year=2019'
+    session = FakeSession({scoreboard: [(429, {'Retry-After': '30'})]})
+    backend = HTTPBackend(session, base_url = BASE_URL)
+
+    with pytest.raises(RetryableError) as error:
+        backend.fetch_page(scoreboard)
+    assert error.value.retry_after == 30
+
+    #Pages that are not found are not retried
+    with pytest.raises(requests.HTTPError):
+        backend.fetch_page(f'{BASE_URL}/boxscores/201902070MIL.html')
+
+
+def test_http_backend_retries_through_the_scheduler():
+    scoreboard = f'{BASE_URL}/boxscores/?month=02&day=07&year=2019'
+    session = FakeSession({scoreboard: [(503, {}), (500, {})]})
+    scheduler = RequestScheduler(requests_per_minute = None, backoff_base = 0)
+    backend = HTTPBackend(session, base_url = BASE_URL, scheduler = scheduler)
+
+    assert backend.get_list_of_hometeams('2019-02-07') == ['Boston', 'Milwaukee', 'Sacramento']
+    assert len(session.requests) == 3
+
+
+def test_conditional_scoreboard_requests():
+    scoreboard = f'{BASE_URL}/boxscores/?month=02&day=07&year=2019'
+    session = FakeSession()
+    backend = HTTPBackend(session, base_url = BASE_URL)
+
+    games, etag, last_modified = backend.get_scoreboard('2019-02-07')
+    assert games[0] == ('Boston', True)
+    assert etag == '"20190207"'
+
+    session.statuses[scoreboard] = [(304, {})]
+    assert backend.get_scoreboard('2019-02-07', etag) == (None, etag, None)
+    assert session.requests[-1][1] == {'If-None-Match': etag}
+
+
+def _scraper():
+    scraper = NBA_scraper(backend = 'http', base_url = BASE_URL, requests_per_minute = None, use_schedule = False)
+    for backend in scraper.backend_pool.backends:
+        backend.session = FakeSession()
+    return scraper
+
+
+def test_iter_games():
+    scraper = _scraper()
+
+    records = list(scraper.iter_games('2019-02-07', datasets = ['advanced']))
+
+    #Only the box score of Boston is in tests/pages, the other games are collected as failed
+    assert [(record.game_id, record.home_team) for record in records] == [('20190207BOS', 'Boston Celtics')]
+    assert len(records[0].player_df()) == 6
+    assert list(records[0].team_df()['Team']) == ['Boston Celtics', 'Los Angeles Lakers']
+    assert len(records[0].dataset_df('advanced')) == 6
+    assert [home_team for _, home_team, _ in scraper.failed_games] == ['Milwaukee Bucks', 'Sacramento Kings']
+
+
+def test_iter_games_skips_the_games_already_scraped():
+    scraper = _scraper()
+
+    records = list(scraper.iter_games('2019-02-07', skip_game_ids = {'20190207BOS', '20190207MIL', '20190207SAC'}))
+
+    assert records == []
+    assert scraper.failed_games == []
+
+
+def test_async_engine():
+    web = pytest.importorskip('aiohttp.web')
+    from aiohttp.test_utils import TestServer
+
+    retried = []
+
+    async def handle(request):
+        #The first request of the scoreboard is answered with 429 Too Many Requests
+        if request.path == '/boxscores/' and not retried:
+            retried.append(request.path)
+            return web.Response(status = 429, headers = {'Retry-After': '0'})
+        path = page_path(request.path, request.query_string)
+        if not os.path.exists(path):
+            return web.Response(status = 404)
+        with open(path, 'rb') as page:
+            return web.Response(body = page.read(), content_type = 'text/html')
+
+    async def scrape():
+        app = web.Application()
+        app.router.add_get('/{path:.*}', handle)
+        async with TestServer(app) as server:
+            scraper = NBA_scraper(backend = 'http', base_url = str(server.make_url('')),
+                                  requests_per_minute = None, use_schedule = False)
+            records = [record async for record in scraper.aiter_games('2019-02-07')]
+            return scraper, records
+
+    scraper, records = asyncio.run(scrape())
+
+    assert retried == ['/boxscores/']
+    assert [record.game_id for record in records] == ['20190207BOS']
+    assert len(records[0].player_df()) == 6
+    assert len(records[0].team_df()) == 2
+    assert [home_team for _, home_team, _ in scraper.failed_games] == ['Milwaukee Bucks', 'Sacramento Kings']
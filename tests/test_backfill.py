@@ -0,0 +1,35 @@
+"""Tests of the months the backfill plans for the requested seasons"""
+
+from NBA_data_scraper import backfill
+from NBA_data_scraper.backfill import range_jobs, season_dates, season_ranges
+from NBA_data_scraper.schedule import ScheduleIndex
+
+from test_schedule import BASE_URL, _fetch_page
+
+
+def test_seasons_are_planned_on_their_own():
+    jobs = range_jobs(season_ranges([2005, 2019]))
+
+    assert len(jobs) == 24
+    assert [job[0] for job in jobs][11:13] == ['2005-07', '2018-08']
+
+
+def test_bubble_months_are_planned():
+    assert season_dates(2020) == ('2019-08-01', '2020-10-11')
+
+    schedule = ScheduleIndex(_fetch_page, base_url = BASE_URL)
+    ranges = season_ranges([2020, 2021], schedule)
+    jobs = range_jobs(ranges)
+
+    #The schedule of 2021 is empty, every date of the season is scraped
+    assert ranges == [('2019-10-22', '2020-10-11'), ('2020-10-12', '2021-07-31')]
+    assert jobs[-11:-9] == [('2020-10', '2020-10-01', '2020-10-11'), ('2020-10-12', '2020-10-12', '2020-10-31')]
+
+
+def test_workers_are_capped_by_the_option(monkeypatch):
+    calls = []
+    monkeypatch.setattr(backfill, 'backfill', lambda *args, **kwargs: calls.append(kwargs) or {'failed': []})
+
+    assert backfill.main(['--seasons', '2019', '--output', 'backfill', '--workers', '2']) == 0
+    assert calls[0]['scraper_options']['n_workers'] == 2
+    assert calls[0]['scraper_options']['max_workers'] == 2
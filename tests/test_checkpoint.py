@@ -0,0 +1,99 @@
+"""Tests of get_player_team_data resuming an interrupted scrape from its checkpoint"""
+
+import pandas as pd
+import pytest
+
+from NBA_data_scraper import NBA_scraper
+from NBA_data_scraper.storage import FlushedGameIds, read_dataset
+from NBA_data_scraper.util_helpers import GameRecord
+
+PLAYER_COLS = ['Game-ID', 'Date', 'Team', 'Venue(R/H)', 'Starter(Y/N)', 'Player Name', 'MP', 'PTS']
+TEAM_COLS = ['Game-ID', 'Date', 'Team', 'Venue(R/H)', '1Q', 'OT1', 'F', 'MP', 'PTS']
+
+
+def _game(day, overtime = False):
+    game_id = f'201903{day:02d}BOS'
+    date_played = f'2019-03-{day:02d}'
+    player_rows = [[game_id, date_played, 'Boston Celtics', 'H', 'Y', 'Home Player', '30:00', '10'],
+                   [game_id, date_played, 'Atlanta Hawks', 'R', 'Y', 'Away Player', '28:00', '']]
+    team_rows = [[game_id, date_played, 'Boston Celtics', 'H', 20, 10 if overtime else '', 100, '240', '100'],
+                 [game_id, date_played, 'Atlanta Hawks', 'R', 25, 5 if overtime else '', 95, '240', '95']]
+    return GameRecord(game_id, date_played, 'Boston Celtics', (PLAYER_COLS, player_rows), (TEAM_COLS, team_rows))
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _scraper(days, interrupt_after = None):
+    scraper = NBA_scraper(backend = 'http', requests_per_minute = None, use_schedule = False)
+
+    def iter_games(start_date, end_date, get_player_data_ind = True, get_team_data_ind = True, skip_game_ids = None):
+        scraper.failed_games = []
+        for i, day in enumerate(days):
+            if i == interrupt_after:
+                raise Interrupted()
+            game = _game(day, overtime = day % 2 == 0)
+            if skip_game_ids is None or game.game_id not in skip_game_ids:
+                yield game
+
+    scraper.iter_games = iter_games
+    return scraper
+
+
+def test_resumed_run_does_not_append_duplicates(tmp_path):
+    player_path, team_path = tmp_path / 'player.csv', tmp_path / 'team.csv'
+    player_path.write_text(','.join(PLAYER_COLS) + '\n20190301BOS,2019-03-01,Boston Celtics,H,Y,Old Player,30:00,5\n')
+    team_path.write_text(','.join(TEAM_COLS) + '\n20190301BOS,2019-03-01,Boston Celtics,H,20,,100,240,100\n')
+    options = dict(pre_player_data_dir = str(player_path), pre_team_data_dir = str(team_path), append_only = True,
+                   skip_existing = False, checkpoint_dir = str(tmp_path / 'checkpoint'), flush_every = 1)
+
+    with pytest.raises(Interrupted):
+        _scraper([2, 3, 4], interrupt_after = 2).get_player_team_data('2019-03-02', '2019-03-04', **options)
+    _scraper([2, 3, 4]).get_player_team_data('2019-03-02', '2019-03-04', **options)
+
+    game_ids = read_dataset(player_path)['Game-ID']
+    assert list(game_ids.value_counts().sort_index()) == [1, 2, 2, 2]
+    assert not (tmp_path / 'checkpoint').exists()
+
+
+def test_checkpoint_returns_the_types_of_scraped_data(tmp_path):
+    player_df, team_df = _scraper([2, 3, 4]).get_player_team_data('2019-03-02', '2019-03-04')
+
+    with pytest.raises(Interrupted):
+        _scraper([2, 3, 4], interrupt_after = 2).get_player_team_data('2019-03-02', '2019-03-04', flush_every = 1,
+                                                                      checkpoint_dir = str(tmp_path / 'checkpoint'))
+    resumed_player_df, resumed_team_df = _scraper([2, 3, 4]).get_player_team_data('2019-03-02', '2019-03-04',
+                                                                                  checkpoint_dir = str(tmp_path / 'checkpoint'))
+
+    pd.testing.assert_frame_equal(resumed_player_df, player_df)
+    pd.testing.assert_frame_equal(resumed_team_df, team_df)
+
+
+@pytest.mark.parametrize('dataset', ['player.csv', 'player_data'])
+def test_crash_between_rows_and_game_ids_does_not_append_duplicates(tmp_path, monkeypatch, dataset):
+    player_path = tmp_path / dataset
+    if dataset.endswith('.csv'):
+        player_path.write_text(','.join(PLAYER_COLS) + '\n')
+    else:
+        player_path.mkdir()
+    options = dict(get_team_data_ind = False, pre_player_data_dir = str(player_path), append_only = True,
+                   skip_existing = False, checkpoint_dir = str(tmp_path / 'checkpoint'), flush_every = 1)
+
+    #Killed once the rows of the second game are written, before its Game-ID is added to the checkpoint
+    add = FlushedGameIds.add
+
+    def crashing_add(self, game_ids):
+        game_ids = list(game_ids)
+        if '20190303BOS' in game_ids:
+            raise Interrupted()
+        add(self, game_ids)
+
+    monkeypatch.setattr(FlushedGameIds, 'add', crashing_add)
+    with pytest.raises(Interrupted):
+        _scraper([2, 3, 4]).get_player_team_data('2019-03-02', '2019-03-04', **options)
+    monkeypatch.setattr(FlushedGameIds, 'add', add)
+    _scraper([2, 3, 4]).get_player_team_data('2019-03-02', '2019-03-04', **options)
+
+    game_ids = read_dataset(player_path)['Game-ID']
+    assert list(game_ids.value_counts().sort_index()) == [2, 2, 2]
@@ -0,0 +1,86 @@
+"""Tests of the Chrome drivers built with selenium 4 and replaced once they crash"""
+
+import pytest
+
+pytest.importorskip('selenium')
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from NBA_data_scraper import drivers
+from NBA_data_scraper.backends import SeleniumBackend
+from NBA_data_scraper.scheduler import RequestScheduler
+from NBA_data_scraper.util_helpers import read_element_text, read_list_of_hometeams
+
+
+class FakeDriver:
+
+    def __init__(self, crashed = False):
+        self.crashed = crashed
+        self.title = 'Box Score'
+        self.page_source = '<html></html>'
+
+    def get(self, url):
+        if self.crashed:
+            raise WebDriverException('chrome not reachable')
+
+
+class FakeElement:
+
+    def __init__(self, text):
+        self.text = text
+
+
+class LiveDomDriver(FakeDriver):
+
+    #Only the selenium 4 locators, find_element_by_id and find_elements_by_class_name were removed in selenium 4.3
+    def find_element(self, by, value):
+        assert by == By.ID
+        return FakeElement({'line_score': 'BOS 20 30'}[value])
+
+    def find_elements(self, by, value):
+        assert (by, value) == (By.CLASS_NAME, 'game_summaries')
+        return [FakeElement(''), FakeElement('\n'.join(['a', 'b', 'c', 'd', 'Boston Celtics  100', 'f', 'g', 'h']))]
+
+
+class FakeManager:
+
+    def __init__(self):
+        self.recycled = []
+
+    def needs_recycling(self, driver):
+        return False
+
+    def recycle(self, driver):
+        self.recycled.append(driver)
+        return FakeDriver()
+
+
+def test_drivers_are_built_with_a_service(monkeypatch):
+    calls = []
+    monkeypatch.setattr(drivers.webdriver, 'Chrome', lambda **kwargs: calls.append(kwargs) or FakeDriver())
+
+    manager = drivers.DriverManager('path/to/chromedriver', spares = 0)
+    manager.new_driver()
+
+    assert calls[0]['service'].path == 'path/to/chromedriver'
+    assert calls[0]['options'].page_load_strategy == 'eager'
+
+
+def test_crashed_driver_is_replaced():
+    crashed = FakeDriver(crashed = True)
+    manager = FakeManager()
+    scheduler = RequestScheduler(None, max_retries = 1, backoff_base = 0.0)
+    backend = SeleniumBackend(crashed, scheduler = scheduler, manager = manager)
+
+    assert backend.fetch_page('http://boxscores.test/201903210BOS.html') == b'<html></html>'
+    assert manager.recycled == [crashed]
+    assert backend.driver is not crashed
+    assert backend.metrics.counters['drivers_replaced'] == 1
+
+
+def test_live_dom_uses_the_selenium_4_locators():
+    driver = LiveDomDriver()
+
+    assert read_element_text(driver, 'line_score') == 'BOS 20 30'
+    assert read_list_of_hometeams(driver, '2019-03-21') == ['Boston Celtics']
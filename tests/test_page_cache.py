@@ -0,0 +1,32 @@
+"""Tests of the time the page cache keeps box scores and scoreboards"""
+
+from datetime import datetime
+
+from NBA_data_scraper.page_cache import PageCache
+
+BOXSCORE = 'https://www.basketball-reference.com/boxscores/201903210BOS.html'
+PBP = 'https://www.basketball-reference.com/boxscores/pbp/201903210BOS.html'
+SCOREBOARD = 'https://www.basketball-reference.com/boxscores/?month=03&day=21&year=2019'
+
+
+def _timestamp(day):
+    return datetime.strptime(day, '%Y-%m-%d %H:%M').timestamp()
+
+
+def test_pages_of_games_that_can_still_change_expire(tmp_path):
+    cache = PageCache(tmp_path, scoreboard_ttl = 60)
+
+    #Downloaded during the game or the night after, the game may not be final yet
+    assert cache.ttl(BOXSCORE, _timestamp('2019-03-21 21:00')) == 60
+    assert cache.ttl(BOXSCORE, _timestamp('2019-03-22 01:00')) == 60
+    assert cache.ttl(PBP, _timestamp('2019-03-22 01:00')) == 60
+    assert cache.ttl(SCOREBOARD, _timestamp('2019-03-22 01:00')) == 60
+
+
+def test_pages_of_final_games_are_kept_forever(tmp_path):
+    cache = PageCache(tmp_path, scoreboard_ttl = 60)
+
+    assert cache.ttl(BOXSCORE, _timestamp('2019-03-23 00:00')) is None
+    assert cache.ttl(PBP, _timestamp('2019-03-23 00:00')) is None
+    assert cache.ttl(SCOREBOARD, _timestamp('2019-03-23 00:00')) is None
+    assert cache.ttl('https://www.basketball-reference.com/leagues/NBA_2019_games.html', _timestamp('2019-03-23 00:00')) == cache.default_ttl
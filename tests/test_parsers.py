@@ -0,0 +1,117 @@
+"""Tests of the parsers against trimmed pages in the markup of Basketball Reference (see tests/pages)"""
+
+import os
+
+import pytest
+
+from NBA_data_scraper.parsers import (load_html, parse_game_datasets, parse_game_rows, parse_list_of_hometeams,
+                                      parse_scoreboard, parse_tables, read_line_score)
+
+PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+GAME = ('20190207BOS', '2019-02-07')
+
+
+def read_page(*path):
+    with open(os.path.join(PAGES, *path), 'rb') as page:
+        return page.read()
+
+
+BOX_SCORE = read_page('boxscores', '201902070BOS.html')
+PBP = read_page('boxscores', 'pbp', '201902070BOS.html')
+SCOREBOARD = read_page('boxscores', 'scoreboard-20190207.html')
+
+
+def test_scoreboard_lists_the_home_teams():
+    #The quarter and leader tables of a game summary and the standings are not games
+    assert parse_scoreboard(SCOREBOARD) == [('Boston', True), ('Milwaukee', True), ('Sacramento', True)]
+    assert parse_list_of_hometeams(SCOREBOARD) == ['Boston', 'Milwaukee', 'Sacramento']
+
+
+def test_scoreboard_of_games_to_come():
+    page = SCOREBOARD.replace(b'>Final/OT</a>', b'>Preview</a>')
+
+    assert parse_scoreboard(page)[-1] == ('Sacramento', False)
+
+
+def test_box_score_tables_are_split_at_the_reserves():
+    tables = parse_tables(BOX_SCORE, ['box-BOS-game-basic', 'box-BOS-game-advanced', 'line_score'])
+    basic = tables['box-BOS-game-basic']
+
+    #The over header row is skipped and the Did Not Play rows are left out
+    assert basic.header[0:3] == ['Starters', 'MP', 'FG'] and basic.header[-1] == '+/-'
+    assert [(label, [row[0] for row in rows]) for label, rows in basic.sections] == [
+        ('Starters', ['Kyrie Irving', 'Jayson Tatum']), ('Reserves', ['Terry Rozier'])]
+    assert basic.footer[0][0:3] == ['Team Totals', '240', '48']
+    assert basic.footer[0][-1] == ''
+
+    #Tables inside HTML comments are read as well
+    assert tables['line_score'].rows()[-1] == ['BOS', '30', '34', '35', '29', '128']
+    assert len(tables['box-BOS-game-advanced'].header) == 17
+
+
+def test_line_score():
+    assert read_line_score(load_html(BOX_SCORE)) == ([31, 33, 31, 34, 129], [30, 34, 35, 29, 128])
+
+
+def test_player_and_team_rows():
+    (player_cols, player_rows), (team_cols, team_rows) = parse_game_rows(BOX_SCORE, 'Boston Celtics', '2019-02-07')
+
+    assert player_cols[0:7] == ['Game-ID', 'Date', 'Team', 'Venue(R/H)', 'Starter(Y/N)', 'Player Name', 'MP']
+    assert [(row[2], row[4], row[5]) for row in player_rows] == [
+        ('Boston Celtics', 'Y', 'Kyrie Irving'), ('Boston Celtics', 'Y', 'Jayson Tatum'),
+        ('Boston Celtics', 'N', 'Terry Rozier'), ('Los Angeles Lakers', 'Y', 'LeBron James'),
+        ('Los Angeles Lakers', 'Y', 'Rajon Rondo'), ('Los Angeles Lakers', 'N', 'Lance Stephenson')]
+    assert player_rows[0] == list(GAME) + ['Boston Celtics', 'H', 'Y', 'Kyrie Irving', '36:12', '9', '18', '.500',
+                                           '3', '7', '.429', '4', '4', '1.000', '0', '4', '4', '10', '2', '0',
+                                           '3', '2', '25', '+3']
+    #No free throws attempted, no free throw percentage
+    assert player_rows[2][player_cols.index('FT%')] == ''
+
+    assert '+/-' not in team_cols
+    assert team_rows[0][0:14] == list(GAME) + ['Boston Celtics', 'H', 30, 34, 35, 29, '', '', '', '', '', 128]
+    assert team_rows[1][0:4] == list(GAME) + ['Los Angeles Lakers', 'R']
+    assert dict(zip(team_cols, team_rows[1]))['PTS'] == '129'
+
+
+def test_other_datasets_of_the_box_score():
+    datasets = parse_game_datasets(BOX_SCORE, 'Boston Celtics', '2019-02-07', datasets = ('advanced', 'periods'))
+
+    advanced_cols, advanced_rows = datasets['advanced']
+    assert advanced_cols[6:9] == ['MP', 'TS%', 'eFG%'] and advanced_cols[-1] == 'BPM'
+    assert [row[5] for row in advanced_rows] == ['Kyrie Irving', 'Jayson Tatum', 'Terry Rozier',
+                                                 'LeBron James', 'Rajon Rondo', 'Lance Stephenson']
+    assert advanced_rows[3][6:9] == ['35:36', '.611', '.605']
+
+    period_cols, period_rows = datasets['periods']
+    assert period_cols[4] == 'Period'
+    assert [(row[4], row[6], row[-2]) for row in period_rows] == [
+        ('Q1', 'Kyrie Irving', '7'), ('Q1', 'Terry Rozier', '0'), ('Q1', 'LeBron James', '9'), ('Q1', 'Lance Stephenson', '3')]
+
+
+def test_box_score_without_advanced_stats():
+    page = BOX_SCORE.replace(b'box-LAL-game-advanced', b'box-LAL-game-other')
+
+    assert parse_game_datasets(page, 'Boston Celtics', '2019-02-07', datasets = ('advanced',)) == {'advanced': None}
+
+
+def test_play_by_play():
+    datasets = parse_game_datasets(None, 'Boston Celtics', '2019-02-07', datasets = ('pbp',), pbp_page = PBP)
+    pbp_cols, pbp_rows = datasets['pbp']
+
+    assert pbp_cols == ['Game-ID', 'Date', 'Period', 'Time', 'Team', 'Play', 'Points', 'Score']
+    assert [row[2:] for row in pbp_rows] == [
+        ['Q1', '12:00.0', '', 'Jump ball: J. McGee vs. A. Horford (K. Irving gains possession)', '', ''],
+        ['Q1', '11:41.0', 'Boston Celtics', 'K. Irving makes 2-pt jump shot from 16 ft', '+2', '0-2'],
+        ['Q1', '11:20.0', 'Los Angeles Lakers', 'L. James makes 3-pt jump shot from 25 ft (assist by R. Rondo)', '+3', '3-2'],
+        ['Q1', '11:02.0', 'Boston Celtics', 'Defensive rebound by J. Tatum', '', '3-2'],
+        ['Q1', '0:00.0', '', 'End of 1st quarter', '', ''],
+        ['Q2', '12:00.0', '', 'Start of 2nd quarter', '', ''],
+        ['Q2', '11:45.0', 'Los Angeles Lakers', 'L. Stephenson makes free throw 1 of 2', '+1', '32-30']]
+
+
+def test_box_score_table_missing():
+    page = BOX_SCORE.replace(b'box-BOS-game-basic', b'box-BOS-game-other')
+
+    with pytest.raises(ValueError, match = 'Box score table for BOS not found'):
+        parse_game_rows(page, 'Boston Celtics', '2019-02-07')
@@ -0,0 +1,28 @@
+"""Tests of the row lookups of the dataset index"""
+
+from NBA_data_scraper.query import DatasetIndex
+
+ROWS = [('20191022TOR', '2019-10-22', 'Toronto Raptors'), ('20200815LAL', '2020-08-15', 'Los Angeles Lakers'),
+        ('20201011MIA', '2020-10-11', 'Miami Heat'), ('20201222LAL', '2020-12-22', 'Los Angeles Lakers')]
+
+
+def _dataset(tmp_path):
+    path = tmp_path / 'team_data.csv'
+    lines = ['Game-ID,Date,Team,Player Name,PTS'] + [f'{game_id},{date_played},{team},,100' for game_id, date_played, team in ROWS]
+    path.write_text('\n'.join(lines) + '\n')
+    return DatasetIndex(path)
+
+
+def test_bubble_games_are_in_season_2020(tmp_path):
+    index = _dataset(tmp_path)
+
+    assert list(index.lookup(season = 2020)) == [0, 1, 2]
+    assert list(index.lookup(season = 2021)) == [3]
+
+
+def test_lookup_by_team_and_dates(tmp_path):
+    index = _dataset(tmp_path)
+
+    assert list(index.lookup(team = 'Los Angeles Lakers')) == [1, 3]
+    assert list(index.lookup(team = 'Los Angeles Lakers', start_date = '2020-09-01')) == [3]
+    assert list(index.read_rows(index.lookup(game_id = '20201011MIA'), columns = ['Team'], typed = False)['Team']) == ['Miami Heat']
@@ -0,0 +1,58 @@
+"""Tests of the season schedule index and the dates that fall back to their scoreboard"""
+
+from datetime import date, datetime
+
+from NBA_data_scraper import NBA_scraper
+from NBA_data_scraper.schedule import ScheduleIndex
+from NBA_data_scraper.teams import season_bounds, season_of
+
+BASE_URL = 'http://schedule.test'
+
+#Games of the 2020 season, played until October in the bubble
+GAMES_2020 = [('2019-10-22', 'Toronto Raptors'), ('2020-03-11', 'Dallas Mavericks'),
+              ('2020-08-15', 'Los Angeles Lakers'), ('2020-10-11', 'Miami Heat')]
+
+
+def _schedule_page(games, month_pages):
+    rows = ''
+    for date_played, home_team in games:
+        day = datetime.strptime(date_played, '%Y-%m-%d')
+        rows += (f'<tr><th data-stat="date_game">{day.strftime("%a, %b")} {day.day}, {day.year}</th>'
+                 f'<td data-stat="home_team_name">{home_team}</td>'
+                 '<td data-stat="box_score_text"><a href="/boxscores/x.html">Box Score</a></td></tr>')
+    links = ''.join(f'<a href="{path}">{path}</a>' for path in month_pages)
+    return (f'<html><body><div class="filter">{links}</div>'
+            f'<table id="schedule"><tbody>{rows}</tbody></table></body></html>').encode('utf-8')
+
+
+def _fetch_page(url):
+    #Every game of the season on the page of its first month, the other month pages are empty
+    if url == f'{BASE_URL}/leagues/NBA_2020_games.html':
+        return _schedule_page(GAMES_2020, ['/leagues/NBA_2020_games-october.html', '/leagues/NBA_2020_games-august.html'])
+    return _schedule_page([], [])
+
+
+def test_bubble_season():
+    assert season_of('2020-08-15') == 2020
+    assert season_of('2020-10-11') == 2020
+    assert season_of('2020-12-22') == 2021
+    assert season_bounds(2020) == (date(2019, 8, 1), date(2020, 10, 11))
+    assert season_bounds(2021)[0] == date(2020, 10, 12)
+
+
+def test_bubble_games_are_in_the_schedule():
+    schedule = ScheduleIndex(_fetch_page, base_url = BASE_URL)
+
+    assert schedule.games_on('2020-08-15') == ['Los Angeles Lakers']
+    assert schedule.covers('2020-09-01')
+    assert not schedule.covers('2020-10-12')
+
+
+def test_dates_outside_the_schedule_load_their_scoreboard():
+    scraper = NBA_scraper(backend = 'http', base_url = BASE_URL, requests_per_minute = None)
+    scraper.schedule = ScheduleIndex(_fetch_page, base_url = BASE_URL)
+
+    home_teams_by_date, scoreboard_dates = scraper._schedule_games(['2019-10-21', '2020-03-12', '2020-08-15', '2020-10-12'])
+
+    assert home_teams_by_date == {'2020-03-12': [], '2020-08-15': ['Los Angeles Lakers']}
+    assert scoreboard_dates == ['2019-10-21', '2020-10-12']
@@ -0,0 +1,87 @@
+"""Tests of the request scheduler throttling and retrying page fetches"""
+
+import asyncio
+from email.utils import formatdate
+import time
+
+import pytest
+
+from NBA_data_scraper.scheduler import RequestScheduler, RetryableError, parse_retry_after
+
+
+class FlakyFetch:
+
+    def __init__(self, failures, retry_after = None):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RetryableError(f'{url} returned 503', self.retry_after)
+        return b'<html></html>'
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('-5') == 0.0
+    assert 55 <= parse_retry_after(formatdate(time.time() + 60, usegmt = True)) <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt = True)) == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+
+
+def test_requests_are_spread_over_the_budget():
+    scheduler = RequestScheduler(requests_per_minute = 60, burst = 2)
+
+    #The burst goes out back to back, the next request waits for its token
+    assert scheduler.reserve() == 0
+    assert scheduler.reserve() == 0
+    assert scheduler.reserve() == pytest.approx(1.0, abs = 0.05)
+    assert scheduler.reserve() == pytest.approx(2.0, abs = 0.05)
+    assert RequestScheduler(requests_per_minute = None).reserve() == 0
+
+
+def test_retryable_errors_are_retried():
+    scheduler = RequestScheduler(requests_per_minute = None, max_retries = 3, backoff_base = 0)
+    fetch = FlakyFetch(failures = 2)
+
+    assert scheduler.call(fetch, 'http://bbref.test') == b'<html></html>'
+    assert fetch.calls == 3
+    assert scheduler.retries == 2
+    assert scheduler.metrics.counters['retries'] == 2
+
+
+def test_errors_are_raised_after_the_last_retry():
+    scheduler = RequestScheduler(requests_per_minute = None, max_retries = 2, backoff_base = 0)
+    fetch = FlakyFetch(failures = 5)
+
+    with pytest.raises(RetryableError):
+        scheduler.call(fetch, 'http://bbref.test')
+    assert fetch.calls == 3
+
+
+def test_backoff():
+    scheduler = RequestScheduler(backoff_base = 2, backoff_cap = 10)
+
+    assert 2 <= scheduler.backoff(1) <= 4
+    assert 5 <= scheduler.backoff(10) <= 10
+
+
+def test_retry_after_pauses_every_worker():
+    scheduler = RequestScheduler(requests_per_minute = None)
+
+    assert scheduler.backoff(0, retry_after = 30) == 30
+    assert scheduler.reserve() == pytest.approx(30, abs = 0.5)
+
+
+def test_async_fetches_are_retried():
+    scheduler = RequestScheduler(requests_per_minute = None, max_retries = 3, backoff_base = 0)
+    fetch = FlakyFetch(failures = 1, retry_after = 0)
+
+    async def afetch(url):
+        return fetch(url)
+
+    assert asyncio.run(scheduler.acall(afetch, 'http://bbref.test')) == b'<html></html>'
+    assert fetch.calls == 2
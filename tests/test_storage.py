@@ -0,0 +1,62 @@
+"""Tests of the rows appended to an existing csv dataset"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from NBA_data_scraper.storage import GameIndex, append_csv
+
+
+def test_rows_are_appended_in_place(tmp_path):
+    path = tmp_path / 'team_data.csv'
+    path.write_text('Game-ID,PTS\n20190321BOS,90')
+    inode = path.stat().st_ino
+
+    append_csv(pd.DataFrame({'PTS': [100], 'Game-ID': ['20190322BOS']}), path)
+
+    assert path.stat().st_ino == inode
+    assert path.read_text().splitlines() == ['Game-ID,PTS', '20190321BOS,90', '20190322BOS,100']
+
+
+def test_failed_append_is_truncated(tmp_path, monkeypatch):
+    path = tmp_path / 'team_data.csv'
+    path.write_bytes(b'Game-ID,PTS\n20190321BOS,90\n')
+
+    fsync = os.fsync
+    calls = []
+
+    def failing_fsync(fd):
+        #The first fsync records the size of the file, the second one writes the rows and fails
+        calls.append(fd)
+        if len(calls) == 2:
+            raise OSError('disk full')
+        fsync(fd)
+
+    monkeypatch.setattr(os, 'fsync', failing_fsync)
+    with pytest.raises(OSError):
+        append_csv(pd.DataFrame({'Game-ID': ['20190322BOS'], 'PTS': [100]}), path)
+
+    assert path.read_bytes() == b'Game-ID,PTS\n20190321BOS,90\n'
+    assert not (tmp_path / 'team_data.csv.appending').exists()
+
+
+def test_append_killed_mid_write_is_repaired(tmp_path):
+    path = tmp_path / 'team_data.csv'
+    rows = b'Game-ID,PTS\n20190321BOS,90\n'
+    #State left by a process killed while appending the rows of 20190322BOS
+    path.write_bytes(rows + b'20190322BOS,10')
+    (tmp_path / 'team_data.csv.appending').write_text(str(len(rows)))
+
+    assert GameIndex(path).game_ids == {'20190321BOS'}
+    assert path.read_bytes() == rows
+
+    append_csv(pd.DataFrame({'Game-ID': ['20190322BOS'], 'PTS': [100]}), path)
+    assert path.read_text().splitlines() == ['Game-ID,PTS', '20190321BOS,90', '20190322BOS,100']
+
+
+def test_unterminated_last_row_is_not_indexed(tmp_path):
+    path = tmp_path / 'team_data.csv'
+    path.write_bytes(b'Game-ID,PTS\n20190321BOS,90\n20190322BOS,1')
+
+    assert GameIndex(path).game_ids == {'20190321BOS'}
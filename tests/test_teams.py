@@ -0,0 +1,61 @@
+"""Tests of the team registry lookups that depend on the season of the game"""
+
+import pytest
+
+from NBA_data_scraper.parsers import parse_game_rows
+from NBA_data_scraper.teams import season_of, team_abbreviation, team_by_city, team_by_name
+from NBA_data_scraper.util_helpers import boxscore_url
+
+
+def _box_score_table(abrv, player):
+    return (f'<table id="box-{abrv}-game-basic"><thead><tr><th>Starters</th><th>MP</th><th>PTS</th></tr></thead>'
+            f'<tbody><tr><th>{player}</th><td>30:00</td><td>10</td></tr></tbody>'
+            '<tfoot><tr><th>Team Totals</th><td>240</td><td>90</td></tr></tfoot></table>')
+
+
+def _game_page(away_team, away_abrv, home_team, home_abrv):
+    return (f'<html><head><title>{away_team} at {home_team} Box Score, March 21, 1999</title></head><body>'
+            '<table id="line_score"><tr><th></th><th>1</th><th>T</th></tr>'
+            f'<tr><th>{away_abrv}</th><td>90</td><td>90</td></tr><tr><th>{home_abrv}</th><td>90</td><td>90</td></tr></table>'
+            + _box_score_table(away_abrv, 'Away Player') + _box_score_table(home_abrv, 'Home Player')
+            + '</body></html>')
+
+
+@pytest.mark.parametrize('date_played, abbreviation', [('1999-03-21', 'CHH'), ('2002-04-01', 'CHH'), ('2019-03-21', 'CHO')])
+def test_charlotte_hornets_by_season(date_played, abbreviation):
+    assert team_abbreviation('Charlotte Hornets', date_played) == abbreviation
+    assert team_by_name('Charlotte Hornets', season_of(date_played)).abbreviation == abbreviation
+
+
+def test_charlotte_city_by_season():
+    assert team_by_city('Charlotte', 1999).abbreviation == 'CHH'
+    assert team_by_city('Charlotte', 2010).abbreviation == 'CHA'
+    assert team_by_city('Charlotte', 2019).abbreviation == 'CHO'
+
+
+@pytest.mark.parametrize('date_played, abbreviation', [('2005-03-01', 'NOH'), ('2005-11-01', 'NOK'), ('2006-12-01', 'NOK'),
+                                                       ('2007-04-01', 'NOK'), ('2007-11-01', 'NOH'), ('2014-01-01', 'NOP')])
+def test_new_orleans_city_by_season(date_played, abbreviation):
+    assert team_by_city('New Orleans', season_of(date_played)).abbreviation == abbreviation
+
+
+def test_config_overrides_registry():
+    assert team_abbreviation('Charlotte Hornets', '1999-03-21', {'Charlotte Hornets': 'XXX'}) == 'XXX'
+
+
+def test_charlotte_hornets_game_page_1999():
+    assert boxscore_url('19990321', team_abbreviation('Charlotte Hornets', '1999-03-21')).endswith('/boxscores/199903210CHH.html')
+
+    page = _game_page('Seattle SuperSonics', 'SEA', 'Charlotte Hornets', 'CHH')
+    (player_cols, player_rows), (team_cols, team_rows) = parse_game_rows(page, 'Charlotte Hornets', '1999-03-21')
+
+    assert {row[0] for row in player_rows + team_rows} == {'19990321CHH'}
+    assert [row[5] for row in player_rows] == ['Home Player', 'Away Player']
+
+
+def test_charlotte_hornets_away_game_2019():
+    page = _game_page('Charlotte Hornets', 'CHO', 'Boston Celtics', 'BOS')
+    (player_cols, player_rows), _ = parse_game_rows(page, 'Boston Celtics', '2019-03-21')
+
+    assert {row[0] for row in player_rows} == {'20190321BOS'}
+    assert [row[2] for row in player_rows] == ['Boston Celtics', 'Charlotte Hornets']
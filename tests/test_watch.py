@@ -0,0 +1,46 @@
+"""Tests of iter_finals giving up on the games that can't be scraped"""
+
+from NBA_data_scraper import NBA_scraper
+
+TEAM_COLS = ['Game-ID', 'Date', 'Team', 'PTS']
+
+
+class FakePool:
+
+    def __init__(self, broken):
+        self.broken = broken
+        self.calls = []
+
+    def imap(self, func, items):
+        for home_team in items:
+            self.calls.append(home_team)
+            if home_team in self.broken:
+                yield home_team, None, ValueError('box score not found')
+            else:
+                yield home_team, (None, (TEAM_COLS, [['20190321BOS', '2019-03-21', home_team, '100']])), None
+
+
+def _scraper(scoreboard, broken = ()):
+    scraper = NBA_scraper(backend = 'http', requests_per_minute = None, use_schedule = False)
+    scraper.backend.get_scoreboard = lambda date, etag, last_modified: (scoreboard, None, None)
+    scraper.backend_pool = FakePool(broken)
+    return scraper
+
+
+def test_box_score_that_never_parses_is_given_up():
+    scraper = _scraper([('Boston', True), ('Miami', True)], broken = {'Miami Heat'})
+
+    records = list(scraper.iter_finals('2019-03-21', poll_every = 0, max_game_attempts = 3))
+
+    assert [record.home_team for record in records] == ['Boston Celtics']
+    assert scraper.backend_pool.calls.count('Miami Heat') == 3
+    assert [home_team for _, home_team, _ in scraper.failed_games] == ['Miami Heat']
+
+
+def test_game_that_never_goes_final_is_dropped():
+    scraper = _scraper([('Boston', True), ('Miami', False)])
+
+    records = list(scraper.iter_finals('2019-03-21', poll_every = 0, final_timeout = 0))
+
+    assert [record.home_team for record in records] == ['Boston Celtics']
+    assert [home_team for _, home_team, _ in scraper.failed_games] == ['Miami Heat']